@@ -0,0 +1,176 @@
+"""
+Trained-model cache for analytics predictions.
+
+Models are keyed by (ticker, model, window) plus the date of the last price
+they were trained on, so a model is retrained only once new prices arrive.
+Entries are kept in an in-process LRU and, for picklable models, written to
+ANALYTICS_MODEL_CACHE_DIR so they survive restarts and are shared between
+workers. Concurrent requests for the same missing model train it once.
+"""
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Optional
+
+from base.infrastructure.concurrency import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 32
+DISK_FILES_PER_ENTRY = 4
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    ticker: str
+    model: str
+    window: str
+    last_price_date: Optional[date] = None
+
+    def slot(self) -> str:
+        """File-name stem shared by every version of (ticker, model, window)."""
+        raw = f"{self.ticker}|{self.model}|{self.window}"
+        return f"{self.model}-{hashlib.sha1(raw.encode()).hexdigest()[:16]}"
+
+    def filename(self) -> str:
+        stamp = self.last_price_date.isoformat() if self.last_price_date else "none"
+        return f"{self.slot()}-{stamp}.pkl"
+
+
+class ModelRegistry:
+    """
+    LRU of trained models with optional on-disk persistence. ``directory=None``
+    keeps models in memory only; on disk the *max_files* most recently written
+    models are kept.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        directory: Optional[str] = None,
+        max_files: Optional[int] = None,
+    ):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_files = max_files if max_files is not None else DISK_FILES_PER_ENTRY * max_entries
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    def get(self, key: ModelKey) -> Optional[Any]:
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+        model = self._load(key)
+        if model is not None:
+            self._remember(key, model)
+        return model
+
+    def get_or_train(self, key: ModelKey, train: Callable[[], Any], *, persist: bool = True) -> Any:
+        """
+        Cached model for *key*, else ``train()``'s result (stored in memory and,
+        with *persist*, on disk). Concurrent misses for one key train once.
+        """
+        model = self.get(key)
+        if model is not None:
+            return model
+
+        def train_and_store():
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            trained = train()
+            self._remember(key, trained)
+            if persist:
+                self._save(key, trained)
+            return trained
+
+        return self._flights.do(key, train_and_store)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def _remember(self, key: ModelKey, model: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+    def _load(self, key: ModelKey) -> Optional[Any]:
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, key.filename())
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable cached model %s: %s", path, e)
+            return None
+
+    def _save(self, key: ModelKey, model: Any) -> None:
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, key.filename())
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(model, f)
+            os.replace(tmp_path, path)
+            self._prune_files(key)
+        except Exception as e:
+            logger.warning("Could not persist model %s: %s", key, e)
+
+    def _prune_files(self, key: ModelKey) -> None:
+        """Drop models superseded by *key* (same slot, older prices), then the oldest beyond max_files."""
+        slot, current = key.slot(), key.filename()
+        kept = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, name)
+            if name.startswith(slot + "-") and name != current:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                kept.append((os.path.getmtime(path), path))
+        kept.sort()
+        for _, path in kept[:max(0, len(kept) - self.max_files)]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """The process-wide ModelRegistry, sized by ANALYTICS_MODEL_CACHE_SIZE / _DIR."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            from django.conf import settings
+            _registry = ModelRegistry(
+                max_entries=getattr(settings, "ANALYTICS_MODEL_CACHE_SIZE", DEFAULT_MAX_ENTRIES),
+                directory=getattr(settings, "ANALYTICS_MODEL_CACHE_DIR", None) or None,
+            )
+        return _registry
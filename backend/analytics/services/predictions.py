@@ -10,9 +10,15 @@ from statsmodels.tsa.statespace.sarimax import SARIMAX
 
 from django.conf import settings
 
+from analytics.services.model_registry import ModelKey, get_model_registry
 from base.infrastructure.db import PriceRepository
 from base.services import get_default_stock_fetcher
 
+LINEAR_REGRESSION_TIME_STEP = 100
+LSTM_MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'saved_models', 'GSPC'
+)
+
 
 def _get_historical_close_series(symbol: str, start_date: str, end_date: str) -> pd.Series:
     """Fetch historical close prices from PriceRepository and return as pandas Series."""
@@ -20,24 +26,21 @@ def _get_historical_close_series(symbol: str, start_date: str, end_date: str) ->
     end = datetime.strptime(end_date, "%Y-%m-%d").date()
     repo = PriceRepository()
     fetcher = get_default_stock_fetcher()
-    prices = repo.get_price_history(symbol, start, end, fetcher)
-    if not prices:
+    prices = repo.get_price_series(symbol, start, end, fetcher)
+    if prices.empty:
         return pd.Series(dtype=float)
-    sorted_dates = sorted(prices.keys())
-    return pd.Series(
-        {d: float(prices[d]) for d in sorted_dates},
-        index=pd.DatetimeIndex(sorted_dates),
-    ).sort_index()
+    return prices.to_pandas()
 
 
-def linear_regression_predict(ticker, start_date, end_date, predicted_days=30):
-    data = _get_historical_close_series(ticker, start_date, end_date)
+def _last_price_date(data: pd.Series):
+    return pd.Timestamp(data.index[-1]).date() if not data.empty else None
+
 
+def _fit_linear_regression(data: pd.Series, time_step: int):
     #* standarization
     scaler = MinMaxScaler(feature_range=(0, 1))
     scaled_data = scaler.fit_transform(data.values.reshape(-1, 1))
 
-    time_step = 100
     X_train, y_train = create_dataset(scaled_data[:len(data)], time_step)
 
     #* build linear regression model
@@ -45,6 +48,24 @@ def linear_regression_predict(ticker, start_date, end_date, predicted_days=30):
 
     #* model training
     linear_model.fit(X_train, y_train)
+    return scaler, linear_model
+
+
+def linear_regression_predict(ticker, start_date, end_date, predicted_days=30):
+    data = _get_historical_close_series(ticker, start_date, end_date)
+
+    #* trained once per ticker, window and last price date (see model_registry)
+    time_step = LINEAR_REGRESSION_TIME_STEP
+    key = ModelKey(
+        ticker=ticker,
+        model='linear_regression',
+        window=f'{start_date}:{end_date}:{time_step}',
+        last_price_date=_last_price_date(data),
+    )
+    scaler, linear_model = get_model_registry().get_or_train(
+        key, lambda: _fit_linear_regression(data, time_step)
+    )
+    scaled_data = scaler.transform(data.values.reshape(-1, 1))
 
     #* Prediction
     future_days = predicted_days  
@@ -73,19 +94,13 @@ def load_lstm_model(ticker, start_date, end_date, predicted_days=30):
         raise ValueError(
             'LSTM predictions are disabled. Set ENABLE_ML_FUNCTIONS=true to enable.'
         )
-    from tensorflow import keras
-
     close_prices = _get_historical_close_series(ticker, start_date, end_date)
 
-    # __file__ is analytics/services/predictions.py -> parent = analytics
-    _analytics_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    scaler_path = os.path.join(_analytics_dir, 'saved_models', 'GSPC', 'scaler.pkl')
-    with open(scaler_path, 'rb') as scaler_file:
-        scaler = pickle.load(scaler_file)
+    # Pretrained model: loaded once per process, kept in memory only
+    key = ModelKey(ticker='GSPC', model='lstm', window=LSTM_MODEL_DIR)
+    scaler, model = get_model_registry().get_or_train(key, _load_saved_lstm, persist=False)
 
     scaled_data = scaler.transform(close_prices.values.reshape(-1, 1))
-    model_path = os.path.join(_analytics_dir, 'saved_models', 'GSPC', 'my_model.h5')
-    model = keras.models.load_model(model_path)
 
     # Przewidywanie na przyszłość
     look_back = 100
@@ -106,6 +121,14 @@ def load_lstm_model(ticker, start_date, end_date, predicted_days=30):
     predicted_df = pd.DataFrame(predictions, columns=['Predicted_Close'], index=future_dates)
     return predicted_df
 
+def _load_saved_lstm():
+    from tensorflow import keras
+
+    with open(os.path.join(LSTM_MODEL_DIR, 'scaler.pkl'), 'rb') as scaler_file:
+        scaler = pickle.load(scaler_file)
+    model = keras.models.load_model(os.path.join(LSTM_MODEL_DIR, 'my_model.h5'))
+    return scaler, model
+
 def sarima(ticker, start_date, end_date, predicted_days=30):
     close_prices = _get_historical_close_series(ticker, start_date, end_date)
 
@@ -0,0 +1,79 @@
+"""Tests for the trained-model registry and its use by predictions."""
+import os
+import tempfile
+from datetime import date
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from analytics.services import predictions
+from analytics.services.model_registry import ModelKey, ModelRegistry
+
+
+def _key(ticker="AAPL", last=date(2026, 1, 2)):
+    return ModelKey(ticker=ticker, model="linear_regression", window="w", last_price_date=last)
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def test_trains_once_per_key(self):
+        registry = ModelRegistry(max_entries=4)
+        train = Mock(return_value="model")
+
+        self.assertEqual(registry.get_or_train(_key(), train), "model")
+        self.assertEqual(registry.get_or_train(_key(), train), "model")
+
+        train.assert_called_once()
+
+    def test_evicts_least_recently_used(self):
+        registry = ModelRegistry(max_entries=2)
+        registry.get_or_train(_key("A"), lambda: "a")
+        registry.get_or_train(_key("B"), lambda: "b")
+        registry.get(_key("A"))
+        registry.get_or_train(_key("C"), lambda: "c")
+
+        self.assertEqual(registry.get(_key("A")), "a")
+        self.assertIsNone(registry.get(_key("B")))
+        self.assertEqual(len(registry), 2)
+
+    def test_persists_to_disk_and_drops_superseded_models(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ModelRegistry(directory=directory).get_or_train(_key(last=date(2026, 1, 1)), lambda: {"v": 1})
+            ModelRegistry(directory=directory).get_or_train(_key(last=date(2026, 1, 2)), lambda: {"v": 2})
+
+            train = Mock()
+            restarted = ModelRegistry(directory=directory)
+
+            self.assertEqual(restarted.get_or_train(_key(last=date(2026, 1, 2)), train), {"v": 2})
+            train.assert_not_called()
+            self.assertEqual(os.listdir(directory), [_key(last=date(2026, 1, 2)).filename()])
+
+
+class LinearRegressionCacheTests(SimpleTestCase):
+    def setUp(self):
+        index = pd.date_range("2025-01-01", periods=150, freq="D")
+        self.prices = pd.Series(np.linspace(100, 150, 150), index=index)
+        self.registry = ModelRegistry()
+        patcher = patch.object(predictions, "get_model_registry", return_value=self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_prediction_skips_training(self):
+        with patch.object(predictions, "_get_historical_close_series", return_value=self.prices), \
+                patch.object(predictions, "_fit_linear_regression", wraps=predictions._fit_linear_regression) as fit:
+            first = predictions.linear_regression_predict("AAPL", "2025-01-01", "2025-05-30")
+            second = predictions.linear_regression_predict("AAPL", "2025-01-01", "2025-05-30")
+
+        fit.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_new_price_retrains(self):
+        newer = pd.concat([self.prices, pd.Series([151.0], index=[pd.Timestamp("2025-05-31")])])
+        with patch.object(predictions, "_fit_linear_regression", wraps=predictions._fit_linear_regression) as fit:
+            with patch.object(predictions, "_get_historical_close_series", return_value=self.prices):
+                predictions.linear_regression_predict("AAPL", "2025-01-01", "2025-05-31")
+            with patch.object(predictions, "_get_historical_close_series", return_value=newer):
+                predictions.linear_regression_predict("AAPL", "2025-01-01", "2025-05-31")
+
+        self.assertEqual(fit.call_count, 2)
@@ -7,6 +7,7 @@ from rest_framework.permissions import AllowAny
 from .services.predictions import linear_regression_predict
 from .services.sentiment import analyze_sentiment
 from base.infrastructure.db import PriceRepository
+from base.infrastructure.providers.async_adapters import fetch_news
 from base.services import get_default_stock_fetcher, get_default_news_fetchers
 
 
@@ -29,8 +30,8 @@ def predictView(request, ticker):
             return Response({'error': 'Invalid start date. Use YYYY-MM-DD'}, status=400)
     repo = PriceRepository()
     fetcher = get_default_stock_fetcher()
-    prices = repo.get_price_history(ticker, start_date, end_date, fetcher)
-    data = {d.isoformat(): float(v) for d, v in prices.items()}
+    prices = repo.get_price_series(ticker, start_date, end_date, fetcher)
+    data = {str(d): float(v) for d, v in zip(prices.dates, prices.values)}
     prediction = linear_regression_predict(ticker, start_date.isoformat(), end_date.isoformat())
     return Response(data | prediction)
 
@@ -40,9 +41,6 @@ def predictView(request, ticker):
 def newsWithSentimentView(request):
     """Return news articles with sentiment analysis score."""
     ticker = request.GET.get('ticker')
-    fetchers = get_default_news_fetchers()
-    news = []
-    for fetcher in fetchers:
-        news.extend(fetcher.get_news(ticker, count=5))
+    news = fetch_news(get_default_news_fetchers(), ticker, count=5)
     sentiment = analyze_sentiment(news)
     return Response({"sentiment": sentiment, "news": news})
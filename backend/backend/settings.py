@@ -53,6 +53,62 @@ ECONOMIC_CALENDAR_API_ENABLED = bool(ALPHAVANTAGE_API_KEY) and USE_ECONOMIC_CALE
 YAHOO_NEWS_API_ENABLED = USE_YAHOO_NEWS_API
 NEWSDATA_NEWS_API_ENABLED = bool(NEWSDATA_API_KEY) and USE_NEWSDATA_NEWS_API
 
+# --- Outbound provider calls (base.infrastructure.concurrency) ---
+# Per provider: max concurrent calls, minimum seconds between call starts,
+# and per-call timeout in seconds (including time waiting for a slot).
+MARKET_DATA_THREAD_POOL_SIZE = int(os.environ.get('MARKET_DATA_THREAD_POOL_SIZE', '32'))
+MARKET_DATA_DEFAULT_LIMITS = {'max_concurrency': 8, 'min_interval': 0.0, 'timeout': 15.0}
+MARKET_DATA_PROVIDER_LIMITS = {
+    'yfinance': {'max_concurrency': 8, 'min_interval': 0.0, 'timeout': 15.0},
+    'yahoo_news': {'max_concurrency': 4, 'min_interval': 0.0, 'timeout': 10.0},
+    'newsdata': {'max_concurrency': 2, 'min_interval': 1.0, 'timeout': 10.0},
+}
+
+# --- Stale-while-revalidate for CurrentPrice / StockDataCache (base.infrastructure.db.refresh) ---
+# Seconds per data type: entries younger than max_age are fresh; up to
+# max_age + max_stale they are served while refreshed in the background;
+# older ones are refetched synchronously.
+CACHE_REFRESH_IN_BACKGROUND = os.environ.get('CACHE_REFRESH_IN_BACKGROUND', 'true').lower() == 'true'
+CACHE_REFRESH_WORKERS = int(os.environ.get('CACHE_REFRESH_WORKERS', '4'))
+CACHE_REFRESH_POLICIES = {
+    'current_price': {'max_age': 15 * 60, 'max_stale': 4 * 60 * 60},
+    'basic_info': {'max_age': 15 * 60, 'max_stale': 24 * 60 * 60},
+    'fundamental_analysis': {'max_age': 15 * 60, 'max_stale': 7 * 24 * 60 * 60},
+    'technical_indicators': {'max_age': 15 * 60, 'max_stale': 60 * 60},
+}
+
+# --- Held-symbol price refresh (manage.py refresh_prices) ---
+# Seconds between passes, max random jitter added to each wait, and the cap
+# on the doubling backoff after failed passes; days of daily closes kept filled.
+PRICE_REFRESH_INTERVAL = float(os.environ.get('PRICE_REFRESH_INTERVAL', '300'))
+PRICE_REFRESH_JITTER = float(os.environ.get('PRICE_REFRESH_JITTER', '30'))
+PRICE_REFRESH_MAX_BACKOFF = float(os.environ.get('PRICE_REFRESH_MAX_BACKOFF', '3600'))
+PRICE_REFRESH_HISTORY_DAYS = int(os.environ.get('PRICE_REFRESH_HISTORY_DAYS', '7'))
+
+# --- Shared per-symbol price series cache (base.services.price_series) ---
+# Memory budget in bytes for cached close-price arrays, their lifetime in seconds
+# and the maximum number of cached (symbol, range) entries.
+PRICE_SERIES_CACHE_MAX_BYTES = int(os.environ.get('PRICE_SERIES_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+PRICE_SERIES_CACHE_TTL = float(os.environ.get('PRICE_SERIES_CACHE_TTL', '900'))
+PRICE_SERIES_CACHE_MAX_ENTRIES = int(os.environ.get('PRICE_SERIES_CACHE_MAX_ENTRIES', '4096'))
+
+# --- Background transaction imports (portfolio.services.import_jobs) ---
+# Run uploaded imports on a thread pool in the web process; set to false when
+# manage.py run_import_jobs workers process the queue instead.
+IMPORT_JOBS_IN_PROCESS = os.environ.get('IMPORT_JOBS_IN_PROCESS', 'true').lower() == 'true'
+IMPORT_JOBS_WORKERS = int(os.environ.get('IMPORT_JOBS_WORKERS', '2'))
+IMPORT_JOBS_POLL_INTERVAL = float(os.environ.get('IMPORT_JOBS_POLL_INTERVAL', '2'))
+# Seconds without progress after which a running job is assumed dead and queued again.
+IMPORT_JOBS_TIMEOUT = float(os.environ.get('IMPORT_JOBS_TIMEOUT', '1800'))
+
+# --- Trained analytics model cache (analytics.services.model_registry) ---
+# Models kept in memory per process and the directory they are persisted to
+# (empty disables persistence).
+ANALYTICS_MODEL_CACHE_SIZE = int(os.environ.get('ANALYTICS_MODEL_CACHE_SIZE', '32'))
+ANALYTICS_MODEL_CACHE_DIR = os.environ.get(
+    'ANALYTICS_MODEL_CACHE_DIR', os.path.join(BASE_DIR, 'analytics', 'model_cache')
+)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
        'rest_framework_simplejwt.authentication.JWTAuthentication',
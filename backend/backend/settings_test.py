@@ -21,3 +21,15 @@ DATABASES = {
         "NAME": ":memory:",
     }
 }
+
+# Refetch stale cache entries synchronously so tests stay single-threaded
+CACHE_REFRESH_IN_BACKGROUND = False
+
+# No process-wide price series cache: rolled-back test data must not leak between tests
+PRICE_SERIES_CACHE_MAX_BYTES = 0
+
+# Import jobs stay pending until a test runs them explicitly
+IMPORT_JOBS_IN_PROCESS = False
+
+# Trained models are not written to disk during tests
+ANALYTICS_MODEL_CACHE_DIR = ""
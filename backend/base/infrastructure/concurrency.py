@@ -0,0 +1,201 @@
+"""
+Bounded, rate-limited concurrency for outbound provider calls.
+
+Provider SDKs (yfinance, feedparser, newsdataapi) are blocking, so calls run
+on a shared thread pool and are awaited from asyncio. Each provider gets one
+process-wide ProviderLimiter (configured by MARKET_DATA_PROVIDER_LIMITS in
+settings) that caps concurrent calls, spaces call starts and times out slow
+calls. ``run_sync`` lets synchronous code drive a coroutine. SingleFlight
+coalesces concurrent calls for the same key into one.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PROVIDER_LIMITS = {"max_concurrency": 8, "min_interval": 0.0, "timeout": 15.0}
+DEFAULT_THREAD_POOL_SIZE = 32
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_limiters: Dict[str, "ProviderLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from django.conf import settings
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "MARKET_DATA_THREAD_POOL_SIZE", DEFAULT_THREAD_POOL_SIZE),
+                thread_name_prefix="market-data",
+            )
+        return _executor
+
+
+class ProviderLimiter:
+    """
+    Runs blocking calls to one provider with at most *max_concurrency* in
+    flight, call starts at least *min_interval* seconds apart, and each
+    call (including time spent waiting for a slot) bounded by *timeout*.
+
+    Slots are thread-level, so the bound holds across event loops and
+    request threads. A timed-out call keeps its slot until the underlying
+    thread returns.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 8,
+        min_interval: float = 0.0,
+        timeout: float = 15.0,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._pace_lock = threading.Lock()
+        self._next_start = 0.0
+
+    def _pace(self) -> None:
+        if self.min_interval <= 0:
+            return
+        with self._pace_lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def _call(self, func: Callable[..., T], args: tuple) -> T:
+        with self._slots:
+            self._pace()
+            return func(*args)
+
+    async def run(self, func: Callable[..., T], *args: Any, default: Optional[T] = None) -> Optional[T]:
+        """Await ``func(*args)`` on the provider pool; *default* on timeout or error."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(_get_executor(), self._call, func, args),
+                self.timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "%s: %s%s timed out after %ss",
+                self.name, getattr(func, "__name__", func), args, self.timeout,
+            )
+        except Exception as e:
+            logger.warning("%s: %s%s failed: %s", self.name, getattr(func, "__name__", func), args, e)
+        return default
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls per key: the first caller of ``do(key, func)``
+    runs *func*, callers arriving while it is in flight wait and receive its
+    result (or its exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Any, _Flight] = {}
+
+    def do(self, key: Any, func: Callable[[], T]) -> T:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self, key: Any) -> bool:
+        with self._lock:
+            return key in self._flights
+
+
+def provider_name(fetcher: Any) -> str:
+    """Limiter key for a fetcher: its ``provider_name`` attribute or class name."""
+    return getattr(fetcher, "provider_name", None) or type(fetcher).__name__
+
+
+def get_provider_limiter(name: str) -> ProviderLimiter:
+    """Return the process-wide limiter for provider *name*, creating it from settings."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            from django.conf import settings
+            limits = {
+                **DEFAULT_PROVIDER_LIMITS,
+                **getattr(settings, "MARKET_DATA_DEFAULT_LIMITS", {}),
+                **getattr(settings, "MARKET_DATA_PROVIDER_LIMITS", {}).get(name, {}),
+            }
+            limiter = ProviderLimiter(name, **limits)
+            _limiters[name] = limiter
+        return limiter
+
+
+async def gather_calls(
+    limiter: ProviderLimiter,
+    func: Callable[[Any], T],
+    items: Iterable[Any],
+) -> List[Optional[T]]:
+    """``func(item)`` for every item concurrently through *limiter*; None where a call failed."""
+    return list(await asyncio.gather(*(limiter.run(func, item) for item in items)))
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """
+    Run *awaitable* to completion from synchronous code. Inside a running
+    event loop it is run on a separate thread with its own loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, awaitable).result()
+
+
+def map_concurrently(
+    func: Callable[[Any], T],
+    items: Iterable[Any],
+    provider: str,
+) -> List[Optional[T]]:
+    """Synchronous ``gather_calls`` using the limiter of *provider*."""
+    items = list(items)
+    if not items:
+        return []
+    return run_sync(gather_calls(get_provider_limiter(provider), func, items))
@@ -2,10 +2,12 @@ from base.infrastructure.db.price_repository import PriceRepository
 from base.infrastructure.db.asset_repository import AssetRepository
 from base.infrastructure.db.stock_data_cache_repository import StockDataCacheRepository
 from base.infrastructure.db.economic_calendar_event_repository import EconomicCalendarEventRepository
+from base.infrastructure.db.fx_rate_repository import FXRateRepository
 
 __all__ = [
     "PriceRepository",
     "AssetRepository",
     "StockDataCacheRepository",
     "EconomicCalendarEventRepository",
+    "FXRateRepository",
 ]
@@ -0,0 +1,186 @@
+"""
+Repository for persisting and querying daily FXRate records.
+"""
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import pandas as pd
+from django.db import transaction
+from django.db.models import Max, Min
+
+from base.infrastructure.db.price_coverage_repository import Interval, PriceCoverageRepository
+from base.models import FXRate
+
+if TYPE_CHECKING:
+    from base.infrastructure.interfaces.market_data_fetcher import FXDataFetcher
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement when bulk-saving rates.
+FX_BULK_BATCH_SIZE = 1000
+
+_FX_COVERAGE_PREFIX = "FX:"
+
+
+def fx_coverage_key(from_currency: str, to_currency: str) -> str:
+    """Key of a currency pair in the PriceCoverage index (e.g. ``FX:USD/PLN``)."""
+    return f"{_FX_COVERAGE_PREFIX}{from_currency}/{to_currency}"
+
+
+class FXCoverageRepository(PriceCoverageRepository):
+    """PriceCoverage index for FX pairs; legacy coverage is seeded from FXRate."""
+
+    def _stored_bounds(self, symbols: List[str]) -> Dict[str, Interval]:
+        pairs = {}
+        for key in symbols:
+            from_currency, _, to_currency = key[len(_FX_COVERAGE_PREFIX):].partition("/")
+            pairs[(from_currency, to_currency)] = key
+        rows = (
+            FXRate.objects.filter(
+                from_currency__in={f for f, _ in pairs},
+                to_currency__in={t for _, t in pairs},
+            )
+            .values("from_currency", "to_currency")
+            .annotate(earliest=Min("date"), latest=Max("date"))
+        )
+        return {
+            pairs[(row["from_currency"], row["to_currency"])]: (row["earliest"], row["latest"])
+            for row in rows
+            if (row["from_currency"], row["to_currency"]) in pairs
+        }
+
+
+class FXRateRepository:
+    """Handles persistence and retrieval of daily exchange rates."""
+
+    def __init__(self, coverage: Optional[PriceCoverageRepository] = None):
+        self.coverage = coverage or FXCoverageRepository()
+
+    def get_rate(
+        self,
+        from_currency: str,
+        to_currency: str,
+        day: date,
+        max_lookback_days: int = 7,
+    ) -> Optional[Decimal]:
+        """
+        Return the rate on *day* or the most recent earlier stored rate within
+        *max_lookback_days* (weekends/holidays), or None.
+        """
+        return (
+            FXRate.objects.filter(
+                from_currency=from_currency,
+                to_currency=to_currency,
+                date__lte=day,
+                date__gte=day - timedelta(days=max_lookback_days),
+            )
+            .order_by("-date")
+            .values_list("rate", flat=True)
+            .first()
+        )
+
+    def is_covered(self, from_currency: str, to_currency: str, day: date) -> bool:
+        """
+        True when the coverage index already knows *day* for the pair: its
+        rate is stored, or the provider answered without one (non-trading day).
+        """
+        key = fx_coverage_key(from_currency, to_currency)
+        return key not in self.coverage.missing_ranges([key], day, day)
+
+    def get_rates(
+        self,
+        from_currency: str,
+        to_currency: str,
+        start_date: date,
+        end_date: date,
+    ) -> Dict[date, Decimal]:
+        """Return mapping of date -> rate for the pair within [start_date, end_date]."""
+        return dict(
+            FXRate.objects.filter(
+                from_currency=from_currency,
+                to_currency=to_currency,
+                date__gte=start_date,
+                date__lte=end_date,
+            ).values_list("date", "rate")
+        )
+
+    def get_rate_history(
+        self,
+        from_currency: str,
+        to_currency: str,
+        start_date: date,
+        end_date: date,
+        fetcher: 'FXDataFetcher',
+    ) -> Dict[date, Decimal]:
+        """
+        Return daily rates for [start_date, end_date], first fetching the parts
+        the coverage index does not know yet (same gap rules as PriceHistory).
+        """
+        key = fx_coverage_key(from_currency, to_currency)
+        for fetch_start, fetch_end in self.coverage.missing_ranges([key], start_date, end_date).get(key, []):
+            logger.info(
+                "Fetching FX rates from external API: %s→%s, range=%s to %s",
+                from_currency,
+                to_currency,
+                fetch_start,
+                fetch_end,
+            )
+            try:
+                series = fetcher.get_historical_fx_series(
+                    from_currency, to_currency, fetch_start, fetch_end,
+                )
+            except Exception as e:
+                logger.warning(
+                    "Failed to fetch FX rates %s→%s [%s, %s]: %s",
+                    from_currency,
+                    to_currency,
+                    fetch_start,
+                    fetch_end,
+                    e,
+                )
+                continue
+
+            rates: Dict[date, Decimal] = {}
+            if series is not None:
+                for ts, value in series.items():
+                    day = ts.date() if hasattr(ts, "date") else ts
+                    if fetch_start <= day <= fetch_end and value is not None and not pd.isna(value):
+                        rates[day] = Decimal(str(value))
+            if rates:
+                self.save_rates(from_currency, to_currency, rates)
+            self.coverage.mark_fetched(
+                key, fetch_start, fetch_end, max(rates) if rates else None,
+            )
+        return self.get_rates(from_currency, to_currency, start_date, end_date)
+
+    def save_rates(
+        self,
+        from_currency: str,
+        to_currency: str,
+        rates: Dict[date, Decimal],
+    ) -> int:
+        """Insert or update daily rates for the pair. Returns the number of rows written."""
+        if not rates:
+            return 0
+        with transaction.atomic():
+            FXRate.objects.bulk_create(
+                [
+                    FXRate(
+                        from_currency=from_currency,
+                        to_currency=to_currency,
+                        date=day,
+                        rate=rate,
+                    )
+                    for day, rate in rates.items()
+                ],
+                batch_size=FX_BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["from_currency", "to_currency", "date"],
+                update_fields=["rate"],
+            )
+            self.coverage.mark_covered(
+                fx_coverage_key(from_currency, to_currency), min(rates), max(rates),
+            )
+        return len(rates)
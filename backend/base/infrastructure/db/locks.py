@@ -0,0 +1,54 @@
+"""
+Request coalescing for cache misses that end in an external fetch.
+
+Within a process, concurrent misses for the same key share one in-flight
+call (SingleFlight). Across processes (gunicorn workers) the call runs under
+a PostgreSQL session advisory lock, so a worker that waited for the lock can
+re-check the database and find what another worker just stored. On other
+database backends the advisory lock is a no-op.
+"""
+import logging
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, TypeVar
+
+from django.db import connection
+
+from base.infrastructure.concurrency import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_flights = SingleFlight()
+
+
+@contextmanager
+def advisory_lock(key: str) -> Iterator[None]:
+    """Hold a PostgreSQL session advisory lock on *key*; no-op on other backends."""
+    if connection.vendor != "postgresql":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(hashtext(%s))", [key])
+    try:
+        yield
+    finally:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [key])
+        except Exception as e:
+            logger.warning("Failed to release advisory lock %s: %s", key, e)
+
+
+def coalesced(key: str, func: Callable[[], T], lock_key: Optional[str] = None) -> T:
+    """
+    Run ``func()`` once for all concurrent callers of *key* in this process,
+    holding the advisory lock on *lock_key* (default: *key*) while it runs.
+    *func* should re-check the database before fetching: by the time it runs
+    another process may already have stored the value.
+    """
+    def locked() -> T:
+        with advisory_lock(lock_key or key):
+            return func()
+
+    return _flights.do(key, locked)
@@ -0,0 +1,216 @@
+"""
+Repository for the PriceCoverage index (which date ranges of PriceHistory are known per symbol).
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Max, Min
+
+from base.models import PriceCoverage, PriceHistory
+
+Interval = Tuple[date, date]
+
+# How long a fetch that returned no data suppresses refetching the same range.
+# Covers delisted/unknown symbols and the not-yet-published close of today.
+PRICE_EMPTY_RANGE_TTL = timedelta(hours=6)
+
+# How long a failed fetch (provider error, symbol dropped from a batch) waits
+# before the same range is tried again.
+PRICE_FETCH_FAILURE_BACKOFF = timedelta(minutes=5)
+
+# Cap on remembered empty ranges per symbol (oldest are dropped first).
+MAX_EMPTY_RANGES = 20
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort and merge overlapping or adjacent (touching days) intervals."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(start: date, end: date, covered: Iterable[Interval]) -> List[Interval]:
+    """Return the parts of [start, end] not covered by *covered*."""
+    missing: List[Interval] = []
+    cursor = start
+    for lo, hi in merge_intervals(covered):
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            missing.append((cursor, lo - timedelta(days=1)))
+        cursor = max(cursor, hi + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def _to_json(intervals: Iterable[Interval]) -> List[List[str]]:
+    return [[lo.isoformat(), hi.isoformat()] for lo, hi in intervals]
+
+
+def _from_json(raw) -> List[Interval]:
+    return [(date.fromisoformat(lo), date.fromisoformat(hi)) for lo, hi, *_ in raw or []]
+
+
+class PriceCoverageRepository:
+    """Reads and updates per-symbol PriceHistory coverage."""
+
+    def missing_ranges(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, List[Interval]]:
+        """
+        Return ``symbol -> ranges to fetch`` within [start_date, end_date]
+        (symbols with nothing to fetch are omitted). One indexed lookup for
+        all symbols; symbols without a coverage row are seeded from a grouped
+        MIN/MAX over PriceHistory.
+        """
+        now = datetime.now(timezone.utc)
+        rows = {c.symbol: c for c in PriceCoverage.objects.filter(symbol__in=symbols)}
+        unknown = [s for s in symbols if s not in rows]
+        if unknown:
+            rows.update(self._seed_from_history(unknown))
+
+        result: Dict[str, List[Interval]] = {}
+        for symbol in symbols:
+            coverage = rows.get(symbol)
+            known: List[Interval] = []
+            if coverage is not None:
+                known.extend(_from_json(coverage.intervals))
+                known.extend(self._fresh_empty_ranges(coverage, now))
+            ranges = subtract_intervals(start_date, end_date, known)
+            if ranges:
+                result[symbol] = ranges
+        return result
+
+    def mark_covered(self, symbol: str, start_date: date, end_date: date) -> None:
+        """Record [start_date, end_date] as stored. Call inside the saving transaction."""
+        self.mark_intervals(symbol, [(start_date, end_date)])
+
+    def mark_days(self, symbol: str, days: Iterable[date]) -> None:
+        """Record individual stored days; gaps between them stay uncovered."""
+        self.mark_intervals(symbol, [(day, day) for day in days])
+
+    def mark_intervals(self, symbol: str, intervals: Iterable[Interval]) -> None:
+        intervals = list(intervals)
+        if not intervals:
+            return
+        with transaction.atomic():
+            coverage = self._locked(symbol)
+            coverage.intervals = _to_json(merge_intervals(_from_json(coverage.intervals) + intervals))
+            coverage.save()
+
+    def mark_fetched(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        latest_day: Optional[date],
+        today: Optional[date] = None,
+    ) -> None:
+        """
+        Record a completed fetch of [start_date, end_date] whose newest returned
+        day was *latest_day* (None when nothing came back).
+
+        A fetch with data covers the settled part of the range (up to
+        yesterday); anything after the newest day that is today or later, or
+        the whole range when nothing came back, is remembered as empty for
+        PRICE_EMPTY_RANGE_TTL.
+        """
+        today = today or date.today()
+        now = datetime.now(timezone.utc)
+        with transaction.atomic():
+            coverage = self._locked(symbol)
+            coverage.last_fetched_at = now
+            empty = [
+                entry for entry in coverage.empty_ranges or []
+                if self._is_fresh(entry, now)
+            ]
+            if latest_day is None:
+                empty.append([start_date.isoformat(), end_date.isoformat(), now.isoformat()])
+            else:
+                settled_end = min(end_date, today - timedelta(days=1))
+                if start_date <= settled_end:
+                    coverage.intervals = _to_json(
+                        merge_intervals(_from_json(coverage.intervals) + [(start_date, settled_end)])
+                    )
+                unsettled_start = max(start_date, latest_day + timedelta(days=1), today)
+                if unsettled_start <= end_date:
+                    empty.append([unsettled_start.isoformat(), end_date.isoformat(), now.isoformat()])
+            coverage.empty_ranges = empty[-MAX_EMPTY_RANGES:]
+            coverage.save()
+
+    def mark_failed(self, symbol: str, start_date: date, end_date: date) -> None:
+        """
+        Record a failed fetch of [start_date, end_date]: nothing is marked as
+        stored, the range is only skipped for PRICE_FETCH_FAILURE_BACKOFF.
+        """
+        now = datetime.now(timezone.utc)
+        with transaction.atomic():
+            coverage = self._locked(symbol)
+            empty = [
+                entry for entry in coverage.empty_ranges or []
+                if self._is_fresh(entry, now)
+            ]
+            empty.append([
+                start_date.isoformat(), end_date.isoformat(), now.isoformat(),
+                PRICE_FETCH_FAILURE_BACKOFF.total_seconds(),
+            ])
+            coverage.empty_ranges = empty[-MAX_EMPTY_RANGES:]
+            coverage.save()
+
+    def drop(self, symbol: str) -> None:
+        """Forget coverage for *symbol*; it is rebuilt from PriceHistory on next read."""
+        PriceCoverage.objects.filter(symbol=symbol).delete()
+
+    @staticmethod
+    def _locked(symbol: str) -> PriceCoverage:
+        coverage = PriceCoverage.objects.select_for_update().filter(symbol=symbol).first()
+        if coverage is None:
+            coverage, _ = PriceCoverage.objects.get_or_create(symbol=symbol)
+        return coverage
+
+    @staticmethod
+    def _is_fresh(entry, now: datetime) -> bool:
+        if len(entry) < 3:
+            return False
+        fetched_at = datetime.fromisoformat(entry[2])
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        # Optional 4th element: a shorter TTL in seconds (failed fetches)
+        ttl = timedelta(seconds=entry[3]) if len(entry) > 3 else PRICE_EMPTY_RANGE_TTL
+        return now - fetched_at < ttl
+
+    def _fresh_empty_ranges(self, coverage: PriceCoverage, now: datetime) -> List[Interval]:
+        return _from_json(e for e in coverage.empty_ranges or [] if self._is_fresh(e, now))
+
+    def _stored_bounds(self, symbols: List[str]) -> Dict[str, Interval]:
+        """Return ``symbol -> (earliest, latest)`` stored date, one grouped query."""
+        return {
+            row["symbol"]: (row["earliest"], row["latest"])
+            for row in PriceHistory.objects.filter(symbol__in=symbols)
+            .values("symbol")
+            .annotate(earliest=Min("date"), latest=Max("date"))
+        }
+
+    def _seed_from_history(self, symbols: List[str]) -> Dict[str, PriceCoverage]:
+        """Create coverage rows for *symbols* from the stored MIN/MAX date (legacy data)."""
+        seeded = [
+            PriceCoverage(symbol=symbol, intervals=_to_json([bounds]))
+            for symbol, bounds in self._stored_bounds(symbols).items()
+        ]
+        if seeded:
+            PriceCoverage.objects.bulk_create(seeded, ignore_conflicts=True)
+        return {c.symbol: c for c in seeded}
@@ -2,28 +2,55 @@
 Repository for persisting and querying PriceHistory records.
 """
 import logging
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple, Union
 
 import pandas as pd
+from django.db import transaction
 
+from base.infrastructure.concurrency import map_concurrently, provider_name
 from base.infrastructure.interfaces.market_data_fetcher import (
     StockDataFetcher,
     CryptoDataFetcher,
 )
 from base.infrastructure.interfaces.price_repository import AbstractPriceRepository
+from base.infrastructure.db.locks import coalesced
+from base.infrastructure.db.price_coverage_repository import PriceCoverageRepository
+from base.infrastructure.db.refresh import (
+    FRESH,
+    RefreshPolicy,
+    get_refresh_policy,
+    refresh_in_background,
+    serve_stale,
+)
 from base.models import Asset, CurrentPrice, PriceHistory
+from base.services.price_series import PriceSeries, PriceSeriesCache, get_price_series_cache
 
 logger = logging.getLogger(__name__)
 
 # How long a current price from DB is considered fresh (then we refetch from API).
 CURRENT_PRICE_MAX_AGE = timedelta(minutes=15)
 
+# Rows per INSERT statement when bulk-saving price history.
+PRICE_BULK_BATCH_SIZE = 1000
+
+
+def _current_price_policy() -> RefreshPolicy:
+    return get_refresh_policy("current_price", CURRENT_PRICE_MAX_AGE)
+
 
 class PriceRepository(AbstractPriceRepository):
     """Handles persistence and retrieval of historical and current price data."""
 
+    def __init__(
+        self,
+        coverage: Optional[PriceCoverageRepository] = None,
+        series_cache: Optional[PriceSeriesCache] = None,
+    ):
+        self.coverage = coverage or PriceCoverageRepository()
+        self.series_cache = series_cache if series_cache is not None else get_price_series_cache()
+
     def get_current_price(
         self,
         symbol: str,
@@ -32,36 +59,63 @@ class PriceRepository(AbstractPriceRepository):
     ) -> Optional[Decimal]:
         """
         Return the current price for the symbol. Uses CurrentPrice from DB if present
-        and not older than CURRENT_PRICE_MAX_AGE, otherwise fetches from the fetcher,
-        saves to DB and returns.
+        and fresh under the "current_price" refresh policy (CURRENT_PRICE_MAX_AGE by
+        default), otherwise fetches from the fetcher, saves to DB and returns.
+        A stale price within the policy's max staleness is returned immediately
+        while it is refreshed in the background. Concurrent misses for the same
+        symbol share one fetch.
         """
+        current = self._stored_current_price(symbol)
+        state = _current_price_policy().state(current.updated_at if current else None)
+        key = f"current_price:{symbol}"
+        if state == FRESH or serve_stale(state):
+            if state != FRESH:
+                refresh_in_background(key, lambda: self._refresh_current_price(symbol, fetcher, asset))
+            price, currency = current.price, current.currency
+        else:
+            price, currency = coalesced(key, lambda: self._refresh_current_price(symbol, fetcher, asset))
+        if price is not None and asset is not None:
+            self._remember_asset_currencies([(asset, currency)])
+        return price
+
+    @staticmethod
+    def _stored_current_price(symbol: str) -> Optional[CurrentPrice]:
         try:
-            current = CurrentPrice.objects.filter(symbol=symbol).first()
-            if current is not None:
-                now = datetime.now(timezone.utc)
-                updated = current.updated_at
-                if updated.tzinfo is None:
-                    updated = updated.replace(tzinfo=timezone.utc)
-                if now - updated <= CURRENT_PRICE_MAX_AGE:
-                    return current.price
+            return CurrentPrice.objects.filter(symbol=symbol).first()
         except Exception:
-            pass
+            return None
+
+    def _refresh_current_price(
+        self,
+        symbol: str,
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        asset: Optional[Asset],
+    ) -> Tuple[Optional[Decimal], Optional[str]]:
+        """
+        Internal (runs coalesced): fetch and store the current price unless
+        another worker stored a fresh one meanwhile. Returns (price, currency).
+        """
+        current = self._stored_current_price(symbol)
+        if current is not None and _current_price_policy().state(current.updated_at) == FRESH:
+            return current.price, current.currency
 
         logger.info("Fetching current price from external API: symbol=%s", symbol)
         try:
             price = fetcher.get_current_price(symbol)
         except Exception as e:
             logger.warning("Failed to fetch current price for %s: %s", symbol, e)
-            return None
+            return None, None
 
         if price is None:
-            return None
+            return None, None
 
-        currency = "USD"
-        try:
-            currency = fetcher.get_currency(symbol) or "USD"
-        except Exception:
-            pass
+        # Reuse the known currency; asking the fetcher may be a network call
+        currency = (current.currency if current else None) or (asset.currency if asset else None)
+        if not currency:
+            try:
+                currency = fetcher.get_currency(symbol) or "USD"
+            except Exception:
+                currency = "USD"
 
         try:
             CurrentPrice.objects.update_or_create(
@@ -75,7 +129,200 @@ class PriceRepository(AbstractPriceRepository):
         except Exception as e:
             logger.warning("Failed to save current price for %s: %s", symbol, e)
 
-        return price
+        return price, currency
+
+    def get_current_prices(
+        self,
+        symbols: List[str],
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Optional[Dict[str, Asset]] = None,
+    ) -> Dict[str, Decimal]:
+        """
+        Multi-symbol variant of get_current_price.
+
+        Fresh CurrentPrice rows come from one query; all stale or unknown
+        symbols are fetched with a single ``fetcher.get_current_prices`` call
+        and saved in one bulk upsert. Symbols without a price are omitted.
+        """
+        quotes = self.get_current_quotes(symbols, fetcher, assets)
+        return {symbol: price for symbol, (price, _) in quotes.items()}
+
+    def get_current_quotes(
+        self,
+        symbols: List[str],
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Optional[Dict[str, Asset]] = None,
+    ) -> Dict[str, Tuple[Decimal, str]]:
+        """
+        Like get_current_prices, returning ``symbol -> (price, currency)``.
+
+        The currency is the one stored with the price, so callers do not need
+        a per-symbol ``fetcher.get_currency`` call. Concurrent misses for the
+        same symbols share one fetch.
+        """
+        symbols = list(dict.fromkeys(s for s in symbols if s))
+        if not symbols:
+            return {}
+        assets = assets or {}
+
+        policy = _current_price_policy()
+        stored = {c.symbol: c for c in CurrentPrice.objects.filter(symbol__in=symbols)}
+        quotes: Dict[str, Tuple[Decimal, str]] = {}
+        stale = []
+        for symbol, current in stored.items():
+            state = policy.state(current.updated_at)
+            if state == FRESH or serve_stale(state):
+                quotes[symbol] = (current.price, current.currency)
+            if state != FRESH:
+                stale.append(symbol)
+
+        missing = [s for s in symbols if s not in quotes]
+        if missing:
+            quotes.update(coalesced(
+                "current_prices:" + ",".join(sorted(missing)),
+                lambda: self._refresh_stale_quotes(missing, fetcher, assets),
+            ))
+        revalidate = sorted(set(stale) - set(missing))
+        if revalidate:
+            refresh_in_background(
+                "current_prices:" + ",".join(revalidate),
+                lambda: self._refresh_stale_quotes(revalidate, fetcher, assets),
+            )
+
+        self._remember_asset_currencies(
+            (asset, quotes[symbol][1]) for symbol, asset in assets.items() if symbol in quotes
+        )
+        return quotes
+
+    def _refresh_stale_quotes(
+        self,
+        symbols: List[str],
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Dict[str, Asset],
+    ) -> Dict[str, Tuple[Decimal, str]]:
+        """
+        Internal (runs coalesced): re-read *symbols*, then refetch those still
+        not fresh. Returns quotes for the symbols that are fresh now.
+        """
+        policy = _current_price_policy()
+        stored = {c.symbol: c for c in CurrentPrice.objects.filter(symbol__in=symbols)}
+        quotes = {
+            s: (stored[s].price, stored[s].currency)
+            for s in symbols
+            if s in stored and policy.state(stored[s].updated_at) == FRESH
+        }
+        stale = [s for s in symbols if s not in quotes]
+        if stale:
+            quotes.update(self._fetch_current_quotes(
+                stale, stored, fetcher, {s: assets[s] for s in stale if s in assets},
+            ))
+        return quotes
+
+    def _fetch_current_quotes(
+        self,
+        symbols: List[str],
+        stored: Dict[str, CurrentPrice],
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Dict[str, Asset],
+    ) -> Dict[str, Tuple[Decimal, str]]:
+        """Fetch *symbols* with one batched call and upsert their CurrentPrice rows."""
+        logger.info("Fetching current prices from external API: symbols=%s", symbols)
+        try:
+            fetched = fetcher.get_current_prices(symbols)
+        except Exception as e:
+            logger.warning("Failed to fetch current prices for %s: %s", symbols, e)
+            return {}
+        return self._store_current_quotes(symbols, fetched, stored, fetcher, assets)
+
+    def refresh_current_quotes(
+        self,
+        symbols: List[str],
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Optional[Dict[str, Asset]] = None,
+    ) -> Dict[str, Tuple[Decimal, str]]:
+        """
+        Fetch current prices for *symbols* regardless of their age and upsert
+        them (one batched call, one bulk upsert). Unlike get_current_quotes,
+        provider errors propagate so a scheduler can back off.
+        """
+        symbols = list(dict.fromkeys(s for s in symbols if s))
+        if not symbols:
+            return {}
+        stored = {c.symbol: c for c in CurrentPrice.objects.filter(symbol__in=symbols)}
+        assets = assets or {}
+        fetched = fetcher.get_current_prices(symbols)
+        quotes = self._store_current_quotes(symbols, fetched, stored, fetcher, assets)
+        self._remember_asset_currencies(
+            (asset, quotes[symbol][1]) for symbol, asset in assets.items() if symbol in quotes
+        )
+        return quotes
+
+    def _store_current_quotes(
+        self,
+        symbols: List[str],
+        fetched: Dict[str, Decimal],
+        stored: Dict[str, CurrentPrice],
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Dict[str, Asset],
+    ) -> Dict[str, Tuple[Decimal, str]]:
+        """Upsert CurrentPrice rows for the *fetched* prices of requested *symbols*."""
+        requested = set(symbols)
+        fetched = {s: p for s, p in fetched.items() if p is not None and s in requested}
+        # Reuse the known currency; asking the fetcher may be a network call per symbol
+        currencies = {}
+        for symbol in fetched:
+            asset = assets.get(symbol)
+            currencies[symbol] = (
+                (stored[symbol].currency if symbol in stored else None)
+                or (asset.currency if asset else None)
+            )
+        unknown = [s for s, c in currencies.items() if not c]
+        if unknown:
+            looked_up = map_concurrently(fetcher.get_currency, unknown, provider_name(fetcher))
+            currencies.update(zip(unknown, looked_up))
+
+        quotes: Dict[str, Tuple[Decimal, str]] = {}
+        rows = []
+        for symbol, price in fetched.items():
+            asset = assets.get(symbol)
+            currency = currencies[symbol] or "USD"
+            quotes[symbol] = (price, currency)
+            rows.append(CurrentPrice(
+                symbol=symbol,
+                price=price,
+                currency=currency,
+                asset_id=asset.pk if asset else getattr(stored.get(symbol), "asset_id", None),
+            ))
+
+        if rows:
+            try:
+                CurrentPrice.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["symbol"],
+                    update_fields=["price", "currency", "asset", "updated_at"],
+                )
+            except Exception as e:
+                logger.warning("Failed to save current prices for %s: %s", [r.symbol for r in rows], e)
+        return quotes
+
+    @staticmethod
+    def _remember_asset_currencies(pairs) -> None:
+        """
+        Persist the provider-reported currency on each ``(asset, currency)``
+        whose stored value is missing or different, in one bulk update.
+        """
+        changed = []
+        for asset, currency in pairs:
+            if currency and asset.pk is not None and asset.currency != currency:
+                asset.currency = currency
+                changed.append(asset)
+        if not changed:
+            return
+        try:
+            Asset.objects.bulk_update(changed, ["currency"])
+        except Exception as e:
+            logger.warning("Failed to save currency for %s: %s", [a.symbol for a in changed], e)
 
     def get_price_history(
         self,
@@ -103,30 +350,32 @@ class PriceRepository(AbstractPriceRepository):
         asset: Optional[Asset] = None,
     ) -> int:
         """
-        Internal: fetch from API when we have no data, or when we're missing
-        data at the start (earliest in DB > start_date) or at the end
-        (latest in DB < end_date). Gaps in the middle are normal and do not
-        trigger a fetch.
+        Internal: fetch from API the parts of [start_date, end_date] the
+        coverage index does not know yet (never stored or fetched, and not
+        recently found empty). Days without rows inside covered ranges are
+        normal (market closed) and do not trigger a fetch.
+
+        Concurrent misses for the same range share one fetch; fetches of any
+        range of one symbol are serialized across processes.
         """
-        existing_dates = set(
-            PriceHistory.objects.filter(
-                symbol=symbol,
-                date__gte=start_date,
-                date__lte=end_date,
-            ).values_list("date", flat=True)
+        if not self.coverage.missing_ranges([symbol], start_date, end_date).get(symbol):
+            return 0
+        return coalesced(
+            f"price_history:{symbol}:{start_date}:{end_date}",
+            lambda: self._fetch_missing_ranges(symbol, start_date, end_date, fetcher, asset),
+            lock_key=f"price_history:{symbol}",
         )
-        earliest_in_range = min(existing_dates) if existing_dates else None
-        latest_in_range = max(existing_dates) if existing_dates else None
-
-        ranges_to_fetch: List[Tuple[date, date]] = []
-        if earliest_in_range is None:
-            ranges_to_fetch.append((start_date, end_date))
-        else:
-            if earliest_in_range > start_date:
-                ranges_to_fetch.append((start_date, earliest_in_range - timedelta(days=1)))
-            if latest_in_range < end_date:
-                ranges_to_fetch.append((latest_in_range + timedelta(days=1), end_date))
 
+    def _fetch_missing_ranges(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        asset: Optional[Asset],
+    ) -> int:
+        """Internal (runs coalesced): re-read coverage, then fetch and store what is still missing."""
+        ranges_to_fetch = self.coverage.missing_ranges([symbol], start_date, end_date).get(symbol)
         if not ranges_to_fetch:
             return 0
 
@@ -148,29 +397,191 @@ class PriceRepository(AbstractPriceRepository):
                     fetch_end,
                     e,
                 )
+                self.coverage.mark_failed(symbol, fetch_start, fetch_end)
                 continue
+            total_created += self._save_fetched(
+                symbol, data.get(symbol), [(fetch_start, fetch_end)], asset,
+            )
 
-            series = data.get(symbol)
-            if series is None or series.empty:
-                continue
+        return total_created
+
+    def get_price_history_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Optional[Dict[str, Asset]] = None,
+        raise_errors: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Multi-symbol variant of get_price_history.
+
+        Gaps for all symbols come from one coverage-index lookup and every
+        missing range is fetched with a single multi-ticker call spanning the
+        union of the gaps; concurrent misses for the same symbols and range
+        share that call. Returns a DataFrame indexed by date (ascending)
+        with one float column per symbol; NaN where a symbol has no close on
+        that day.
+
+        A failed fetch is logged and whatever is stored is returned; with
+        *raise_errors* it propagates instead, so a scheduler can back off.
+        """
+        symbols = list(dict.fromkeys(s for s in symbols if s))
+        if not symbols:
+            return pd.DataFrame()
 
-            prices_to_save: List[Dict[str, Optional[Decimal]]] = []
+        if self.coverage.missing_ranges(symbols, start_date, end_date):
+            try:
+                coalesced(
+                    f"price_history_batch:{','.join(sorted(symbols))}:{start_date}:{end_date}",
+                    lambda: self._fetch_missing_batch(
+                        self.coverage.missing_ranges(symbols, start_date, end_date), fetcher, assets or {},
+                    ),
+                )
+            except Exception as e:
+                if raise_errors:
+                    raise
+                logger.warning(
+                    "Failed to fetch historical prices for %s [%s, %s]: %s",
+                    symbols,
+                    start_date,
+                    end_date,
+                    e,
+                )
+
+        rows = PriceHistory.objects.filter(
+            symbol__in=symbols,
+            date__gte=start_date,
+            date__lte=end_date,
+        ).values_list("date", "symbol", "close")
+        frame = pd.DataFrame.from_records(list(rows), columns=["date", "symbol", "close"])
+        if frame.empty:
+            return pd.DataFrame(columns=symbols, dtype=float)
+        frame["close"] = frame["close"].astype(float)
+        return (
+            frame.pivot(index="date", columns="symbol", values="close")
+            .reindex(columns=symbols)
+            .sort_index()
+        )
+
+    def get_price_series(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        asset: Optional[Asset] = None,
+    ) -> PriceSeries:
+        """
+        get_price_history as a PriceSeries, served from the shared series
+        cache when a cached range of the symbol covers [start_date, end_date].
+        """
+        assets = {symbol: asset} if asset is not None else None
+        return self.get_price_series_batch([symbol], start_date, end_date, fetcher, assets)[symbol]
+
+    def get_price_series_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Optional[Dict[str, Asset]] = None,
+    ) -> Dict[str, PriceSeries]:
+        """
+        ``symbol -> PriceSeries`` for [start_date, end_date]. Symbols found in
+        the shared series cache cost no query; the rest go through
+        get_price_history_batch in one pass and are cached.
+        """
+        symbols = list(dict.fromkeys(s for s in symbols if s))
+        result = self.series_cache.get_many(symbols, start_date, end_date)
+        missing = [s for s in symbols if s not in result]
+        if missing:
+            frame = self.get_price_history_batch(missing, start_date, end_date, fetcher, assets)
+            for symbol in missing:
+                column = frame[symbol] if symbol in frame.columns else None
+                series = PriceSeries.from_series(column)
+                self.series_cache.set(symbol, start_date, end_date, series)
+                result[symbol] = series
+        return {s: result[s] for s in symbols}
+
+    def _fetch_missing_batch(
+        self,
+        missing: Dict[str, List[Tuple[date, date]]],
+        fetcher: Union[StockDataFetcher, CryptoDataFetcher],
+        assets: Dict[str, Asset],
+    ) -> int:
+        """
+        Internal (runs coalesced, *missing* re-read under the lock): fetch all
+        *missing* ranges with one multi-ticker call and save them. Raises
+        when the call fails or leaves symbols out, after saving the rest.
+        """
+        if not missing:
+            return 0
+        fetch_start = min(r[0] for ranges in missing.values() for r in ranges)
+        fetch_end = max(r[1] for ranges in missing.values() for r in ranges)
+        symbols = list(missing)
+        logger.info(
+            "Fetching prices from external API: symbols=%s, range=%s to %s",
+            symbols,
+            fetch_start,
+            fetch_end,
+        )
+        try:
+            data = fetcher.get_historical_prices(symbols, fetch_start, fetch_end)
+        except Exception:
+            for symbol, ranges in missing.items():
+                for lo, hi in ranges:
+                    self.coverage.mark_failed(symbol, lo, hi)
+            raise
+
+        total_created = 0
+        for symbol, ranges in missing.items():
+            total_created += self._save_fetched(
+                symbol, data.get(symbol), ranges, assets.get(symbol),
+            )
+        failed = [symbol for symbol in symbols if data.get(symbol) is None]
+        if failed:
+            raise RuntimeError(f"no historical prices returned for {', '.join(failed)}")
+        return total_created
+
+    def _save_fetched(
+        self,
+        symbol: str,
+        series: Optional[pd.Series],
+        ranges: List[Tuple[date, date]],
+        asset: Optional[Asset] = None,
+    ) -> int:
+        """
+        Save closes from *series* that fall inside the requested *ranges* and
+        record the fetch in the coverage index. An empty *series* means the
+        provider had no rows and is remembered as empty; ``None`` (symbol
+        missing from the fetcher's result) means the fetch failed and only
+        backs off briefly.
+        """
+        if series is None:
+            logger.warning("No historical prices returned for %s %s", symbol, ranges)
+            for lo, hi in ranges:
+                self.coverage.mark_failed(symbol, lo, hi)
+            return 0
+
+        prices_to_save: List[Dict[str, Optional[Decimal]]] = []
+        if not series.empty:
             for ts, close in series.items():
                 day = ts.date() if hasattr(ts, "date") else ts
-                if day in existing_dates or not (fetch_start <= day <= fetch_end):
+                # Only the requested gaps; a wider fetch may overlap stored days
+                if not any(lo <= day <= hi for lo, hi in ranges):
                     continue
                 if close is None or (isinstance(close, float) and pd.isna(close)):
                     continue
-                prices_to_save.append({
-                    "date": day,
-                    "close": Decimal(str(close)),
-                })
+                prices_to_save.append({"date": day, "close": Decimal(str(close))})
 
-            if prices_to_save:
-                total_created += self.save_prices(symbol, prices_to_save, asset=asset)
-                existing_dates.update(row["date"] for row in prices_to_save)
-
-        return total_created
+        created = self.save_prices(symbol, prices_to_save, asset=asset) if prices_to_save else 0
+        saved_days = [row["date"] for row in prices_to_save]
+        for lo, hi in ranges:
+            latest = max((d for d in saved_days if lo <= d <= hi), default=None)
+            self.coverage.mark_fetched(symbol, lo, hi, latest)
+        return created
 
     def save_prices(
         self,
@@ -181,33 +592,56 @@ class PriceRepository(AbstractPriceRepository):
         """
         Save or update price history for a symbol.
         Each dict in prices should have 'date' and 'close'; may include 'open', 'high', 'low', 'volume'.
-        Returns the number of records created or updated.
+
+        Rows are written with batched ``INSERT ... ON CONFLICT (symbol, date)
+        DO UPDATE`` statements inside one transaction, so a multi-year backfill
+        costs a handful of queries instead of one per day.
+        The saved days are recorded in the coverage index.
+        Returns the number of records created (dates not stored before).
         """
         if not prices:
             return 0
-        created = 0
+        # Last row wins when the same date appears twice
+        rows: Dict[date, PriceHistory] = {}
         for row in prices:
             day = row.get("date")
             if not day:
                 continue
             if isinstance(day, str):
-                from datetime import datetime
                 day = datetime.strptime(day, "%Y-%m-%d").date()
-            obj, was_created = PriceHistory.objects.update_or_create(
+            rows[day] = PriceHistory(
                 symbol=symbol,
                 date=day,
-                defaults={
-                    "asset": asset,
-                    "open": row.get("open"),
-                    "high": row.get("high"),
-                    "low": row.get("low"),
-                    "close": row["close"],
-                    "volume": row.get("volume"),
-                },
+                asset=asset,
+                open=row.get("open"),
+                high=row.get("high"),
+                low=row.get("low"),
+                close=row["close"],
+                volume=row.get("volume"),
             )
-            if was_created:
-                created += 1
-        return created
+        if not rows:
+            return 0
+
+        with transaction.atomic():
+            existing = set(
+                PriceHistory.objects.filter(
+                    symbol=symbol,
+                    date__gte=min(rows),
+                    date__lte=max(rows),
+                ).values_list("date", flat=True)
+            ).intersection(rows)
+            PriceHistory.objects.bulk_create(
+                list(rows.values()),
+                batch_size=PRICE_BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["symbol", "date"],
+                update_fields=["asset", "open", "high", "low", "close", "volume"],
+            )
+            # Only the saved days: a sparse save must not hide the gaps between
+            # them. Fetched ranges are recorded whole by _save_fetched.
+            self.coverage.mark_days(symbol, rows)
+        self.series_cache.invalidate([symbol])
+        return len(rows) - len(existing)
 
     def get_by_symbol_and_date_range(
         self,
@@ -0,0 +1,122 @@
+"""
+Stale-while-revalidate for DB-backed caches (CurrentPrice, StockDataCache).
+
+A RefreshPolicy per data type (CACHE_REFRESH_POLICIES in settings) splits an
+entry's age into three states: fresh (served as is), stale (served as is
+while a background refresh is scheduled) and expired (older than the hard
+max-staleness cutoff, refetched synchronously). Background refreshes run
+coalesced with synchronous misses for the same key, so a key is never
+fetched twice at once.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Set
+
+from django.db import connection
+
+from base.infrastructure.db.locks import coalesced
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+DEFAULT_REFRESH_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending: Set[str] = set()
+_pending_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RefreshPolicy:
+    """
+    Entries younger than *max_age* are fresh; up to *max_age + max_stale*
+    they are stale and served while refreshing; older ones are expired.
+    A zero *max_stale* disables stale serving.
+    """
+
+    max_age: timedelta
+    max_stale: timedelta = timedelta(0)
+
+    def state(self, updated_at: Optional[datetime]) -> str:
+        if updated_at is None:
+            return EXPIRED
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        age = datetime.now(timezone.utc) - updated_at
+        if age <= self.max_age:
+            return FRESH
+        if age <= self.max_age + self.max_stale:
+            return STALE
+        return EXPIRED
+
+
+def get_refresh_policy(data_type: str, default_max_age: timedelta) -> RefreshPolicy:
+    """
+    Policy for *data_type* from CACHE_REFRESH_POLICIES (seconds for
+    ``max_age`` and ``max_stale``). Unconfigured types keep
+    *default_max_age* and never serve stale data.
+    """
+    from django.conf import settings
+    config: Dict[str, Any] = getattr(settings, "CACHE_REFRESH_POLICIES", {}).get(data_type, {})
+    max_age = config.get("max_age")
+    return RefreshPolicy(
+        max_age=timedelta(seconds=max_age) if max_age is not None else default_max_age,
+        max_stale=timedelta(seconds=config.get("max_stale", 0)),
+    )
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from django.conf import settings
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "CACHE_REFRESH_WORKERS", DEFAULT_REFRESH_WORKERS),
+                thread_name_prefix="cache-refresh",
+            )
+        return _executor
+
+
+def _run_refresh(key: str, func: Callable[[], Any], lock_key: Optional[str]) -> None:
+    try:
+        coalesced(key, func, lock_key=lock_key)
+    except Exception as e:
+        logger.warning("Background refresh of %s failed: %s", key, e)
+    finally:
+        with _pending_lock:
+            _pending.discard(key)
+        connection.close()
+
+
+def serve_stale(state: str) -> bool:
+    """
+    True when an entry in *state* should be served while refreshing in the
+    background. With CACHE_REFRESH_IN_BACKGROUND off, stale entries are
+    refetched synchronously like expired ones.
+    """
+    from django.conf import settings
+    return state == STALE and getattr(settings, "CACHE_REFRESH_IN_BACKGROUND", True)
+
+
+def refresh_in_background(key: str, func: Callable[[], Any], lock_key: Optional[str] = None) -> None:
+    """
+    Schedule ``func()`` (coalesced on *key*) on the refresh pool unless a
+    refresh of *key* is already queued.
+    """
+    with _pending_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+    try:
+        _get_executor().submit(_run_refresh, key, func, lock_key)
+    except RuntimeError as e:
+        with _pending_lock:
+            _pending.discard(key)
+        logger.warning("Could not schedule refresh of %s: %s", key, e)
@@ -1,6 +1,12 @@
 from .market_data_fetcher import StockDataFetcher, CryptoDataFetcher, FXDataFetcher
 from .economic_calendar import EconomicCalendarFetcher
 from .news_fetcher import NewsFetcher
+from .async_fetchers import (
+    AsyncStockDataFetcher,
+    AsyncCryptoDataFetcher,
+    AsyncFXDataFetcher,
+    AsyncNewsFetcher,
+)
 from .price_repository import AbstractPriceRepository
 from .asset_repository import AbstractAssetRepository
 
@@ -10,6 +16,10 @@ __all__ = [
     'FXDataFetcher',
     'EconomicCalendarFetcher',
     'NewsFetcher',
+    'AsyncStockDataFetcher',
+    'AsyncCryptoDataFetcher',
+    'AsyncFXDataFetcher',
+    'AsyncNewsFetcher',
     'AbstractPriceRepository',
     'AbstractAssetRepository',
 ]
@@ -0,0 +1,91 @@
+"""
+Asyncio counterparts of the market data and news fetcher interfaces.
+
+Each method mirrors the synchronous one of the same name. Implementations
+are expected to bound their own concurrency and time out slow calls, so
+callers can ``asyncio.gather`` freely.
+"""
+from abc import ABC, abstractmethod
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+class AsyncStockDataFetcher(ABC):
+    """Asyncio interface of StockDataFetcher."""
+
+    @abstractmethod
+    async def get_current_price(self, symbol: str) -> Optional[Decimal]:
+        pass
+
+    @abstractmethod
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        """Prices for *symbols*; symbols without a price are omitted."""
+        pass
+
+    @abstractmethod
+    async def get_currency(self, symbol: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def get_historical_prices(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, pd.Series]:
+        pass
+
+
+class AsyncCryptoDataFetcher(ABC):
+    """Asyncio interface of CryptoDataFetcher."""
+
+    @abstractmethod
+    async def get_current_price(self, symbol: str) -> Optional[Decimal]:
+        pass
+
+    @abstractmethod
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        """Prices for *symbols*; symbols without a price are omitted."""
+        pass
+
+    @abstractmethod
+    async def get_currency(self, symbol: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def get_historical_prices(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, pd.Series]:
+        pass
+
+
+class AsyncFXDataFetcher(ABC):
+    """Asyncio interface of FXDataFetcher."""
+
+    @abstractmethod
+    async def get_historical_fx_series(
+        self,
+        from_currency: str,
+        to_currency: str,
+        start_date: date,
+        end_date: date,
+    ) -> Optional[pd.Series]:
+        pass
+
+    @abstractmethod
+    async def get_current_rate(self, from_currency: str, to_currency: str) -> Optional[Decimal]:
+        pass
+
+
+class AsyncNewsFetcher(ABC):
+    """Asyncio interface of NewsFetcher."""
+
+    @abstractmethod
+    async def get_news(self, query: str, count: int = 5) -> List[Dict]:
+        pass
@@ -9,9 +9,17 @@ from decimal import Decimal
 
 import pandas as pd
 
+from base.infrastructure.concurrency import map_concurrently, provider_name
+
 logger = logging.getLogger(__name__)
 
 
+def _current_prices_one_by_one(fetcher, symbols: List[str]) -> Dict[str, Decimal]:
+    symbols = list(dict.fromkeys(symbols))
+    prices = map_concurrently(fetcher.get_current_price, symbols, provider_name(fetcher))
+    return {s: p for s, p in zip(symbols, prices) if p is not None}
+
+
 class StockDataFetcher(ABC):
     """Abstract base class for fetching stock market data."""
 
@@ -20,6 +28,16 @@ class StockDataFetcher(ABC):
         """Get the current price of a stock."""
         pass
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        """
+        Get current prices for several stocks at once.
+
+        Symbols without a price are omitted. The default asks for each symbol
+        separately, concurrently within the provider's limits; implementations
+        backed by a batch API should override it.
+        """
+        return _current_prices_one_by_one(self, symbols)
+
     @abstractmethod
     def get_stock_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a stock."""
@@ -37,7 +55,13 @@ class StockDataFetcher(ABC):
         start_date: date,
         end_date: date,
     ) -> Dict[str, pd.Series]:
-        """Batch-download historical Close prices for multiple stock symbols."""
+        """
+        Batch-download historical Close prices for multiple stock symbols.
+
+        Symbols the provider answered for without rows map to an empty Series;
+        symbols that could not be fetched are omitted. Raises when the whole
+        request fails.
+        """
         pass
 
 
@@ -49,6 +73,16 @@ class CryptoDataFetcher(ABC):
         """Get the current price of a cryptocurrency pair."""
         pass
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        """
+        Get current prices for several pairs at once.
+
+        Symbols without a price are omitted. The default asks for each symbol
+        separately, concurrently within the provider's limits; implementations
+        backed by a batch API should override it.
+        """
+        return _current_prices_one_by_one(self, symbols)
+
     @abstractmethod
     def get_currency(self, symbol: str) -> Optional[str]:
         """Get the quote currency of the pair."""
@@ -61,7 +95,12 @@ class CryptoDataFetcher(ABC):
         start_date: date,
         end_date: date,
     ) -> Dict[str, pd.Series]:
-        """Batch-download historical Close prices for crypto symbols."""
+        """
+        Batch-download historical Close prices for crypto symbols.
+
+        Same contract as StockDataFetcher.get_historical_prices: empty Series
+        for symbols without rows, failed symbols omitted.
+        """
         pass
 
     def get_crypto_info(self, symbol: str) -> Optional[Dict[str, Any]]:
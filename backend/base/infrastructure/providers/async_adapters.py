@@ -0,0 +1,126 @@
+"""
+Asyncio adapters over the synchronous fetchers.
+
+Every call runs on the shared provider pool through the fetcher's
+ProviderLimiter (see base.infrastructure.concurrency), so gathering many
+calls is bounded per provider and each call is timed out. Failures and
+timeouts resolve to the "no data" value of the synchronous method.
+"""
+import asyncio
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from base.infrastructure.concurrency import (
+    ProviderLimiter,
+    gather_calls,
+    get_provider_limiter,
+    provider_name,
+    run_sync,
+)
+from base.infrastructure.interfaces.async_fetchers import (
+    AsyncCryptoDataFetcher,
+    AsyncFXDataFetcher,
+    AsyncNewsFetcher,
+    AsyncStockDataFetcher,
+)
+from base.infrastructure.interfaces.market_data_fetcher import (
+    CryptoDataFetcher,
+    FXDataFetcher,
+    StockDataFetcher,
+)
+from base.infrastructure.interfaces.news_fetcher import NewsFetcher
+
+
+def _has_batch_prices(fetcher) -> bool:
+    """True when *fetcher* overrides the one-by-one default of get_current_prices."""
+    method = getattr(type(fetcher), "get_current_prices", None)
+    return method not in (
+        StockDataFetcher.get_current_prices,
+        CryptoDataFetcher.get_current_prices,
+    )
+
+
+class _ThreadedMarketDataFetcher:
+    def __init__(self, fetcher, limiter: Optional[ProviderLimiter] = None):
+        self.fetcher = fetcher
+        self.limiter = limiter or get_provider_limiter(provider_name(fetcher))
+
+    async def get_current_price(self, symbol: str) -> Optional[Decimal]:
+        return await self.limiter.run(self.fetcher.get_current_price, symbol)
+
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        symbols = list(dict.fromkeys(symbols))
+        if _has_batch_prices(self.fetcher):
+            return await self.limiter.run(self.fetcher.get_current_prices, symbols, default={}) or {}
+        prices = await gather_calls(self.limiter, self.fetcher.get_current_price, symbols)
+        return {s: p for s, p in zip(symbols, prices) if p is not None}
+
+    async def get_currency(self, symbol: str) -> Optional[str]:
+        return await self.limiter.run(self.fetcher.get_currency, symbol)
+
+    async def get_historical_prices(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, pd.Series]:
+        return await self.limiter.run(
+            self.fetcher.get_historical_prices, symbols, start_date, end_date, default={},
+        ) or {}
+
+
+class ThreadedAsyncStockDataFetcher(_ThreadedMarketDataFetcher, AsyncStockDataFetcher):
+    """AsyncStockDataFetcher over a synchronous StockDataFetcher."""
+
+
+class ThreadedAsyncCryptoDataFetcher(_ThreadedMarketDataFetcher, AsyncCryptoDataFetcher):
+    """AsyncCryptoDataFetcher over a synchronous CryptoDataFetcher."""
+
+
+class ThreadedAsyncFXDataFetcher(AsyncFXDataFetcher):
+    """AsyncFXDataFetcher over a synchronous FXDataFetcher."""
+
+    def __init__(self, fetcher: FXDataFetcher, limiter: Optional[ProviderLimiter] = None):
+        self.fetcher = fetcher
+        self.limiter = limiter or get_provider_limiter(provider_name(fetcher))
+
+    async def get_historical_fx_series(
+        self,
+        from_currency: str,
+        to_currency: str,
+        start_date: date,
+        end_date: date,
+    ) -> Optional[pd.Series]:
+        return await self.limiter.run(
+            self.fetcher.get_historical_fx_series, from_currency, to_currency, start_date, end_date,
+        )
+
+    async def get_current_rate(self, from_currency: str, to_currency: str) -> Optional[Decimal]:
+        return await self.limiter.run(self.fetcher.get_current_rate, from_currency, to_currency)
+
+
+class ThreadedAsyncNewsFetcher(AsyncNewsFetcher):
+    """AsyncNewsFetcher over a synchronous NewsFetcher."""
+
+    def __init__(self, fetcher: NewsFetcher, limiter: Optional[ProviderLimiter] = None):
+        self.fetcher = fetcher
+        self.limiter = limiter or get_provider_limiter(provider_name(fetcher))
+
+    async def get_news(self, query: str, count: int = 5) -> List[Dict]:
+        return await self.limiter.run(self.fetcher.get_news, query, count, default=[]) or []
+
+
+async def gather_news(fetchers: List[AsyncNewsFetcher], query: str, count: int = 5) -> List[Dict]:
+    """Articles from all *fetchers* fetched concurrently, concatenated in fetcher order."""
+    results = await asyncio.gather(*(f.get_news(query, count) for f in fetchers))
+    return [article for articles in results for article in articles]
+
+
+def fetch_news(fetchers: List[NewsFetcher], query: str, count: int = 5) -> List[Dict]:
+    """Sync adapter: query all synchronous news *fetchers* concurrently."""
+    if not fetchers:
+        return []
+    return run_sync(gather_news([ThreadedAsyncNewsFetcher(f) for f in fetchers], query, count))
@@ -65,6 +65,9 @@ class MockStockDataFetcher(StockDataFetcher):
     def get_current_price(self, symbol: str) -> Optional[Decimal]:
         return _mock_price_for_symbol(symbol)
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        return {sym: _mock_price_for_symbol(sym) for sym in symbols}
+
     def get_stock_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         price = self.get_current_price(symbol)
         return {
@@ -144,6 +147,9 @@ class MockCryptoDataFetcher(CryptoDataFetcher):
         base = symbol.split("-")[0] if "-" in symbol else symbol
         return _mock_price_for_symbol(base)
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        return {sym: self.get_current_price(sym) for sym in symbols}
+
     def get_currency(self, symbol: str) -> Optional[str]:
         if "-" in symbol:
             return symbol.split("-")[-1].upper()
@@ -14,6 +14,8 @@ _NEWSDATA_API_KEY = config('NEWSDATA_API_KEY', default="").strip()
 class YahooNewsFetcher(NewsFetcher):
     """Fetch news from Yahoo Finance RSS feeds."""
 
+    provider_name = "yahoo_news"
+
     def get_news(self, query: str, count: int = 5) -> List[Dict]:
         rss_url = f"https://finance.yahoo.com/rss/headline?s={query}"
         feed = feedparser.parse(rss_url)
@@ -30,6 +32,8 @@ class YahooNewsFetcher(NewsFetcher):
 class NewsDataNewsFetcher(NewsFetcher):
     """Fetch news from NewsData API. Requires api_key (e.g. from settings). No-op when key is empty."""
 
+    provider_name = "newsdata"
+
     def __init__(self, api_key: str = None):
         self._api_key = (api_key or _NEWSDATA_API_KEY or "").strip()
 
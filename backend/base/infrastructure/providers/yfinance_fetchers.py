@@ -2,12 +2,14 @@
 Yfinance implementations of data fetcher abstractions.
 """
 import logging
+import warnings
 from datetime import date, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 
 import pandas as pd
 import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError
 
 from collections import defaultdict
 
@@ -15,6 +17,10 @@ from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher,
 
 logger = logging.getLogger(__name__)
 
+# Ticker.history(raise_errors=True) is deprecated in favour of a process-wide
+# switch that would also change yf.download; keep the per-call flag quiet.
+warnings.filterwarnings("ignore", message="'raise_errors' deprecated", category=DeprecationWarning)
+
 _RAW_BROKER_STOCK_SUFFIX_TO_YAHOO: Dict[str, str] = {
     ".LSE": ".L",
     ".UK": ".L",
@@ -55,9 +61,119 @@ def normalize_stock_symbol_for_yfinance(symbol: str) -> str:
     return s
 
 
+# Window downloaded for a batched "current" price: enough to reach the last
+# session across weekends and holidays.
+CURRENT_PRICES_PERIOD = "5d"
+
+
+def _close_frame(data: Optional[pd.DataFrame], yf_symbols: List[str]) -> Optional[pd.DataFrame]:
+    """Extract the Close columns of a ``yf.download`` result, one column per symbol."""
+    if data is None or data.empty:
+        return None
+    try:
+        close = data["Close"]
+    except KeyError:
+        return None
+    if isinstance(close, pd.Series):
+        close = close.to_frame(name=yf_symbols[0])
+    if isinstance(close.columns, pd.MultiIndex):
+        close.columns = close.columns.get_level_values(-1)
+    return close
+
+
+# Yahoo answered for the symbol but had no rows in the range. Every other
+# error - network, rate limit, or a timezone lookup that failed (which is also
+# how unknown symbols are reported) - counts as a failed download.
+def _history_close_series(yf_symbol: str, start_date: date, end_date: date) -> Optional[pd.Series]:
+    """
+    Close prices for one Yahoo symbol via ``Ticker.history``; an empty series
+    when Yahoo has no rows in [start_date, end_date], None when the request failed.
+    """
+    try:
+        hist = yf.Ticker(yf_symbol).history(
+            start=start_date.isoformat(),
+            end=(end_date + timedelta(days=1)).isoformat(),
+            raise_errors=True,
+        )
+    except YFPricesMissingError:
+        return pd.Series(dtype=float)
+    except Exception as e:
+        logger.debug("yfinance history for %s failed: %s", yf_symbol, e)
+        return None
+    if hist is None or hist.empty or "Close" not in hist.columns:
+        return pd.Series(dtype=float)
+    close = hist["Close"].dropna().astype(float)
+    close.index = pd.to_datetime(close.index).date
+    return close
+
+
+def _download_close_series(yf_symbols: List[str], start_date: date, end_date: date) -> Dict[str, pd.Series]:
+    """
+    Download Close prices for [start_date, end_date], one series per Yahoo symbol.
+
+    Symbols Yahoo answered for are returned, with an empty series when it had
+    no rows; symbols whose download failed are omitted. yf.download does not
+    report which symbols failed, so symbols without rows are asked again one
+    by one through ``Ticker.history``, which does. Raises when the whole
+    download fails.
+    """
+    data = yf.download(
+        yf_symbols,
+        start=start_date.isoformat(),
+        end=(end_date + timedelta(days=1)).isoformat(),
+        progress=False,
+    )
+    close = _close_frame(data, yf_symbols)
+    if close is None:
+        close = pd.DataFrame(columns=yf_symbols, dtype=float)
+    close.index = pd.to_datetime(close.index).date
+    close = close.ffill()
+    result: Dict[str, pd.Series] = {}
+    failed: List[str] = []
+    for yf_sym in yf_symbols:
+        series = close[yf_sym].dropna().astype(float) if yf_sym in close.columns else None
+        if series is None or series.empty:
+            series = _history_close_series(yf_sym, start_date, end_date)
+        if series is None:
+            failed.append(yf_sym)
+        else:
+            result[yf_sym] = series
+    if failed:
+        logger.warning("yfinance download failed for %s", sorted(failed))
+    return result
+
+
+def _download_latest_closes(yf_symbols: List[str]) -> Dict[str, Decimal]:
+    """Return the most recent Close per Yahoo symbol using one batched download."""
+    if not yf_symbols:
+        return {}
+    try:
+        data = yf.download(
+            yf_symbols,
+            period=CURRENT_PRICES_PERIOD,
+            progress=False,
+        )
+    except Exception:
+        logger.exception("yfinance current price download failed for %s", yf_symbols)
+        return {}
+    close = _close_frame(data, yf_symbols)
+    if close is None:
+        return {}
+    latest: Dict[str, Decimal] = {}
+    for yf_sym in yf_symbols:
+        if yf_sym not in close.columns:
+            continue
+        series = close[yf_sym].dropna()
+        if not series.empty:
+            latest[yf_sym] = Decimal(str(series.iloc[-1]))
+    return latest
+
+
 class YfinanceStockDataFetcher(StockDataFetcher):
     """Implementation of StockDataFetcher using yfinance library."""
 
+    provider_name = "yfinance"
+
     def __init__(self):
         self._cache = {}
 
@@ -78,6 +194,17 @@ class YfinanceStockDataFetcher(StockDataFetcher):
             logger.warning("Error fetching price for %s: %s", symbol, e)
             return None
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        yf_to_origs: Dict[str, List[str]] = defaultdict(list)
+        for sym in dict.fromkeys(symbols):
+            yf_to_origs[normalize_stock_symbol_for_yfinance(sym)].append(sym)
+        latest = _download_latest_closes(list(yf_to_origs))
+        return {
+            orig: latest[yf_sym]
+            for yf_sym, origs in yf_to_origs.items() if yf_sym in latest
+            for orig in origs
+        }
+
     def get_stock_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         try:
             yf_sym = normalize_stock_symbol_for_yfinance(symbol)
@@ -119,35 +246,13 @@ class YfinanceStockDataFetcher(StockDataFetcher):
             yf_sym = normalize_stock_symbol_for_yfinance(sym)
             yf_to_origs[yf_sym].append(sym)
         yf_symbols = list(yf_to_origs.keys())
-        try:
-            data = yf.download(
-                yf_symbols,
-                start=start_date.isoformat(),
-                end=(end_date + timedelta(days=1)).isoformat(),
-                progress=False,
-            )
-        except Exception:
-            logger.exception("yfinance download failed for %s", yf_symbols)
-            return {}
-        if data is None or data.empty:
-            return {}
-        try:
-            close = data["Close"]
-        except KeyError:
-            return {}
-        if isinstance(close, pd.Series):
-            close = close.to_frame(name=yf_symbols[0])
-        if isinstance(close.columns, pd.MultiIndex):
-            close.columns = close.columns.get_level_values(-1)
-        close.index = pd.to_datetime(close.index).date
-        close = close.ffill()
+        closes = _download_close_series(yf_symbols, start_date, end_date)
         result: Dict[str, pd.Series] = {}
         for yf_sym, orig_syms in yf_to_origs.items():
-            if yf_sym not in close.columns:
+            if yf_sym not in closes:
                 continue
-            series = close[yf_sym].dropna()
             for orig in orig_syms:
-                result[orig] = series
+                result[orig] = closes[yf_sym]
         return result
 
     # ---- Additional methods (integrated from utils/dataFetcher) ----
@@ -256,6 +361,8 @@ class YfinanceStockDataFetcher(StockDataFetcher):
 class YfinanceCryptoDataFetcher(CryptoDataFetcher):
     """Implementation of CryptoDataFetcher using yfinance library."""
 
+    provider_name = "yfinance"
+
     def __init__(self):
         self._cache = {}
 
@@ -281,6 +388,11 @@ class YfinanceCryptoDataFetcher(CryptoDataFetcher):
             logger.warning("Error fetching crypto price for %s: %s", symbol, e)
             return None
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        yf_to_orig = {self._yfinance_symbol(sym): sym for sym in symbols}
+        latest = _download_latest_closes(list(yf_to_orig))
+        return {yf_to_orig[yf_sym]: price for yf_sym, price in latest.items()}
+
     def get_currency(self, symbol: str) -> Optional[str]:
         try:
             if '-' in symbol:
@@ -302,38 +414,15 @@ class YfinanceCryptoDataFetcher(CryptoDataFetcher):
         for sym in symbols:
             yf_to_orig[self._yfinance_symbol(sym)] = sym
         yf_symbols = list(yf_to_orig.keys())
-        try:
-            data = yf.download(
-                yf_symbols,
-                start=start_date.isoformat(),
-                end=(end_date + timedelta(days=1)).isoformat(),
-                progress=False,
-            )
-        except Exception:
-            logger.exception("yfinance crypto download failed for %s", yf_symbols)
-            return {}
-        if data is None or data.empty:
-            return {}
-        try:
-            close = data["Close"]
-        except KeyError:
-            return {}
-        if isinstance(close, pd.Series):
-            close = close.to_frame(name=yf_symbols[0])
-        if isinstance(close.columns, pd.MultiIndex):
-            close.columns = close.columns.get_level_values(-1)
-        close.index = pd.to_datetime(close.index).date
-        close = close.ffill()
-        result: Dict[str, pd.Series] = {}
-        for yf_sym, orig_sym in yf_to_orig.items():
-            if yf_sym in close.columns:
-                result[orig_sym] = close[yf_sym].dropna()
-        return result
+        closes = _download_close_series(yf_symbols, start_date, end_date)
+        return {orig: closes[yf_sym] for yf_sym, orig in yf_to_orig.items() if yf_sym in closes}
 
 
 class YfinanceFXDataFetcher(FXDataFetcher):
     """Implementation of FXDataFetcher using yfinance (e.g. USDPLN=X)."""
 
+    provider_name = "yfinance"
+
     def get_historical_fx_series(
         self,
         from_currency: str,
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0005_economic_calendar_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceCoverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=50, unique=True)),
+                ('intervals', models.JSONField(blank=True, default=list)),
+                ('empty_ranges', models.JSONField(blank=True, default=list)),
+                ('last_fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Price Coverage',
+                'verbose_name_plural': 'Price Coverage',
+                'ordering': ['symbol'],
+            },
+        ),
+    ]
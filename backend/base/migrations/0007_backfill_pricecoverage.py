@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Max, Min
+
+
+def backfill_price_coverage(apps, schema_editor):
+    """Seed one covered interval per symbol from existing PriceHistory rows."""
+    PriceHistory = apps.get_model("base", "PriceHistory")
+    PriceCoverage = apps.get_model("base", "PriceCoverage")
+    rows = (
+        PriceHistory.objects.values("symbol")
+        .annotate(earliest=Min("date"), latest=Max("date"))
+    )
+    PriceCoverage.objects.bulk_create(
+        [
+            PriceCoverage(
+                symbol=row["symbol"],
+                intervals=[[row["earliest"].isoformat(), row["latest"].isoformat()]],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0006_pricecoverage"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_price_coverage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0007_backfill_pricecoverage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FXRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_currency', models.CharField(max_length=10)),
+                ('to_currency', models.CharField(max_length=10)),
+                ('date', models.DateField()),
+                ('rate', models.DecimalField(decimal_places=10, max_digits=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'FX Rate',
+                'verbose_name_plural': 'FX Rates',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('from_currency', 'to_currency', 'date'), name='unique_fx_rate_pair_date')],
+            },
+        ),
+    ]
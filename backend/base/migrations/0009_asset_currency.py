@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:23
+
+from django.db import migrations, models
+
+
+def backfill_asset_currency(apps, schema_editor):
+    """Copy the currency stored with each asset's current price, if any."""
+    Asset = apps.get_model("base", "Asset")
+    CurrentPrice = apps.get_model("base", "CurrentPrice")
+    by_symbol = dict(
+        CurrentPrice.objects.exclude(currency="").values_list("symbol", "currency")
+    )
+    assets = []
+    for asset in Asset.objects.exclude(asset_type="bonds").exclude(symbol=None):
+        currency = by_symbol.get(asset.symbol)
+        if currency:
+            asset.currency = currency
+            assets.append(asset)
+    Asset.objects.bulk_update(assets, ["currency"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_fxrate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='currency',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+        migrations.RunPython(backfill_asset_currency, migrations.RunPython.noop),
+    ]
@@ -38,6 +38,9 @@ class Asset(models.Model):
     inflation_margin = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     base_interest_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
 
+    # Trading currency as reported by the price provider; filled lazily when prices are fetched
+    currency = models.CharField(max_length=10, null=True, blank=True)
+
     def __str__(self):
         if self.symbol:
             return self.symbol
@@ -116,6 +119,59 @@ class PriceHistory(models.Model):
         return f"{self.symbol} @ {self.date}: {self.close}"
 
 
+class PriceCoverage(models.Model):
+    """
+    Per-symbol index of PriceHistory coverage, so gap detection is one lookup
+    instead of loading every stored date.
+
+    ``intervals``: sorted, merged ``[start, end]`` ISO date pairs known to be
+    stored or fetched (days without rows inside them are market closures).
+    ``empty_ranges``: ``[start, end, fetched_at]`` ranges a fetch returned no
+    data for; honoured until PRICE_EMPTY_RANGE_TTL expires.
+    Dropped whenever PriceHistory rows are deleted (rebuilt from the table).
+    """
+    symbol = models.CharField(max_length=50, unique=True)
+    intervals = models.JSONField(default=list, blank=True)
+    empty_ranges = models.JSONField(default=list, blank=True)
+    last_fetched_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["symbol"]
+        verbose_name = "Price Coverage"
+        verbose_name_plural = "Price Coverage"
+
+    def __str__(self):
+        return f"{self.symbol}: {len(self.intervals)} interval(s)"
+
+
+class FXRate(models.Model):
+    """
+    Daily closing exchange rate: amount_in_from * rate = amount_in_to.
+    One record per (from_currency, to_currency, date); backs the in-process
+    FX cache for historical conversions.
+    """
+    from_currency = models.CharField(max_length=10)
+    to_currency = models.CharField(max_length=10)
+    date = models.DateField()
+    rate = models.DecimalField(max_digits=20, decimal_places=10)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name = "FX Rate"
+        verbose_name_plural = "FX Rates"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["from_currency", "to_currency", "date"],
+                name="unique_fx_rate_pair_date",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.from_currency}{self.to_currency} @ {self.date}: {self.rate}"
+
+
 class CurrentPrice(models.Model):
     """
     Stores the latest (current) price for a symbol. One record per symbol;
@@ -1,12 +1,22 @@
 """
 Selectors for economic data (WIBOR, inflation).
-Pure read-only access from the database - no business logic.
+Pure read-only access - no business logic. Value lookups go through the
+in-memory EconomicTimeline; the row getters query the database.
 """
 from typing import Optional
 from decimal import Decimal
 from datetime import date, datetime
 
 from base.models import EconomicData
+from base.services.economic_timeline import get_economic_timeline
+
+
+def _to_date(target_date) -> date:
+    if isinstance(target_date, str):
+        return datetime.strptime(target_date, '%Y-%m-%d').date()
+    if isinstance(target_date, datetime):
+        return target_date.date()
+    return target_date
 
 
 def get_latest_economic_data() -> Optional[EconomicData]:
@@ -15,10 +25,7 @@ def get_latest_economic_data() -> Optional[EconomicData]:
 
 def get_economic_data_for_date(target_date) -> Optional[EconomicData]:
     """Returns economic data for the given date or the nearest earlier record."""
-    if isinstance(target_date, str):
-        target_date = datetime.strptime(target_date, '%Y-%m-%d').date()
-    elif isinstance(target_date, datetime):
-        target_date = target_date.date()
+    target_date = _to_date(target_date)
     try:
         return EconomicData.objects.get(date=target_date)
     except EconomicData.DoesNotExist:
@@ -30,32 +37,16 @@ def get_economic_data_for_date(target_date) -> Optional[EconomicData]:
 
 
 def get_latest_wibor(wibor_type: str = '3M') -> Optional[Decimal]:
-    latest = get_latest_economic_data()
-    if not latest:
-        return None
-    if wibor_type.upper() == '6M':
-        return latest.wibor_6m
-    return latest.wibor_3m
+    return get_economic_timeline().latest_wibor(wibor_type)
 
 
 def get_latest_inflation() -> Optional[Decimal]:
-    latest = get_latest_economic_data()
-    if not latest:
-        return None
-    return latest.inflation_cpi
+    return get_economic_timeline().latest_inflation()
 
 
 def get_inflation_for_date(target_date) -> Optional[Decimal]:
-    data = get_economic_data_for_date(target_date)
-    if not data:
-        return None
-    return data.inflation_cpi
+    return get_economic_timeline().inflation_asof(_to_date(target_date))
 
 
 def get_wibor_for_date(target_date, wibor_type: str = '3M') -> Optional[Decimal]:
-    data = get_economic_data_for_date(target_date)
-    if not data:
-        return None
-    if wibor_type.upper() == '6M':
-        return data.wibor_6m
-    return data.wibor_3m
+    return get_economic_timeline().wibor_asof(_to_date(target_date), wibor_type)
@@ -8,6 +8,8 @@ from base.infrastructure.interfaces import (
 
 from base.services.stock_data_service import get_stock_data
 from base.services.economic_calendar_service import get_earnings, get_ipo
+from base.services.price_series import PriceSeries
+from base.services.economic_timeline import EconomicTimeline, get_economic_timeline
 
 __all__ = [
     'StockDataFetcher',
@@ -23,6 +25,9 @@ __all__ = [
     'get_stock_data',
     'get_earnings',
     'get_ipo',
+    'PriceSeries',
+    'EconomicTimeline',
+    'get_economic_timeline',
 ]
 
 
@@ -0,0 +1,81 @@
+"""
+Small in-process caches shared across requests handled by one worker.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire *ttl* seconds after being set.
+
+    ``get_or_set`` computes a missing value under a per-key lock, so
+    concurrent callers asking for the same key wait for one computation
+    instead of each running it. ``None`` results are never cached.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 900.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None when missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store *value*; evicts the least recently used entry when full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Optional[Any]],
+        ttl: Optional[float] = None,
+    ) -> Optional[Any]:
+        """Return the cached value, computing it with *factory* at most once per key at a time."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key)
+            if value is None:
+                value = factory()
+                if value is not None:
+                    self.set(key, value, ttl=ttl)
+        with self._lock:
+            if not key_lock.locked():
+                self._key_locks.pop(key, None)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
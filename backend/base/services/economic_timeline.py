@@ -0,0 +1,93 @@
+"""
+Process-wide, immutable snapshot of EconomicData for as-of lookups.
+
+Bond valuation asks for WIBOR / CPI once per bond, per anniversary, per
+snapshot day. The timeline loads the whole (small, monthly) table in one
+query and answers those lookups with ``bisect`` over sorted dates. It is
+dropped whenever EconomicData is written (see ``base.signals``) and, as a
+safety net for writes made by other processes, after ECONOMIC_TIMELINE_TTL.
+"""
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Sequence, Tuple
+
+from base.models import EconomicData
+from base.services.cache import TTLCache
+
+# Upper bound on how long another worker's write can go unnoticed.
+ECONOMIC_TIMELINE_TTL = 60 * 60
+
+_CACHE_KEY = "economic_timeline"
+_timeline_cache = TTLCache(maxsize=1, ttl=ECONOMIC_TIMELINE_TTL)
+
+
+class EconomicTimeline:
+    """Sorted WIBOR 3M/6M and CPI readings with as-of lookups."""
+
+    __slots__ = ("dates", "wibor_3m", "wibor_6m", "inflation_cpi")
+
+    def __init__(
+        self,
+        dates: Sequence[date],
+        wibor_3m: Sequence[Decimal],
+        wibor_6m: Sequence[Decimal],
+        inflation_cpi: Sequence[Decimal],
+    ):
+        """
+        Args:
+            dates: Measurement dates, sorted ascending.
+            wibor_3m, wibor_6m, inflation_cpi: Values aligned with *dates*.
+        """
+        self.dates: Tuple[date, ...] = tuple(dates)
+        self.wibor_3m: Tuple[Decimal, ...] = tuple(wibor_3m)
+        self.wibor_6m: Tuple[Decimal, ...] = tuple(wibor_6m)
+        self.inflation_cpi: Tuple[Decimal, ...] = tuple(inflation_cpi)
+
+    @classmethod
+    def load(cls) -> "EconomicTimeline":
+        """Build the timeline from EconomicData with a single query."""
+        rows = list(
+            EconomicData.objects.order_by("date").values_list(
+                "date", "wibor_3m", "wibor_6m", "inflation_cpi",
+            )
+        )
+        if not rows:
+            return cls((), (), (), ())
+        return cls(*zip(*rows))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _index_asof(self, target: date) -> Optional[int]:
+        pos = bisect_right(self.dates, target) - 1
+        return pos if pos >= 0 else None
+
+    def _wibor_column(self, wibor_type: str) -> Tuple[Decimal, ...]:
+        return self.wibor_6m if wibor_type.upper() == "6M" else self.wibor_3m
+
+    def wibor_asof(self, target: date, wibor_type: str = "3M") -> Optional[Decimal]:
+        """WIBOR on *target* or the nearest earlier reading; None if there is none."""
+        pos = self._index_asof(target)
+        return None if pos is None else self._wibor_column(wibor_type)[pos]
+
+    def inflation_asof(self, target: date) -> Optional[Decimal]:
+        """CPI on *target* or the nearest earlier reading; None if there is none."""
+        pos = self._index_asof(target)
+        return None if pos is None else self.inflation_cpi[pos]
+
+    def latest_wibor(self, wibor_type: str = "3M") -> Optional[Decimal]:
+        return self._wibor_column(wibor_type)[-1] if self.dates else None
+
+    def latest_inflation(self) -> Optional[Decimal]:
+        return self.inflation_cpi[-1] if self.dates else None
+
+
+def get_economic_timeline() -> EconomicTimeline:
+    """Return the shared timeline, loading it on first use after an invalidation."""
+    return _timeline_cache.get_or_set(_CACHE_KEY, EconomicTimeline.load)
+
+
+def invalidate_economic_timeline() -> None:
+    """Drop the shared timeline; the next lookup reloads it."""
+    _timeline_cache.delete(_CACHE_KEY)
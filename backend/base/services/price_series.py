@@ -0,0 +1,231 @@
+"""
+Sorted daily price series with O(log n) as-of lookups.
+
+Prices are stored as two parallel numpy arrays (``datetime64[D]`` dates and
+float closes) sorted by date, so "price on or before a day" is a
+``searchsorted`` instead of a scan over the whole index.
+
+``PriceSeriesCache`` keeps loaded series process-wide (LRU under a memory
+budget), so builds for many users holding the same symbols read each
+PriceHistory range once.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Upper bound on cached (symbol, range) entries, whatever their size.
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class PriceSeries:
+    """Immutable close-price series indexed by calendar day."""
+
+    __slots__ = ("dates", "values")
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray):
+        """
+        Args:
+            dates: ``datetime64[D]`` array, sorted ascending.
+            values: float array of the same length, without NaN.
+        """
+        self.dates = dates
+        self.values = values
+
+    @classmethod
+    def _build(cls, dates: np.ndarray, values: np.ndarray) -> "PriceSeries":
+        keep = ~np.isnan(values)
+        dates, values = dates[keep], values[keep]
+        order = np.argsort(dates, kind="stable")
+        return cls(dates[order], values[order])
+
+    @classmethod
+    def from_dict(cls, prices: Mapping[date, Union[Decimal, float]]) -> "PriceSeries":
+        """Build from a ``{date: close}`` mapping (e.g. ``PriceRepository`` output)."""
+        if not prices:
+            return cls.empty_series()
+        dates = np.array(list(prices.keys()), dtype="datetime64[D]")
+        values = np.array([float(v) for v in prices.values()], dtype=float)
+        return cls._build(dates, values)
+
+    @classmethod
+    def from_series(cls, series: Optional[pd.Series]) -> "PriceSeries":
+        """Build from a pandas Series indexed by dates or timestamps."""
+        if series is None or series.empty:
+            return cls.empty_series()
+        index = series.index
+        if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+            index = index.tz_localize(None)
+        dates = np.array(
+            [i.date() if hasattr(i, "date") else i for i in index],
+            dtype="datetime64[D]",
+        )
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+        return cls._build(dates, values)
+
+    @classmethod
+    def empty_series(cls) -> "PriceSeries":
+        return cls(np.array([], dtype="datetime64[D]"), np.array([], dtype=float))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.dates) == 0
+
+    def asof(self, target: date) -> Optional[float]:
+        """Close on *target* or the most recent earlier day; None if there is none."""
+        pos = int(np.searchsorted(self.dates, np.datetime64(target, "D"), side="right")) - 1
+        if pos < 0:
+            return None
+        return float(self.values[pos])
+
+    def asof_or_next(self, target: date) -> Optional[float]:
+        """Like :meth:`asof`, falling back to the first later close when nothing earlier exists."""
+        if self.empty:
+            return None
+        price = self.asof(target)
+        if price is not None:
+            return price
+        return float(self.values[0])
+
+    def asof_many(self, days: Iterable[date]) -> np.ndarray:
+        """Vectorized :meth:`asof` over *days*; NaN where no earlier close exists."""
+        keys = np.asarray(list(days), dtype="datetime64[D]")
+        out = np.full(len(keys), np.nan)
+        if self.empty:
+            return out
+        pos = np.searchsorted(self.dates, keys, side="right") - 1
+        known = pos >= 0
+        out[known] = self.values[pos[known]]
+        return out
+
+    def between(self, start: date, end: date) -> "PriceSeries":
+        """Closes on days in [start, end]."""
+        lo = int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        hi = int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+        return PriceSeries(self.dates[lo:hi], self.values[lo:hi])
+
+    def to_pandas(self) -> pd.Series:
+        """pandas Series of closes indexed by a DatetimeIndex."""
+        return pd.Series(self.values, index=pd.DatetimeIndex(self.dates), dtype=float)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.dates.nbytes + self.values.nbytes)
+
+
+class PriceSeriesCache:
+    """
+    Thread-safe LRU of per-symbol PriceSeries loaded for a date range.
+
+    A lookup is served by any cached range of the symbol that contains the
+    requested one (sliced to it). Entries expire after *ttl* seconds and the
+    least recently used ones are evicted once their arrays exceed
+    *max_bytes* or there are more than *max_entries*; ``max_bytes=0``
+    disables caching. Empty series are not cached: they cost no bytes and
+    usually mean the prices could not be fetched yet.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 900.0,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.nbytes = 0
+        self._data: "OrderedDict[Tuple[str, date, date], Tuple[PriceSeries, float]]" = OrderedDict()
+        self._ranges: Dict[str, Set[Tuple[date, date]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, start: date, end: date) -> Optional[PriceSeries]:
+        """Series for symbol on [start, end] if a cached range covers it, else None."""
+        now = time.monotonic()
+        with self._lock:
+            for lo, hi in list(self._ranges.get(symbol, ())):
+                if not (lo <= start and end <= hi):
+                    continue
+                key = (symbol, lo, hi)
+                series, expires_at = self._data[key]
+                if expires_at <= now:
+                    self._remove(key)
+                    continue
+                self._data.move_to_end(key)
+                return series if (lo, hi) == (start, end) else series.between(start, end)
+        return None
+
+    def get_many(self, symbols: Iterable[str], start: date, end: date) -> Dict[str, PriceSeries]:
+        """Cached series for those *symbols* that have one; the rest are omitted."""
+        found = {}
+        for symbol in symbols:
+            series = self.get(symbol, start, end)
+            if series is not None:
+                found[symbol] = series
+        return found
+
+    def set(self, symbol: str, start: date, end: date, series: PriceSeries) -> None:
+        if self.max_bytes <= 0 or series.empty or series.nbytes > self.max_bytes:
+            return
+        key = (symbol, start, end)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (series, time.monotonic() + self.ttl)
+            self._ranges.setdefault(symbol, set()).add((start, end))
+            self.nbytes += series.nbytes
+            while self.nbytes > self.max_bytes or len(self._data) > self.max_entries:
+                self._remove(next(iter(self._data)))
+
+    def invalidate(self, symbols: Iterable[str]) -> None:
+        """Drop every cached range of *symbols* (their PriceHistory changed)."""
+        with self._lock:
+            for symbol in symbols:
+                for lo, hi in list(self._ranges.get(symbol, ())):
+                    self._remove((symbol, lo, hi))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._ranges.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def _remove(self, key: Tuple[str, date, date]) -> None:
+        series, _ = self._data.pop(key)
+        self.nbytes -= series.nbytes
+        symbol, lo, hi = key
+        ranges = self._ranges.get(symbol)
+        if ranges is not None:
+            ranges.discard((lo, hi))
+            if not ranges:
+                del self._ranges[symbol]
+
+
+_shared_cache: Optional[PriceSeriesCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_price_series_cache() -> PriceSeriesCache:
+    """The process-wide PriceSeriesCache, sized by PRICE_SERIES_CACHE_MAX_BYTES / _TTL / _MAX_ENTRIES."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            from django.conf import settings
+            _shared_cache = PriceSeriesCache(
+                max_bytes=getattr(settings, "PRICE_SERIES_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+                ttl=getattr(settings, "PRICE_SERIES_CACHE_TTL", 900.0),
+                max_entries=getattr(settings, "PRICE_SERIES_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+            )
+        return _shared_cache
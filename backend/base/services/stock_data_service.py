@@ -1,11 +1,21 @@
 """
 Service for serving stock data (basic info, fundamental, technical) from DB cache
-or from the fetcher when cache is missing or stale.
+or from the fetcher when cache is missing or stale. Concurrent misses for the
+same symbol and data type share one fetch.
 """
 import logging
-from datetime import datetime, timezone, timedelta
+from dataclasses import replace
+from datetime import timedelta
 from typing import Any, Optional
 
+from base.infrastructure.db.locks import coalesced
+from base.infrastructure.db.refresh import (
+    FRESH,
+    RefreshPolicy,
+    get_refresh_policy,
+    refresh_in_background,
+    serve_stale,
+)
 from base.infrastructure.db.stock_data_cache_repository import StockDataCacheRepository
 
 logger = logging.getLogger(__name__)
@@ -32,25 +42,51 @@ def get_stock_data(
     max_age: Optional[timedelta] = None,
 ) -> dict:
     """
-    Return stock data for symbol and data_type. Uses cache if present and not older than max_age;
-    otherwise fetches from fetcher, saves via repository and returns.
+    Return stock data for symbol and data_type. Uses cache if present and not older than max_age
+    (default: the data type's refresh policy); otherwise fetches from fetcher, saves via repository
+    and returns. Within the policy's max staleness the cached data is returned at once and
+    refreshed in the background.
 
     data_type: one of 'basic_info', 'fundamental_analysis', 'technical_indicators'.
     fetcher: must have get_basic_stock_info, get_fundamental_analysis, get_technical_indicators.
     """
     repo = repository or StockDataCacheRepository()
-    max_age = max_age or STOCK_DATA_CACHE_MAX_AGE
+    policy = get_refresh_policy(data_type, STOCK_DATA_CACHE_MAX_AGE)
+    if max_age is not None:
+        policy = replace(policy, max_age=max_age)
+    key = f"stock_data:{symbol}:{data_type}"
+
+    def refresh() -> dict:
+        return _refresh_stock_data(symbol, data_type, fetcher, repo, policy)
+
+    cached = _get_cached(repo, symbol, data_type)
+    state = policy.state(cached.updated_at if cached is not None else None)
+    if state == FRESH:
+        return cached.data
+    if serve_stale(state):
+        refresh_in_background(key, refresh)
+        return cached.data
+    return coalesced(key, refresh)
+
+
+def _get_cached(repo: StockDataCacheRepository, symbol: str, data_type: str):
     try:
-        cached = repo.get(symbol, data_type)
-        if cached is not None:
-            now = datetime.now(timezone.utc)
-            updated = cached.updated_at
-            if updated.tzinfo is None:
-                updated = updated.replace(tzinfo=timezone.utc)
-            if now - updated <= max_age:
-                return cached.data
+        return repo.get(symbol, data_type)
     except Exception:
-        pass
+        return None
+
+
+def _refresh_stock_data(
+    symbol: str,
+    data_type: str,
+    fetcher: Any,
+    repo: StockDataCacheRepository,
+    policy: RefreshPolicy,
+) -> dict:
+    """Fetch and cache stock data unless another worker cached it meanwhile (runs coalesced)."""
+    cached = _get_cached(repo, symbol, data_type)
+    if cached is not None and policy.state(cached.updated_at) == FRESH:
+        return cached.data
 
     logger.info("Fetching stock data from external API: symbol=%s, data_type=%s", symbol, data_type)
     fetch_methods = {
@@ -0,0 +1,30 @@
+"""
+Signal handlers for base models.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from base.infrastructure.db.fx_rate_repository import fx_coverage_key
+from base.models import EconomicData, FXRate, PriceCoverage, PriceHistory
+from base.services.economic_timeline import invalidate_economic_timeline
+
+
+@receiver(post_delete, sender=PriceHistory)
+def drop_price_coverage(sender, instance, **kwargs):
+    """Deleted rows invalidate the coverage index; it is rebuilt from PriceHistory on next read."""
+    PriceCoverage.objects.filter(symbol=instance.symbol).delete()
+
+
+@receiver(post_delete, sender=FXRate)
+def drop_fx_rate_coverage(sender, instance, **kwargs):
+    """Same as drop_price_coverage, for a currency pair."""
+    PriceCoverage.objects.filter(
+        symbol=fx_coverage_key(instance.from_currency, instance.to_currency),
+    ).delete()
+
+
+@receiver(post_save, sender=EconomicData)
+@receiver(post_delete, sender=EconomicData)
+def drop_economic_timeline(sender, **kwargs):
+    """Any EconomicData write makes the cached timeline stale."""
+    invalidate_economic_timeline()
@@ -0,0 +1,101 @@
+"""Tests for stale-while-revalidate serving of CurrentPrice and StockDataCache."""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from base.infrastructure.db.price_repository import PriceRepository
+from base.infrastructure.db.refresh import EXPIRED, FRESH, STALE, RefreshPolicy, get_refresh_policy
+from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher
+from base.models import CurrentPrice, StockDataCache
+from base.services.stock_data_service import get_stock_data
+
+POLICIES = {
+    "current_price": {"max_age": 900, "max_stale": 3600},
+    "basic_info": {"max_age": 900, "max_stale": 3600},
+}
+
+
+def _ago(**kwargs):
+    return datetime.now(timezone.utc) - timedelta(**kwargs)
+
+
+class TestRefreshPolicy(SimpleTestCase):
+    def test_state(self):
+        policy = RefreshPolicy(max_age=timedelta(minutes=15), max_stale=timedelta(hours=1))
+
+        self.assertEqual(policy.state(_ago(minutes=5)), FRESH)
+        self.assertEqual(policy.state(_ago(minutes=30)), STALE)
+        self.assertEqual(policy.state(_ago(hours=2)), EXPIRED)
+        self.assertEqual(policy.state(None), EXPIRED)
+
+    @override_settings(CACHE_REFRESH_POLICIES=POLICIES)
+    def test_policy_from_settings_and_default(self):
+        self.assertEqual(get_refresh_policy("basic_info", timedelta(0)).max_stale, timedelta(hours=1))
+
+        default = get_refresh_policy("unknown", timedelta(minutes=5))
+        self.assertEqual(default, RefreshPolicy(max_age=timedelta(minutes=5)))
+
+
+@override_settings(CACHE_REFRESH_IN_BACKGROUND=True, CACHE_REFRESH_POLICIES=POLICIES)
+class TestStaleWhileRevalidate(TestCase):
+    def _age_current_price(self, symbol, **kwargs):
+        CurrentPrice.objects.filter(symbol=symbol).update(updated_at=_ago(**kwargs))
+
+    def test_stale_price_served_and_refreshed_in_background(self):
+        CurrentPrice.objects.create(symbol="AAPL", price=Decimal("190"), currency="USD")
+        self._age_current_price("AAPL", minutes=30)
+        fetcher = Mock(spec=StockDataFetcher)
+        fetcher.get_current_price.return_value = Decimal("195")
+
+        with patch("base.infrastructure.db.price_repository.refresh_in_background") as schedule:
+            price = PriceRepository().get_current_price("AAPL", fetcher)
+
+        self.assertEqual(price, Decimal("190"))
+        fetcher.get_current_price.assert_not_called()
+        key, refresh = schedule.call_args.args
+        self.assertEqual(key, "current_price:AAPL")
+        self.assertEqual(refresh(), (Decimal("195"), "USD"))
+        self.assertEqual(CurrentPrice.objects.get(symbol="AAPL").price, Decimal("195"))
+
+    def test_expired_price_refetched_synchronously(self):
+        CurrentPrice.objects.create(symbol="AAPL", price=Decimal("190"), currency="USD")
+        self._age_current_price("AAPL", hours=3)
+        fetcher = Mock(spec=StockDataFetcher)
+        fetcher.get_current_price.return_value = Decimal("195")
+
+        with patch("base.infrastructure.db.price_repository.refresh_in_background") as schedule:
+            price = PriceRepository().get_current_price("AAPL", fetcher)
+
+        self.assertEqual(price, Decimal("195"))
+        schedule.assert_not_called()
+
+    def test_batch_quotes_serve_stale_and_fetch_missing(self):
+        CurrentPrice.objects.create(symbol="AAPL", price=Decimal("190"), currency="USD")
+        self._age_current_price("AAPL", minutes=30)
+        fetcher = Mock(spec=StockDataFetcher)
+        fetcher.get_current_prices.return_value = {"MSFT": Decimal("410")}
+        fetcher.get_currency.return_value = "USD"
+
+        with patch("base.infrastructure.db.price_repository.refresh_in_background") as schedule:
+            quotes = PriceRepository().get_current_quotes(["AAPL", "MSFT"], fetcher)
+
+        self.assertEqual(quotes, {"AAPL": (Decimal("190"), "USD"), "MSFT": (Decimal("410"), "USD")})
+        fetcher.get_current_prices.assert_called_once_with(["MSFT"])
+        self.assertEqual(schedule.call_args.args[0], "current_prices:AAPL")
+
+    def test_stale_stock_data_served_and_refreshed_in_background(self):
+        StockDataCache.objects.create(symbol="AAPL", data_type="basic_info", data={"name": "old"})
+        StockDataCache.objects.filter(symbol="AAPL").update(updated_at=_ago(minutes=30))
+        fetcher = Mock()
+        fetcher.get_basic_stock_info.return_value = {"name": "new"}
+
+        with patch("base.services.stock_data_service.refresh_in_background") as schedule:
+            data = get_stock_data("AAPL", "basic_info", fetcher)
+
+        self.assertEqual(data, {"name": "old"})
+        fetcher.get_basic_stock_info.assert_not_called()
+        key, refresh = schedule.call_args.args
+        self.assertEqual(key, "stock_data:AAPL:basic_info")
+        self.assertEqual(refresh(), {"name": "new"})
@@ -0,0 +1,181 @@
+"""Tests for bounded provider concurrency and the async fetcher adapters."""
+import asyncio
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from django.test import SimpleTestCase
+
+from base.infrastructure.concurrency import ProviderLimiter, SingleFlight, gather_calls, run_sync
+from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher
+from base.infrastructure.interfaces.news_fetcher import NewsFetcher
+from base.infrastructure.providers.async_adapters import (
+    ThreadedAsyncStockDataFetcher,
+    fetch_news,
+)
+
+
+class _SlowStockFetcher(StockDataFetcher):
+    """One blocking call per symbol, like ``yf.Ticker(sym).info``."""
+
+    provider_name = "test-slow-stocks"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_current_price(self, symbol: str) -> Optional[Decimal]:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return None if symbol == "MISSING" else Decimal(len(symbol))
+
+    def get_stock_info(self, symbol):
+        return None
+
+    def get_currency(self, symbol):
+        return "USD"
+
+    def get_historical_prices(self, symbols, start_date, end_date):
+        return {}
+
+
+class _StaticNewsFetcher(NewsFetcher):
+    def __init__(self, title: str, delay: float = 0.0, fail: bool = False):
+        self.title = title
+        self.delay = delay
+        self.fail = fail
+
+    def get_news(self, query: str, count: int = 5) -> List[Dict]:
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [{"title": f"{self.title} {query}"}]
+
+
+class ProviderLimiterTests(SimpleTestCase):
+    def test_bounds_concurrency(self):
+        limiter = ProviderLimiter("test-bound", max_concurrency=3, timeout=5)
+        fetcher = _SlowStockFetcher(delay=0.05)
+
+        results = run_sync(gather_calls(limiter, fetcher.get_current_price, ["A"] * 9))
+
+        self.assertEqual(results, [Decimal(1)] * 9)
+        self.assertEqual(fetcher.max_in_flight, 3)
+
+    def test_timeout_and_error_return_default(self):
+        limiter = ProviderLimiter("test-timeout", timeout=0.05)
+
+        def boom():
+            raise ValueError("bad")
+
+        self.assertEqual(run_sync(limiter.run(time.sleep, 0.5, default="late")), "late")
+        self.assertIsNone(run_sync(limiter.run(boom)))
+
+    def test_min_interval_spaces_call_starts(self):
+        limiter = ProviderLimiter("test-pace", max_concurrency=4, min_interval=0.05, timeout=5)
+        starts: List[float] = []
+
+        started = time.monotonic()
+        run_sync(gather_calls(limiter, lambda _: starts.append(time.monotonic()), range(4)))
+
+        self.assertGreaterEqual(max(starts) - started, 0.14)
+
+    def test_run_sync_inside_running_loop(self):
+        async def outer():
+            return run_sync(asyncio.sleep(0, result=42))
+
+        self.assertEqual(asyncio.run(outer()), 42)
+
+
+class AsyncAdapterTests(SimpleTestCase):
+    def test_default_batch_prices_take_about_one_call(self):
+        """40 one-by-one lookups finish in far less than 40 sequential calls."""
+        fetcher = _SlowStockFetcher(delay=0.1)
+        symbols = [f"S{i}" for i in range(39)] + ["MISSING"]
+
+        started = time.monotonic()
+        prices = fetcher.get_current_prices(symbols)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(len(prices), 39)
+        self.assertNotIn("MISSING", prices)
+        self.assertLess(elapsed, 40 * 0.1 / 2)
+
+    def test_async_adapter_uses_fetcher_batch_api(self):
+        class BatchFetcher(_SlowStockFetcher):
+            def get_current_prices(self, symbols):
+                return {s: Decimal("1") for s in symbols}
+
+        fetcher = BatchFetcher(delay=0)
+        adapter = ThreadedAsyncStockDataFetcher(fetcher, ProviderLimiter("test-batch"))
+
+        prices = run_sync(adapter.get_current_prices(["A", "B", "A"]))
+
+        self.assertEqual(prices, {"A": Decimal("1"), "B": Decimal("1")})
+        self.assertEqual(fetcher.max_in_flight, 0)
+
+    def test_fetch_news_runs_fetchers_concurrently_in_order(self):
+        fetchers = [
+            _StaticNewsFetcher("slow", delay=0.2),
+            _StaticNewsFetcher("down", fail=True),
+            _StaticNewsFetcher("fast", delay=0.2),
+        ]
+
+        started = time.monotonic()
+        news = fetch_news(fetchers, "AAPL")
+        elapsed = time.monotonic() - started
+
+        self.assertEqual([a["title"] for a in news], ["slow AAPL", "fast AAPL"])
+        self.assertLess(elapsed, 0.35)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def _run_concurrently(self, func, n=6):
+        outcomes = []
+
+        def call():
+            try:
+                outcomes.append(func())
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return len(calls)
+
+        outcomes = self._run_concurrently(lambda: flight.do("AAPL", fetch))
+
+        self.assertEqual(outcomes, [1] * 6)
+        self.assertFalse(flight.in_flight("AAPL"))
+        self.assertEqual(flight.do("AAPL", fetch), 2)
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError("provider down")
+
+        outcomes = self._run_concurrently(lambda: flight.do("AAPL", fail), n=3)
+
+        self.assertEqual(len(outcomes), 3)
+        self.assertTrue(all(isinstance(o, RuntimeError) for o in outcomes))
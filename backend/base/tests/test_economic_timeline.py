@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from base.models import EconomicData
+from base.selectors.economic_data import (
+    get_inflation_for_date,
+    get_latest_inflation,
+    get_latest_wibor,
+    get_wibor_for_date,
+)
+from base.services.economic_timeline import (
+    EconomicTimeline,
+    get_economic_timeline,
+    invalidate_economic_timeline,
+)
+from portfolio.services.calculators import BondCalculator
+
+
+class TestEconomicTimeline(TestCase):
+    """Tests for the in-memory EconomicData timeline."""
+
+    def setUp(self):
+        invalidate_economic_timeline()
+        # Rolled-back rows do not fire signals; never leak a loaded timeline to other tests
+        self.addCleanup(invalidate_economic_timeline)
+        EconomicData.objects.create(
+            date=date(2024, 1, 31), wibor_3m=Decimal("5.85"),
+            wibor_6m=Decimal("5.80"), inflation_cpi=Decimal("3.70"),
+        )
+        EconomicData.objects.create(
+            date=date(2024, 2, 29), wibor_3m=Decimal("5.86"),
+            wibor_6m=Decimal("5.79"), inflation_cpi=Decimal("2.80"),
+        )
+
+    def test_asof_lookups(self):
+        timeline = EconomicTimeline.load()
+
+        self.assertEqual(timeline.inflation_asof(date(2024, 1, 31)), Decimal("3.70"))
+        self.assertEqual(timeline.inflation_asof(date(2024, 2, 15)), Decimal("3.70"))
+        self.assertEqual(timeline.wibor_asof(date(2024, 3, 10), "6M"), Decimal("5.79"))
+        self.assertIsNone(timeline.inflation_asof(date(2023, 12, 31)))
+        self.assertEqual(timeline.latest_wibor("3M"), Decimal("5.86"))
+        self.assertEqual(timeline.latest_inflation(), Decimal("2.80"))
+
+    def test_empty_timeline(self):
+        timeline = EconomicTimeline((), (), (), ())
+
+        self.assertIsNone(timeline.latest_wibor())
+        self.assertIsNone(timeline.inflation_asof(date(2024, 1, 1)))
+
+    def test_selectors_read_from_shared_timeline_without_queries(self):
+        get_economic_timeline()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_latest_wibor("6M"), Decimal("5.79"))
+            self.assertEqual(get_latest_inflation(), Decimal("2.80"))
+            self.assertEqual(get_inflation_for_date("2024-02-10"), Decimal("3.70"))
+            self.assertEqual(get_wibor_for_date(date(2024, 2, 29)), Decimal("5.86"))
+
+    def test_write_invalidates_timeline(self):
+        self.assertEqual(get_latest_inflation(), Decimal("2.80"))
+
+        EconomicData.objects.create(
+            date=date(2024, 3, 31), wibor_3m=Decimal("5.87"),
+            wibor_6m=Decimal("5.78"), inflation_cpi=Decimal("2.00"),
+        )
+        self.assertEqual(get_latest_inflation(), Decimal("2.00"))
+
+        EconomicData.objects.filter(date=date(2024, 3, 31)).first().delete()
+        self.assertEqual(get_latest_inflation(), Decimal("2.80"))
+
+    def test_bond_ladder_daily_valuation_runs_no_queries_after_load(self):
+        calculator = BondCalculator()
+        ladder = [
+            {
+                'face_value': 100,
+                'quantity': Decimal('10'),
+                'maturity_date': date(2030, 1, 1),
+                'purchase_date': date(2021, 1, 1) + timedelta(days=90 * i),
+                'bond_type': 'EDO',
+                'interest_rate_type': 'indexed_inflation',
+                'inflation_margin': Decimal('1.25'),
+                'base_interest_rate': Decimal('1.70'),
+            }
+            for i in range(4)
+        ]
+        get_economic_timeline()
+
+        with self.assertNumQueries(0):
+            day = date(2022, 1, 1)
+            while day <= date(2024, 12, 31):
+                for bond in ladder:
+                    self.assertIsNotNone(calculator.get_current_value(bond, valuation_date=day))
+                day += timedelta(days=1)
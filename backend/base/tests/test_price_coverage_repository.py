@@ -0,0 +1,163 @@
+# Tests for the PriceHistory coverage index
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pandas as pd
+
+from django.test import SimpleTestCase, TestCase
+
+from base.infrastructure.db.price_coverage_repository import (
+    PRICE_EMPTY_RANGE_TTL,
+    PRICE_FETCH_FAILURE_BACKOFF,
+    merge_intervals,
+    subtract_intervals,
+)
+from base.infrastructure.db.price_repository import PriceRepository
+from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher
+from base.models import PriceCoverage, PriceHistory
+
+
+class TestIntervalHelpers(SimpleTestCase):
+    def test_merge_joins_overlapping_and_adjacent(self):
+        merged = merge_intervals([
+            (date(2025, 1, 10), date(2025, 1, 12)),
+            (date(2025, 1, 1), date(2025, 1, 5)),
+            (date(2025, 1, 6), date(2025, 1, 7)),
+        ])
+        self.assertEqual(merged, [
+            (date(2025, 1, 1), date(2025, 1, 7)),
+            (date(2025, 1, 10), date(2025, 1, 12)),
+        ])
+
+    def test_subtract_returns_head_middle_and_tail(self):
+        missing = subtract_intervals(date(2025, 1, 1), date(2025, 1, 31), [
+            (date(2025, 1, 5), date(2025, 1, 10)),
+            (date(2025, 1, 20), date(2025, 1, 25)),
+        ])
+        self.assertEqual(missing, [
+            (date(2025, 1, 1), date(2025, 1, 4)),
+            (date(2025, 1, 11), date(2025, 1, 19)),
+            (date(2025, 1, 26), date(2025, 1, 31)),
+        ])
+
+
+class TestPriceCoverageIndex(TestCase):
+    def setUp(self):
+        self.repo = PriceRepository()
+        self.mock_fetcher = Mock(spec=StockDataFetcher)
+
+    def test_save_prices_records_coverage(self):
+        self.repo.save_prices("AAPL", [
+            {"date": date(2025, 1, 6), "close": Decimal("1")},
+            {"date": date(2025, 1, 10), "close": Decimal("2")},
+        ])
+        coverage = PriceCoverage.objects.get(symbol="AAPL")
+        self.assertEqual(coverage.intervals, [["2025-01-06", "2025-01-06"], ["2025-01-10", "2025-01-10"]])
+
+    def test_sparse_save_leaves_gaps_to_fetch(self):
+        self.repo.save_prices("AAPL", [
+            {"date": date(2025, 1, 6), "close": Decimal("1")},
+            {"date": date(2025, 1, 7), "close": Decimal("1")},
+            {"date": date(2025, 1, 10), "close": Decimal("2")},
+        ])
+        self.mock_fetcher.get_historical_prices.return_value = {}
+
+        self.repo.get_price_history("AAPL", date(2025, 1, 6), date(2025, 1, 10), self.mock_fetcher)
+
+        self.mock_fetcher.get_historical_prices.assert_called_once_with(
+            ["AAPL"], date(2025, 1, 8), date(2025, 1, 9)
+        )
+
+    def test_empty_fetch_is_not_repeated_within_ttl(self):
+        self.mock_fetcher.get_historical_prices.return_value = {"DELISTED": pd.Series(dtype=float)}
+
+        for _ in range(3):
+            self.repo.get_price_history("DELISTED", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        self.mock_fetcher.get_historical_prices.assert_called_once()
+        self.assertIsNotNone(PriceCoverage.objects.get(symbol="DELISTED").last_fetched_at)
+
+    def test_empty_fetch_is_retried_after_ttl(self):
+        self.mock_fetcher.get_historical_prices.return_value = {"DELISTED": pd.Series(dtype=float)}
+        self.repo.get_price_history("DELISTED", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+        coverage = PriceCoverage.objects.get(symbol="DELISTED")
+        expired = datetime.now(timezone.utc) - PRICE_EMPTY_RANGE_TTL - timedelta(minutes=1)
+        coverage.empty_ranges = [[lo, hi, expired.isoformat()] for lo, hi, _ in coverage.empty_ranges]
+        coverage.save()
+
+        self.repo.get_price_history("DELISTED", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        self.assertEqual(self.mock_fetcher.get_historical_prices.call_count, 2)
+
+    def test_failed_fetch_is_not_recorded_as_empty(self):
+        # Symbol dropped from the result: the provider did not answer for it
+        self.mock_fetcher.get_historical_prices.return_value = {}
+        self.repo.get_price_history("AAPL", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        coverage = PriceCoverage.objects.get(symbol="AAPL")
+        self.assertEqual(coverage.intervals, [])
+        self.assertIsNone(coverage.last_fetched_at)
+        self.assertEqual(len(coverage.empty_ranges), 1)
+        self.assertEqual(coverage.empty_ranges[0][3], PRICE_FETCH_FAILURE_BACKOFF.total_seconds())
+
+    def test_failed_fetch_is_retried_after_backoff(self):
+        self.mock_fetcher.get_historical_prices.side_effect = RuntimeError("rate limited")
+        self.repo.get_price_history("AAPL", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+        self.repo.get_price_history("AAPL", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+        self.mock_fetcher.get_historical_prices.assert_called_once()
+
+        coverage = PriceCoverage.objects.get(symbol="AAPL")
+        expired = datetime.now(timezone.utc) - PRICE_FETCH_FAILURE_BACKOFF - timedelta(seconds=1)
+        coverage.empty_ranges = [[lo, hi, expired.isoformat(), ttl] for lo, hi, _, ttl in coverage.empty_ranges]
+        coverage.save()
+        self.mock_fetcher.get_historical_prices.side_effect = None
+        self.mock_fetcher.get_historical_prices.return_value = {
+            "AAPL": pd.Series({pd.Timestamp("2025-01-07"): 100.0}),
+        }
+
+        result = self.repo.get_price_history("AAPL", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        self.assertEqual(self.mock_fetcher.get_historical_prices.call_count, 2)
+        self.assertEqual(result, {date(2025, 1, 7): Decimal("100")})
+
+    def test_fetched_weekend_tail_is_not_refetched(self):
+        """A settled range ending on a weekend is covered once fetched."""
+        self.mock_fetcher.get_historical_prices.return_value = {
+            "AAPL": pd.Series({pd.Timestamp("2025-01-10"): 100.0}),  # Friday
+        }
+        for _ in range(2):
+            result = self.repo.get_price_history("AAPL", date(2025, 1, 10), date(2025, 1, 12), self.mock_fetcher)
+
+        self.mock_fetcher.get_historical_prices.assert_called_once()
+        self.assertEqual(result, {date(2025, 1, 10): Decimal("100")})
+
+    def test_uncovered_middle_range_is_fetched(self):
+        self.repo.save_prices("AAPL", [{"date": date(2025, 1, 6), "close": Decimal("1")}])
+        self.repo.save_prices("AAPL", [{"date": date(2025, 1, 20), "close": Decimal("2")}])
+        self.mock_fetcher.get_historical_prices.return_value = {}
+
+        self.repo.get_price_history("AAPL", date(2025, 1, 6), date(2025, 1, 20), self.mock_fetcher)
+
+        self.mock_fetcher.get_historical_prices.assert_called_once_with(
+            ["AAPL"], date(2025, 1, 7), date(2025, 1, 19)
+        )
+
+    def test_deleting_rows_drops_coverage(self):
+        self.repo.save_prices("AAPL", [{"date": date(2025, 1, 6), "close": Decimal("1")}])
+        PriceHistory.objects.filter(symbol="AAPL").delete()
+        self.assertFalse(PriceCoverage.objects.filter(symbol="AAPL").exists())
+
+    def test_legacy_rows_without_coverage_are_seeded(self):
+        PriceHistory.objects.bulk_create([
+            PriceHistory(symbol="OLD", date=date(2025, 1, 6), close=Decimal("1")),
+            PriceHistory(symbol="OLD", date=date(2025, 1, 8), close=Decimal("2")),
+        ])
+
+        self.repo.get_price_history("OLD", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        self.mock_fetcher.get_historical_prices.assert_not_called()
+        self.assertEqual(
+            PriceCoverage.objects.get(symbol="OLD").intervals,
+            [["2025-01-06", "2025-01-08"]],
+        )
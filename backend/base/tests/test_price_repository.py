@@ -1,14 +1,18 @@
 # Tests for base app
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from unittest.mock import Mock
 
 import pandas as pd
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher
-from base.infrastructure.db.price_repository import PriceRepository
+from base.infrastructure.db.price_repository import CURRENT_PRICE_MAX_AGE, PriceRepository
+from base.models import Asset, CurrentPrice
+from base.services.price_series import PriceSeriesCache
 
 
 class TestPriceRepositoryGetPriceHistory(TestCase):
@@ -116,7 +120,7 @@ class TestPriceRepositoryGetPriceHistory(TestCase):
         self.assertEqual(result[date(2025, 1, 10)], Decimal("144"))
 
     def test_get_price_history_gap_in_middle_does_not_trigger_fetch(self):
-        """Gaps in the middle (e.g. market closed) are not treated as incomplete."""
+        """Gaps inside a fetched range (e.g. market closed) are not treated as incomplete."""
         symbol = "GAP"
         start_date = date(2025, 1, 6)
         end_date = date(2025, 1, 10)
@@ -124,6 +128,7 @@ class TestPriceRepositoryGetPriceHistory(TestCase):
             {"date": date(2025, 1, 6), "close": Decimal("100")},
             {"date": date(2025, 1, 10), "close": Decimal("104")},
         ])
+        self.repo.coverage.mark_covered(symbol, start_date, end_date)
 
         result = self.repo.get_price_history(
             symbol, start_date, end_date, self.mock_fetcher
@@ -139,7 +144,7 @@ class TestPriceRepositoryGetPriceHistory(TestCase):
         symbol = "MISSING"
         start_date = date(2025, 1, 6)
         end_date = date(2025, 1, 8)
-        self.mock_fetcher.get_historical_prices.return_value = {}
+        self.mock_fetcher.get_historical_prices.return_value = {symbol: pd.Series(dtype=float)}
 
         result = self.repo.get_price_history(
             symbol, start_date, end_date, self.mock_fetcher
@@ -160,3 +165,247 @@ class TestPriceRepositoryGetPriceHistory(TestCase):
         )
 
         self.assertEqual(result, {})
+
+
+class TestPriceRepositorySavePrices(TestCase):
+    """Tests for PriceRepository.save_prices bulk upsert."""
+
+    def setUp(self):
+        self.repo = PriceRepository()
+
+    def test_save_prices_returns_created_count_and_updates_existing(self):
+        symbol = "BULK"
+        self.repo.save_prices(symbol, [
+            {"date": date(2025, 1, 6), "close": Decimal("100")},
+        ])
+
+        created = self.repo.save_prices(symbol, [
+            {"date": date(2025, 1, 6), "close": Decimal("101")},
+            {"date": date(2025, 1, 7), "close": Decimal("102"), "volume": 10},
+            {"date": "2025-01-08", "close": Decimal("103")},
+        ])
+
+        self.assertEqual(created, 2)
+        prices = self.repo.get_close_prices(symbol, date(2025, 1, 6), date(2025, 1, 8))
+        self.assertEqual(prices[date(2025, 1, 6)], Decimal("101"))
+        self.assertEqual(prices[date(2025, 1, 8)], Decimal("103"))
+
+    def test_save_prices_batches_inserts(self):
+        """A multi-year backfill is written in batches, not one query per row."""
+        symbol = "LONG"
+        start = date(2015, 1, 1)
+        rows = [
+            {"date": start + timedelta(days=i), "close": Decimal(str(100 + i))}
+            for i in range(2500)
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            created = self.repo.save_prices(symbol, rows)
+
+        self.assertEqual(created, 2500)
+        # Batch size is capped by the backend's parameter limit (SQLite in tests)
+        self.assertLess(len(ctx.captured_queries), 50)
+
+
+class TestPriceRepositoryGetPriceHistoryBatch(TestCase):
+    """Tests for PriceRepository.get_price_history_batch."""
+
+    def setUp(self):
+        self.repo = PriceRepository()
+        self.mock_fetcher = Mock(spec=StockDataFetcher)
+
+    def test_fetches_only_missing_symbols_in_one_call(self):
+        start_date = date(2025, 1, 6)
+        end_date = date(2025, 1, 8)
+        self.repo.save_prices("FULL", [
+            {"date": date(2025, 1, 6), "close": Decimal("10")},
+            {"date": date(2025, 1, 8), "close": Decimal("12")},
+        ])
+        self.repo.coverage.mark_covered("FULL", start_date, end_date)
+        self.repo.save_prices("TAIL", [
+            {"date": date(2025, 1, 6), "close": Decimal("20")},
+        ])
+        self.mock_fetcher.get_historical_prices.return_value = {
+            "TAIL": pd.Series({
+                pd.Timestamp("2025-01-06"): 99.0,
+                pd.Timestamp("2025-01-07"): 21.0,
+                pd.Timestamp("2025-01-08"): 22.0,
+            }),
+            "NEW": pd.Series({
+                pd.Timestamp("2025-01-07"): 31.0,
+            }),
+        }
+
+        frame = self.repo.get_price_history_batch(
+            ["FULL", "TAIL", "NEW"], start_date, end_date, self.mock_fetcher
+        )
+
+        self.mock_fetcher.get_historical_prices.assert_called_once_with(
+            ["TAIL", "NEW"], start_date, end_date
+        )
+        self.assertEqual(list(frame.columns), ["FULL", "TAIL", "NEW"])
+        self.assertEqual(list(frame.index), [date(2025, 1, 6), date(2025, 1, 7), date(2025, 1, 8)])
+        # Stored day outside the symbol's gap is not overwritten
+        self.assertEqual(frame.loc[date(2025, 1, 6), "TAIL"], 20.0)
+        self.assertEqual(frame.loc[date(2025, 1, 8), "TAIL"], 22.0)
+        self.assertEqual(frame.loc[date(2025, 1, 7), "NEW"], 31.0)
+        self.assertTrue(pd.isna(frame.loc[date(2025, 1, 7), "FULL"]))
+
+    def test_no_fetch_when_all_symbols_covered(self):
+        self.repo.save_prices("A", [{"date": date(2025, 1, 6), "close": Decimal("1")}])
+        self.repo.save_prices("B", [{"date": date(2025, 1, 6), "close": Decimal("2")}])
+
+        frame = self.repo.get_price_history_batch(
+            ["A", "B"], date(2025, 1, 6), date(2025, 1, 6), self.mock_fetcher
+        )
+
+        self.mock_fetcher.get_historical_prices.assert_not_called()
+        self.assertEqual(frame.loc[date(2025, 1, 6), "B"], 2.0)
+
+
+class TestPriceRepositoryGetCurrentPrices(TestCase):
+    """Tests for PriceRepository.get_current_prices."""
+
+    def setUp(self):
+        self.repo = PriceRepository()
+        self.mock_fetcher = Mock(spec=StockDataFetcher)
+        self.mock_fetcher.get_currency.return_value = "USD"
+
+    def test_fetches_stale_and_unknown_symbols_in_one_call(self):
+        CurrentPrice.objects.create(symbol="FRESH", price=Decimal("10"), currency="USD")
+        CurrentPrice.objects.create(symbol="STALE", price=Decimal("20"), currency="EUR")
+        CurrentPrice.objects.filter(symbol="STALE").update(
+            updated_at=datetime.now(timezone.utc) - CURRENT_PRICE_MAX_AGE - timedelta(minutes=1)
+        )
+        self.mock_fetcher.get_current_prices.return_value = {
+            "STALE": Decimal("21"),
+            "NEW": Decimal("30"),
+        }
+
+        prices = self.repo.get_current_prices(["FRESH", "STALE", "NEW", "GONE"], self.mock_fetcher)
+
+        self.mock_fetcher.get_current_prices.assert_called_once_with(["STALE", "NEW", "GONE"])
+        self.assertEqual(prices, {
+            "FRESH": Decimal("10"),
+            "STALE": Decimal("21"),
+            "NEW": Decimal("30"),
+        })
+        # Known currency is reused; only the new symbol asks the fetcher
+        self.mock_fetcher.get_currency.assert_called_once_with("NEW")
+        stale = CurrentPrice.objects.get(symbol="STALE")
+        self.assertEqual(stale.price, Decimal("21"))
+        self.assertEqual(stale.currency, "EUR")
+        self.assertTrue(CurrentPrice.objects.filter(symbol="NEW", price=Decimal("30")).exists())
+
+    def test_no_fetch_when_all_prices_fresh(self):
+        CurrentPrice.objects.create(symbol="A", price=Decimal("1"), currency="USD")
+
+        prices = self.repo.get_current_prices(["A"], self.mock_fetcher)
+
+        self.mock_fetcher.get_current_prices.assert_not_called()
+        self.assertEqual(prices, {"A": Decimal("1")})
+
+    def test_quotes_persist_currency_on_asset(self):
+        asset = Asset.objects.create(symbol="SAP.DE", name="SAP", asset_type="stocks")
+        self.mock_fetcher.get_current_prices.return_value = {"SAP.DE": Decimal("120")}
+        self.mock_fetcher.get_currency.return_value = "EUR"
+
+        quotes = self.repo.get_current_quotes(["SAP.DE"], self.mock_fetcher, assets={"SAP.DE": asset})
+
+        self.assertEqual(quotes, {"SAP.DE": (Decimal("120"), "EUR")})
+        asset.refresh_from_db()
+        self.assertEqual(asset.currency, "EUR")
+
+        # Once known, a refetch does not ask the provider for the currency again
+        CurrentPrice.objects.all().delete()
+        self.mock_fetcher.get_currency.reset_mock()
+        self.repo.get_current_quotes(["SAP.DE"], self.mock_fetcher, assets={"SAP.DE": asset})
+        self.mock_fetcher.get_currency.assert_not_called()
+
+
+class TestPriceRepositoryCoalescedRefresh(TestCase):
+    """The coalesced refresh re-checks the DB before calling the provider."""
+
+    def test_refresh_skips_fetch_when_row_became_fresh(self):
+        CurrentPrice.objects.create(symbol="AAPL", price=Decimal("190"), currency="USD")
+        fetcher = Mock(spec=StockDataFetcher)
+
+        result = PriceRepository()._refresh_current_price("AAPL", fetcher, None)
+
+        self.assertEqual(result, (Decimal("190"), "USD"))
+        fetcher.get_current_price.assert_not_called()
+
+    def test_ensure_prices_skips_fetch_when_covered_meanwhile(self):
+        coverage = Mock()
+        coverage.missing_ranges.side_effect = [
+            {"AAPL": [(date(2024, 1, 1), date(2024, 1, 31))]},
+            {},
+        ]
+        fetcher = Mock(spec=StockDataFetcher)
+
+        created = PriceRepository(coverage=coverage)._ensure_prices_for_range(
+            "AAPL", date(2024, 1, 1), date(2024, 1, 31), fetcher,
+        )
+
+        self.assertEqual(created, 0)
+        fetcher.get_historical_prices.assert_not_called()
+
+    def test_batch_history_skips_fetch_when_covered_meanwhile(self):
+        coverage = Mock()
+        coverage.missing_ranges.side_effect = [
+            {"AAPL": [(date(2024, 1, 1), date(2024, 1, 31))]},
+            {},
+        ]
+        fetcher = Mock(spec=StockDataFetcher)
+
+        PriceRepository(coverage=coverage).get_price_history_batch(
+            ["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 1, 31), fetcher,
+        )
+
+        self.assertEqual(coverage.missing_ranges.call_count, 2)
+        fetcher.get_historical_prices.assert_not_called()
+
+    def test_quote_refresh_returns_rows_stored_meanwhile(self):
+        CurrentPrice.objects.create(symbol="AAPL", price=Decimal("190"), currency="USD")
+        fetcher = Mock(spec=StockDataFetcher)
+        fetcher.get_current_prices.return_value = {"MSFT": Decimal("410")}
+        fetcher.get_currency.return_value = "USD"
+
+        quotes = PriceRepository()._refresh_stale_quotes(["AAPL", "MSFT"], fetcher, {})
+
+        fetcher.get_current_prices.assert_called_once_with(["MSFT"])
+        self.assertEqual(quotes, {"AAPL": (Decimal("190"), "USD"), "MSFT": (Decimal("410"), "USD")})
+
+
+class TestPriceRepositoryGetPriceSeriesBatch(TestCase):
+    """Tests for PriceRepository.get_price_series_batch and the shared series cache."""
+
+    def setUp(self):
+        self.repo = PriceRepository(series_cache=PriceSeriesCache())
+        self.mock_fetcher = Mock(spec=StockDataFetcher)
+        for symbol in ("A", "B"):
+            self.repo.save_prices(symbol, [
+                {"date": date(2025, 1, 6), "close": Decimal("1")},
+                {"date": date(2025, 1, 8), "close": Decimal("3")},
+            ])
+            self.repo.coverage.mark_covered(symbol, date(2025, 1, 6), date(2025, 1, 8))
+
+    def test_repeated_and_narrower_reads_hit_cache(self):
+        first = self.repo.get_price_series_batch(["A", "B"], date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        with self.assertNumQueries(0):
+            again = self.repo.get_price_series_batch(["B", "A"], date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+            narrow = self.repo.get_price_series("A", date(2025, 1, 7), date(2025, 1, 8), self.mock_fetcher)
+
+        self.assertEqual(list(again), ["B", "A"])
+        self.assertEqual(list(first["A"].values), [1.0, 3.0])
+        self.assertEqual(narrow.asof_many([date(2025, 1, 7), date(2025, 1, 8)]).tolist()[1], 3.0)
+        self.mock_fetcher.get_historical_prices.assert_not_called()
+
+    def test_save_prices_invalidates_symbol(self):
+        self.repo.get_price_series("A", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        self.repo.save_prices("A", [{"date": date(2025, 1, 7), "close": Decimal("2")}])
+        series = self.repo.get_price_series("A", date(2025, 1, 6), date(2025, 1, 8), self.mock_fetcher)
+
+        self.assertEqual(list(series.values), [1.0, 2.0, 3.0])
@@ -0,0 +1,115 @@
+"""Tests for PriceSeries as-of lookups and the shared PriceSeriesCache."""
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from base.services.price_series import PriceSeries, PriceSeriesCache
+
+
+class PriceSeriesTests(SimpleTestCase):
+    def setUp(self):
+        # Deliberately unsorted input
+        self.series = PriceSeries.from_dict({
+            date(2025, 1, 10): Decimal("104"),
+            date(2025, 1, 6): Decimal("100"),
+            date(2025, 1, 8): Decimal("102"),
+        })
+
+    def test_asof_exact_day(self):
+        self.assertEqual(self.series.asof(date(2025, 1, 8)), 102.0)
+
+    def test_asof_uses_most_recent_earlier_day(self):
+        self.assertEqual(self.series.asof(date(2025, 1, 9)), 102.0)
+        self.assertEqual(self.series.asof(date(2025, 2, 1)), 104.0)
+
+    def test_asof_before_first_day_is_none(self):
+        self.assertIsNone(self.series.asof(date(2025, 1, 5)))
+
+    def test_asof_or_next_falls_forward(self):
+        self.assertEqual(self.series.asof_or_next(date(2025, 1, 5)), 100.0)
+        self.assertEqual(self.series.asof_or_next(date(2025, 1, 7)), 100.0)
+
+    def test_asof_many_matches_asof(self):
+        days = [date(2025, 1, d) for d in range(4, 13)]
+        result = self.series.asof_many(days)
+        for day, value in zip(days, result):
+            expected = self.series.asof(day)
+            if expected is None:
+                self.assertTrue(np.isnan(value))
+            else:
+                self.assertEqual(value, expected)
+
+    def test_from_series_drops_nan_and_accepts_timestamps(self):
+        series = PriceSeries.from_series(pd.Series({
+            pd.Timestamp("2025-01-06"): 100.0,
+            pd.Timestamp("2025-01-07"): float("nan"),
+        }))
+        self.assertEqual(len(series), 1)
+        self.assertEqual(series.asof(date(2025, 1, 7)), 100.0)
+
+    def test_empty_series(self):
+        empty = PriceSeries.from_dict({})
+        self.assertTrue(empty.empty)
+        self.assertIsNone(empty.asof(date(2025, 1, 1)))
+        self.assertIsNone(empty.asof_or_next(date(2025, 1, 1)))
+
+
+class PriceSeriesCacheTests(SimpleTestCase):
+    def _series(self, days):
+        return PriceSeries.from_dict({date(2025, 1, d): Decimal(d) for d in days})
+
+    def test_covering_range_is_sliced(self):
+        cache = PriceSeriesCache()
+        cache.set("AAPL", date(2025, 1, 1), date(2025, 1, 31), self._series(range(1, 32)))
+
+        hit = cache.get("AAPL", date(2025, 1, 10), date(2025, 1, 12))
+
+        self.assertEqual(list(hit.values), [10.0, 11.0, 12.0])
+        self.assertIsNone(cache.get("AAPL", date(2024, 12, 31), date(2025, 1, 5)))
+        self.assertIsNone(cache.get("MSFT", date(2025, 1, 10), date(2025, 1, 12)))
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        entry = self._series(range(1, 11))
+        cache = PriceSeriesCache(max_bytes=2 * entry.nbytes)
+        cache.set("A", date(2025, 1, 1), date(2025, 1, 10), entry)
+        cache.set("B", date(2025, 1, 1), date(2025, 1, 10), entry)
+        cache.get("A", date(2025, 1, 1), date(2025, 1, 10))
+
+        cache.set("C", date(2025, 1, 1), date(2025, 1, 10), entry)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.nbytes, 2 * entry.nbytes)
+        self.assertIsNone(cache.get("B", date(2025, 1, 1), date(2025, 1, 10)))
+        self.assertIsNotNone(cache.get("A", date(2025, 1, 1), date(2025, 1, 10)))
+
+    def test_entry_limit_evicts_least_recently_used(self):
+        cache = PriceSeriesCache(max_entries=2)
+        for symbol in ("A", "B", "C"):
+            cache.set(symbol, date(2025, 1, 1), date(2025, 1, 10), self._series([1]))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("A", date(2025, 1, 1), date(2025, 1, 10)))
+
+    def test_empty_series_is_not_cached(self):
+        cache = PriceSeriesCache()
+        cache.set("GONE", date(2025, 1, 1), date(2025, 1, 10), PriceSeries.empty_series())
+
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("GONE", date(2025, 1, 1), date(2025, 1, 10)))
+
+    def test_expiry_invalidate_and_disabled(self):
+        cache = PriceSeriesCache(ttl=0)
+        cache.set("A", date(2025, 1, 1), date(2025, 1, 10), self._series([1]))
+        self.assertIsNone(cache.get("A", date(2025, 1, 1), date(2025, 1, 10)))
+
+        cache = PriceSeriesCache()
+        cache.set("A", date(2025, 1, 1), date(2025, 1, 10), self._series([1]))
+        cache.invalidate(["A"])
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
+        disabled = PriceSeriesCache(max_bytes=0)
+        disabled.set("A", date(2025, 1, 1), date(2025, 1, 10), PriceSeries.empty_series())
+        self.assertEqual(len(disabled), 0)
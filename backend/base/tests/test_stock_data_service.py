@@ -1,8 +1,10 @@
 # Tests for get_stock_data (stock_data_service)
+import threading
+import time
 from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from base.models import StockDataCache
 from base.services.stock_data_service import get_stock_data
@@ -64,3 +66,34 @@ class TestGetStockData(TestCase):
         self.assertEqual(result, new_data)
         cached = StockDataCache.objects.get(symbol=symbol, data_type=data_type)
         self.assertEqual(cached.data, new_data)
+
+
+class TestGetStockDataCoalescing(SimpleTestCase):
+    """Concurrent cache misses for the same key share one fetch."""
+
+    def test_concurrent_misses_fetch_once(self):
+        store = {}
+        repo = Mock()
+        repo.get.side_effect = lambda symbol, data_type: store.get((symbol, data_type))
+        repo.save.side_effect = lambda symbol, data_type, data: store.__setitem__(
+            (symbol, data_type), Mock(data=data, updated_at=datetime.now(timezone.utc)),
+        )
+        fetcher = Mock()
+
+        def slow_info(symbol):
+            time.sleep(0.1)
+            return {"name": symbol}
+
+        fetcher.get_basic_stock_info.side_effect = slow_info
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_stock_data("AAPL", "basic_info", fetcher, repo)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [{"name": "AAPL"}] * 8)
+        fetcher.get_basic_stock_info.assert_called_once_with("AAPL")
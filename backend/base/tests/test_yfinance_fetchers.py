@@ -0,0 +1,125 @@
+# Tests for telling failed yfinance downloads apart from empty answers
+from datetime import date
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from django.test import SimpleTestCase
+from yfinance.cache import _TzCacheDummy
+from yfinance.exceptions import YFPricesMissingError, YFTzMissingError
+
+from base.infrastructure.providers.yfinance_fetchers import YfinanceStockDataFetcher
+
+
+def _download(close: dict):
+    """Fake yf.download returning *close* columns the way yfinance lays them out."""
+    def download(symbols, **kwargs):
+        frame = pd.DataFrame(close, index=pd.to_datetime(["2025-01-06", "2025-01-07"]))
+        frame.columns = pd.MultiIndex.from_product([["Close"], frame.columns])
+        return frame
+    return download
+
+
+def _ticker(history):
+    """Fake yf.Ticker whose ``history`` is *history* (a side_effect)."""
+    def ticker(symbol):
+        instance = Mock()
+        instance.history.side_effect = lambda **kwargs: history(symbol)
+        return instance
+    return ticker
+
+
+def _raise(exc):
+    def history(symbol):
+        raise exc
+    return history
+
+
+class TestYfinanceHistoricalPrices(SimpleTestCase):
+    def setUp(self):
+        self.fetcher = YfinanceStockDataFetcher()
+
+    def test_symbol_with_provider_error_is_omitted(self):
+        download = _download({"AAPL": [1.0, 2.0], "MSFT": [float("nan")] * 2})
+        with patch("yfinance.download", side_effect=download), \
+                patch("yfinance.Ticker", side_effect=_ticker(_raise(ConnectionError("Could not resolve host")))), \
+                self.assertLogs("base.infrastructure.providers.yfinance_fetchers", "WARNING"):
+            result = self.fetcher.get_historical_prices(["AAPL", "MSFT"], date(2025, 1, 6), date(2025, 1, 7))
+
+        self.assertEqual(list(result), ["AAPL"])
+        self.assertEqual(result["AAPL"].tolist(), [1.0, 2.0])
+
+    def test_symbol_with_failed_timezone_lookup_is_omitted(self):
+        download = _download({"MSFT": [float("nan")] * 2})
+        with patch("yfinance.download", side_effect=download), \
+                patch("yfinance.Ticker", side_effect=_ticker(_raise(YFTzMissingError("MSFT")))), \
+                self.assertLogs("base.infrastructure.providers.yfinance_fetchers", "WARNING"):
+            result = self.fetcher.get_historical_prices(["MSFT"], date(2025, 1, 6), date(2025, 1, 7))
+
+        self.assertEqual(result, {})
+
+    def test_symbol_without_data_is_an_empty_series(self):
+        download = _download({"AAPL": [1.0, 2.0], "GONE": [float("nan")] * 2})
+        with patch("yfinance.download", side_effect=download), \
+                patch("yfinance.Ticker", side_effect=_ticker(_raise(YFPricesMissingError("GONE", "")))):
+            result = self.fetcher.get_historical_prices(["AAPL", "GONE.US"], date(2025, 1, 6), date(2025, 1, 7))
+
+        self.assertTrue(result["GONE.US"].empty)
+
+    def test_symbol_missing_from_download_is_fetched_alone(self):
+        history = pd.DataFrame({"Close": [3.0]}, index=pd.to_datetime(["2025-01-07"]))
+        with patch("yfinance.download", side_effect=_download({"AAPL": [1.0, 2.0]})), \
+                patch("yfinance.Ticker", side_effect=_ticker(lambda symbol: history)):
+            result = self.fetcher.get_historical_prices(["AAPL", "MSFT"], date(2025, 1, 6), date(2025, 1, 7))
+
+        self.assertEqual(result["MSFT"].tolist(), [3.0])
+        self.assertEqual(result["MSFT"].index.tolist(), [date(2025, 1, 7)])
+
+    def test_download_exception_propagates(self):
+        with patch("yfinance.download", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.fetcher.get_historical_prices(["AAPL"], date(2025, 1, 6), date(2025, 1, 7))
+
+
+def _chart(meta=None, error=None):
+    """A Yahoo v8 chart response with no price rows."""
+    response = Mock(url="https://query2.finance.yahoo.com/v8/finance/chart", status_code=200, text="{}")
+    result = None if error else [{"meta": meta or {}, "timestamp": [], "indicators": {"quote": [{}]}}]
+    response.json.return_value = {"chart": {"result": result, "error": error}}
+    return response
+
+
+class TestYfinanceHistoricalPricesAgainstYfinance(SimpleTestCase):
+    """
+    Runs the real yf.download / Ticker.history code with only the HTTP layer
+    replaced, so a yfinance upgrade that changes how failures surface shows up here.
+    """
+
+    def setUp(self):
+        self.fetcher = YfinanceStockDataFetcher()
+        patcher = patch("yfinance.cache.get_tz_cache", return_value=_TzCacheDummy())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _http(self, get):
+        return patch.multiple("yfinance.data.YfData", get=get, cache_get=get)
+
+    def test_network_failure_omits_symbol(self):
+        def get(self, url, params=None, timeout=30):
+            raise ConnectionError("Could not resolve host")
+
+        with self._http(get), self.assertLogs("yfinance", "ERROR"), \
+                self.assertLogs("base.infrastructure.providers.yfinance_fetchers", "WARNING"):
+            result = self.fetcher.get_historical_prices(["ZZQX1"], date(2025, 1, 6), date(2025, 1, 7))
+
+        self.assertEqual(result, {})
+
+    def test_answer_without_rows_is_an_empty_series(self):
+        def get(self, url, params=None, timeout=30):
+            return _chart(meta={"exchangeTimezoneName": "America/New_York", "validRanges": ["1d"]})
+
+        with self._http(get), self.assertLogs("yfinance", "ERROR"):
+            result = self.fetcher.get_historical_prices(["ZZQX1"], date(2025, 1, 6), date(2025, 1, 7))
+
+        self.assertEqual(list(result), ["ZZQX1"])
+        self.assertTrue(result["ZZQX1"].empty)
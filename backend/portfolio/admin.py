@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import UserAsset, Transactions, PortfolioSnapshot
+from .models import (
+    UserAsset, Transactions, PortfolioSnapshot, PortfolioSnapshotState, TransactionImportJob,
+)
 
 
 @admin.register(UserAsset)
@@ -17,3 +19,16 @@ class TransactionsAdmin(admin.ModelAdmin):
 class PortfolioSnapshotAdmin(admin.ModelAdmin):
     list_display = ('user', 'date', 'currency', 'total_value')
     list_filter = ('currency', 'date')
+
+
+@admin.register(PortfolioSnapshotState)
+class PortfolioSnapshotStateAdmin(admin.ModelAdmin):
+    list_display = ('user', 'currency', 'last_date', 'total_invested', 'updated_at')
+    list_filter = ('currency',)
+
+
+@admin.register(TransactionImportJob)
+class TransactionImportJobAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'source', 'status', 'rows_processed', 'created_count', 'created_at', 'finished_at')
+    list_filter = ('status', 'source')
+    exclude = ('payload',)
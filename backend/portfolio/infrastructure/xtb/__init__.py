@@ -1,3 +1,3 @@
-from .cash_operations import parse_xtb_cash_operations_xlsx
+from .cash_operations import iter_xtb_cash_operations_xlsx, parse_xtb_cash_operations_xlsx
 
-__all__ = ["parse_xtb_cash_operations_xlsx"]
+__all__ = ["iter_xtb_cash_operations_xlsx", "parse_xtb_cash_operations_xlsx"]
@@ -2,6 +2,9 @@
 Parse XTB multi-sheet XLSX exports: ``Cash Operations`` worksheet to normalized import rows.
 
 The worksheet has leading metadata rows; the parser locates the column header row automatically.
+The workbook is opened read-only and streamed once, so memory stays bounded: use
+``iter_xtb_cash_operations_xlsx`` to receive rows in chunks while the file is still
+being read.
 """
 from __future__ import annotations
 
@@ -10,10 +13,9 @@ import re
 from datetime import date, datetime
 from io import BytesIO
 from pathlib import Path
-from typing import BinaryIO, List, Optional, Tuple, Union
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple, Union
 
 from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
 
 from portfolio.services.transaction_import_service import NormalizedTransactionImportRow
 
@@ -46,6 +48,12 @@ _TYPE_SELL = frozenset(
     }
 )
 
+# Normalized rows per chunk yielded by iter_xtb_cash_operations_xlsx.
+IMPORT_CHUNK_SIZE = 1000
+
+# Rows scanned for the column header before giving up.
+_HEADER_SCAN_ROWS = 80
+
 _COMMENT_TRADE = re.compile(
     r"(?:OPEN|CLOSE)\s+(BUY|SELL)\s+([\d.,]+)\s+@\s+([\d.,]+)",
     re.IGNORECASE,
@@ -64,15 +72,50 @@ def parse_xtb_cash_operations_xlsx(
     :param file: Path or binary file-like object (``bytes`` buffer seekable at 0).
     :param sheet_name: Override sheet title (default: case-insensitive ``Cash Operations``).
     """
-    wb = load_workbook(file, read_only=False, data_only=True)
+    return [
+        row
+        for chunk in iter_xtb_cash_operations_xlsx(file, sheet_name=sheet_name)
+        for row in chunk
+    ]
+
+
+def iter_xtb_cash_operations_xlsx(
+    file: FileArg,
+    *,
+    sheet_name: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Iterator[List[NormalizedTransactionImportRow]]:
+    """
+    Stream trade rows of the Cash Operations sheet in lists of at most
+    *chunk_size*, reading the workbook in read-only mode in a single pass.
+    Raises ``ValueError`` on the first ``next()`` when the sheet or its
+    header row is missing.
+
+    :param file: Path or binary file-like object (``bytes`` buffer seekable at 0).
+    :param sheet_name: Override sheet title (default: case-insensitive ``Cash Operations``).
+    """
+    wb = load_workbook(file, read_only=True, data_only=True)
     try:
         ws = _select_cash_operations_sheet(wb, sheet_name)
-        header_row_idx, col_map = _find_header_row(ws)
+        # Exports may carry stale dimensions; read rows until the sheet really ends
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header_row_idx, col_map = _find_header_row(rows)
         if header_row_idx is None or col_map is None:
             raise ValueError(
                 "Could not find a header row with Type, Ticker, Time, Amount, ID, Comment."
             )
-        return _parse_trade_rows(ws, header_row_idx, col_map)
+        chunk: List[NormalizedTransactionImportRow] = []
+        for excel_row, row_values in enumerate(rows, start=header_row_idx + 1):
+            parsed = _parse_trade_row(row_values, col_map, excel_row)
+            if parsed is None:
+                continue
+            chunk.append(parsed)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
     finally:
         wb.close()
 
@@ -88,31 +131,28 @@ def _select_cash_operations_sheet(wb, sheet_name: Optional[str]):
     )
 
 
-def _row_string_values(row) -> List[str]:
+def _row_string_values(row_values: Sequence) -> List[str]:
     return [
-        "" if c.value is None else str(c.value).strip()
-        for c in row
+        "" if v is None else str(v).strip()
+        for v in row_values
     ]
 
 
-def _find_header_row(ws: Worksheet) -> Tuple[Optional[int], Optional[dict]]:
-    max_scan = 80
-    for idx, row in enumerate(ws.iter_rows(min_row=1, max_row=max_scan), start=1):
-        lowered_set = frozenset(
-            str(v).strip().casefold()
-            for v in _row_string_values(row)
-            if str(v).strip()
-        )
-        if not lowered_set:
-            continue
-        if _REQUIRED_HEADERS.issubset(lowered_set):
+def _find_header_row(rows: Iterator[Sequence]) -> Tuple[Optional[int], Optional[dict]]:
+    """
+    Consume *rows* (cell values) up to and including the header row; return
+    its 1-based index and ``header -> column index``. *rows* then continues
+    with the first data row.
+    """
+    for idx, row_values in enumerate(rows, start=1):
+        if idx > _HEADER_SCAN_ROWS:
+            break
+        lowered = [v.casefold() for v in _row_string_values(row_values)]
+        if _REQUIRED_HEADERS.issubset(v for v in lowered if v):
             col_map = {}
-            for cell in row:
-                if cell.value is None:
-                    continue
-                key = str(cell.value).strip().casefold()
+            for col_idx, key in enumerate(lowered):
                 if key in _REQUIRED_HEADERS:
-                    col_map[key] = cell.column - 1
+                    col_map[key] = col_idx
             return idx, col_map
     return None, None
 
@@ -170,79 +210,71 @@ def _parse_comment_trade(comment: str) -> Optional[Tuple[str, float, float]]:
     return side, qty, price
 
 
-def _get_cell(row_values: List, col_idx: Optional[int]):
+def _get_cell(row_values: Sequence, col_idx: Optional[int]):
     if col_idx is None or col_idx >= len(row_values):
         return None
     return row_values[col_idx]
 
 
-def _parse_trade_rows(
-    ws: Worksheet,
-    header_row_idx: int,
+def _parse_trade_row(
+    row_values: Sequence,
     col_map: dict,
-) -> List[NormalizedTransactionImportRow]:
-    out: List[NormalizedTransactionImportRow] = []
-    excel_row = header_row_idx
-    for row in ws.iter_rows(min_row=header_row_idx + 1):
-        excel_row += 1
-        row_values = [c.value for c in row]
-        type_label = _get_cell(row_values, col_map.get("type"))
-        type_str = "" if type_label is None else str(type_label).strip()
-        if not type_str:
-            continue
+    excel_row: int,
+) -> Optional[NormalizedTransactionImportRow]:
+    type_label = _get_cell(row_values, col_map.get("type"))
+    type_str = "" if type_label is None else str(type_label).strip()
+    if not type_str:
+        return None
 
-        type_key = type_str.casefold()
-        if type_key not in _TYPE_BUY and type_key not in _TYPE_SELL:
-            continue
+    type_key = type_str.casefold()
+    if type_key not in _TYPE_BUY and type_key not in _TYPE_SELL:
+        return None
 
-        ticker = _get_cell(row_values, col_map.get("ticker"))
-        symbol = None if ticker is None else str(ticker).strip()
-        if not symbol:
-            continue
+    ticker = _get_cell(row_values, col_map.get("ticker"))
+    symbol = None if ticker is None else str(ticker).strip()
+    if not symbol:
+        return None
 
-        instrument = _get_cell(row_values, col_map.get("instrument"))
-        name = None if instrument is None else str(instrument).strip() or None
+    instrument = _get_cell(row_values, col_map.get("instrument"))
+    name = None if instrument is None else str(instrument).strip() or None
 
-        time_raw = _get_cell(row_values, col_map.get("time"))
-        trade_date = _parse_trade_datetime(time_raw)
-        if trade_date is None:
-            logger.debug("XTB import: skip row %s — bad time %r", excel_row, time_raw)
-            continue
+    time_raw = _get_cell(row_values, col_map.get("time"))
+    trade_date = _parse_trade_datetime(time_raw)
+    if trade_date is None:
+        logger.debug("XTB import: skip row %s — bad time %r", excel_row, time_raw)
+        return None
 
-        comment_cell = _get_cell(row_values, col_map.get("comment"))
-        comment = "" if comment_cell is None else str(comment_cell)
+    comment_cell = _get_cell(row_values, col_map.get("comment"))
+    comment = "" if comment_cell is None else str(comment_cell)
 
-        parsed = _parse_comment_trade(comment)
-        if not parsed:
-            logger.debug(
-                "XTB import: skip row %s — could not parse trade comment %r",
-                excel_row,
-                comment,
-            )
-            continue
-        comment_side, quantity, price = parsed
+    parsed = _parse_comment_trade(comment)
+    if not parsed:
+        logger.debug(
+            "XTB import: skip row %s — could not parse trade comment %r",
+            excel_row,
+            comment,
+        )
+        return None
+    comment_side, quantity, price = parsed
 
-        tx_side = comment_side
-        if tx_side not in ("BUY", "SELL"):
-            continue
+    tx_side = comment_side
+    if tx_side not in ("BUY", "SELL"):
+        return None
 
-        id_raw = _get_cell(row_values, col_map.get("id"))
-        external_id = None if id_raw is None else str(id_raw).strip()
-        if not external_id:
-            continue
+    id_raw = _get_cell(row_values, col_map.get("id"))
+    external_id = None if id_raw is None else str(id_raw).strip()
+    if not external_id:
+        return None
 
-        out.append(
-            NormalizedTransactionImportRow(
-                transaction_type="BUY" if tx_side == "BUY" else "SELL",
-                quantity=quantity,
-                price=price,
-                trade_date=trade_date,
-                source_row_index=excel_row,
-                symbol=symbol,
-                name=name,
-                asset_type="stocks",
-                external_id=f"xtb:{external_id}",
-                currency=None,
-            )
-        )
-    return out
+    return NormalizedTransactionImportRow(
+        transaction_type="BUY" if tx_side == "BUY" else "SELL",
+        quantity=quantity,
+        price=price,
+        trade_date=trade_date,
+        source_row_index=excel_row,
+        symbol=symbol,
+        name=name,
+        asset_type="stocks",
+        external_id=f"xtb:{external_id}",
+        currency=None,
+    )
@@ -3,10 +3,16 @@ Management command to generate daily portfolio-value snapshots.
 """
 from datetime import date, timedelta
 
-from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
 
 from portfolio.services.portfolio_snapshots import PortfolioSnapshotService
+from portfolio.services.snapshot_batch import (
+    Throughput,
+    plan_snapshot_jobs,
+    prewarm_snapshot_caches,
+    run_snapshot_shards,
+    shard_jobs,
+)
 
 
 class Command(BaseCommand):
@@ -25,44 +31,59 @@ class Command(BaseCommand):
             "--currency", type=str, default="PLN",
             help="Currency for snapshot values (default: PLN).",
         )
+        parser.add_argument(
+            "--only-changed", action="store_true",
+            help="Write only snapshot rows whose values differ from the stored ones.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Worker processes building user shards in parallel (default: 1, in-process).",
+        )
+        parser.add_argument(
+            "--shard-size", type=int, default=50,
+            help="Users per shard handed to a worker (default: 50).",
+        )
+        parser.add_argument(
+            "--chunk-days", type=int, default=365,
+            help="Build long ranges in chunks of this many days (0 = whole range at once).",
+        )
+        parser.add_argument(
+            "--no-prewarm", action="store_true",
+            help="Skip filling price/FX history for all users' symbols before building.",
+        )
 
     def handle(self, *args, **options):
         target_date_str = options["date"]
         backfill = options["backfill"]
         currency = options["currency"]
+        only_changed = options["only_changed"]
 
         if target_date_str:
             target_date = date.fromisoformat(target_date_str)
         else:
             target_date = date.today() - timedelta(days=1)
 
-        service = PortfolioSnapshotService(currency=currency)
-        users = User.objects.filter(transactions__isnull=False).distinct()
-        total_snapshots = 0
-
-        for user in users:
-            if backfill:
-                first_tx = user.transactions.order_by("date").first()
-                if not first_tx:
-                    continue
-                start = first_tx.date
-                end = date.today()
-            else:
-                start = target_date
-                end = target_date
+        throughput = Throughput()
+        jobs = plan_snapshot_jobs(target_date, backfill=backfill)
+        self.stdout.write(f"Generating snapshots for {len(jobs)} user(s)")
 
+        if jobs and not options["no_prewarm"]:
+            symbols, pairs = prewarm_snapshot_caches(jobs, PortfolioSnapshotService(currency=currency))
             self.stdout.write(
-                f"Generating snapshots for {user.username} ({start} -> {end})"
+                f"  Pre-warmed {symbols} symbol(s) and {pairs} FX pair(s) in {throughput.elapsed:.1f}s"
             )
-            try:
-                snapshots = service.build_snapshots_for_user(
-                    user, start, end, currency=currency,
-                )
-                total_snapshots += len(snapshots)
-                self.stdout.write(f"  Done: {len(snapshots)} snapshot(s)")
-            except Exception as exc:
-                self.stderr.write(self.style.ERROR(f"  Error: {exc}"))
 
-        self.stdout.write(
-            self.style.SUCCESS(f"Done - {total_snapshots} snapshot(s) created/updated.")
+        def report(result):
+            for error in result.errors:
+                self.stderr.write(self.style.ERROR(f"  Error: {error}"))
+
+        total = run_snapshot_shards(
+            shard_jobs(jobs, options["shard_size"]),
+            workers=options["workers"],
+            currency=currency,
+            only_changed=only_changed,
+            chunk_days=options["chunk_days"],
+            on_shard_done=report,
         )
+
+        self.stdout.write(self.style.SUCCESS(f"Done - {throughput.format(total)}."))
@@ -0,0 +1,65 @@
+"""
+Management command that keeps prices of held symbols warm.
+"""
+from django.core.management.base import BaseCommand
+
+from portfolio.services.price_refresh import PriceRefreshScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh current prices and recent daily closes for every symbol held in a portfolio. "
+        "Runs continuously unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Run a single refresh pass and exit.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=None,
+            help="Seconds between passes (default: PRICE_REFRESH_INTERVAL).",
+        )
+        parser.add_argument(
+            "--jitter", type=float, default=None,
+            help="Max random seconds added to each wait (default: PRICE_REFRESH_JITTER).",
+        )
+        parser.add_argument(
+            "--max-backoff", type=float, default=None,
+            help="Max seconds to wait after repeated failures (default: PRICE_REFRESH_MAX_BACKOFF).",
+        )
+        parser.add_argument(
+            "--history-days", type=int, default=None,
+            help="Days of daily closes to keep filled (default: PRICE_REFRESH_HISTORY_DAYS).",
+        )
+        parser.add_argument(
+            "--symbols", nargs="*", default=None,
+            help=(
+                "Extra (watched) symbols to refresh along with held ones. Only symbols with a "
+                "stock or crypto Asset row are refreshed; others are skipped with a warning."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        scheduler = PriceRefreshScheduler(
+            interval=options["interval"],
+            jitter=options["jitter"],
+            max_backoff=options["max_backoff"],
+            history_days=options["history_days"],
+            extra_symbols=options["symbols"],
+        )
+        if not options["once"]:
+            self.stdout.write(f"Refreshing held symbols every ~{scheduler.interval:.0f}s (Ctrl+C to stop)")
+            try:
+                scheduler.run()
+            except KeyboardInterrupt:
+                self.stdout.write("Stopped.")
+            return
+
+        result = scheduler.refresh_once()
+        for error in result.errors:
+            self.stderr.write(self.style.ERROR(f"  Error: {error}"))
+        self.stdout.write(
+            self.style.SUCCESS(f"Done - {result.prices}/{result.symbols} price(s) refreshed.")
+        )
@@ -0,0 +1,35 @@
+"""
+Management command that works through queued transaction import jobs.
+"""
+from django.core.management.base import BaseCommand
+
+from portfolio.services.import_jobs import run_pending_jobs, run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run pending transaction import jobs (uploads). "
+        "Polls for new jobs continuously unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Run the jobs pending now and exit.",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=None,
+            help="Seconds to wait when the queue is empty (default: IMPORT_JOBS_POLL_INTERVAL).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["once"]:
+            self.stdout.write("Waiting for import jobs (Ctrl+C to stop)")
+            try:
+                run_worker(poll_interval=options["poll_interval"])
+            except KeyboardInterrupt:
+                self.stdout.write("Stopped.")
+            return
+
+        ran = run_pending_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Done - {ran} import job(s) run."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:00
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_alter_transactions_external_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioSnapshotState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(default='PLN', max_length=10)),
+                ('last_date', models.DateField(help_text='Date of the latest snapshot this state describes.')),
+                ('total_invested', models.DecimalField(decimal_places=2, default=Decimal('0'), help_text='Cumulative net cash invested as of last_date.', max_digits=15)),
+                ('positions', models.JSONField(default=dict, help_text='Asset id -> {"quantity": float, "purchase_date": "YYYY-MM-DD" | null} as of last_date.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'currency')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_transactionimportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transactionimportjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last sign of life from the worker running the job (claim or progress).', null=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from base.models import Asset
 
@@ -96,3 +97,92 @@ class PortfolioSnapshot(models.Model):
             f"Snapshot {self.user.username} {self.date} "
             f"{self.total_value} {self.currency}"
         )
+
+
+class PortfolioSnapshotState(models.Model):
+    """
+    Running state at the end of a user's latest snapshot: open positions,
+    cumulative net cash invested and the snapshot date. Lets new days be
+    appended without replaying the whole transaction history.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='snapshot_states',
+    )
+    currency = models.CharField(max_length=10, default='PLN')
+    last_date = models.DateField(help_text='Date of the latest snapshot this state describes.')
+    total_invested = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=Decimal('0'),
+        help_text='Cumulative net cash invested as of last_date.',
+    )
+    positions = models.JSONField(
+        default=dict,
+        help_text='Asset id -> {"quantity": float, "purchase_date": "YYYY-MM-DD" | null} as of last_date.',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'currency')
+
+    def __str__(self):
+        return f"Snapshot state {self.user.username} {self.currency} @ {self.last_date}"
+
+
+class TransactionImportJob(models.Model):
+    """
+    An uploaded broker file waiting for, or going through, a background import
+    (manage.py run_import_jobs or the in-process import pool). Tracks progress
+    and keeps per-row outcomes for polling.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'pending'
+        RUNNING = 'running', 'running'
+        SUCCEEDED = 'succeeded', 'succeeded'
+        FAILED = 'failed', 'failed'
+
+    class Source(models.TextChoices):
+        XTB_CASH_OPERATIONS = 'xtb_cash_operations', 'XTB cash operations'
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_jobs')
+    source = models.CharField(max_length=32, choices=Source.choices)
+    file_name = models.CharField(max_length=255, blank=True, default='')
+    payload = models.BinaryField(
+        null=True,
+        help_text='Uploaded file contents; cleared once the job has finished.',
+    )
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    rows_processed = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    outcomes = models.JSONField(
+        default=list,
+        help_text='Per-row outcomes ({"source_row_index", "status", "transaction_id", "message"}).',
+    )
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text='Last sign of life from the worker running the job (claim or progress).',
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    @property
+    def rows_per_second(self):
+        """Rows imported per second since the job started (until it finished), or None."""
+        if self.started_at is None:
+            return None
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        if elapsed <= 0:
+            return None
+        return round(self.rows_processed / elapsed, 2)
+
+    def __str__(self):
+        return f"Import job {self.id} {self.owner.username} {self.source} ({self.status})"
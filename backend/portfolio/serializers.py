@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Transactions
+from .models import TransactionImportJob, Transactions
 from base.models import Asset
 from decimal import Decimal
 
@@ -65,3 +65,15 @@ class TransactionSerializer(serializers.ModelSerializer):
                       'wibor_margin', 'inflation_margin', 'base_interest_rate', 'face_value']:
             validated_data.pop(field, None)
         return Transactions.objects.create(**validated_data)
+
+
+class TransactionImportJobSerializer(serializers.ModelSerializer):
+    rows_per_second = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = TransactionImportJob
+        fields = [
+            "id", "source", "file_name", "status", "rows_processed", "created_count",
+            "rows_per_second", "outcomes", "error", "created_at", "started_at", "finished_at",
+        ]
+        read_only_fields = fields
@@ -1,32 +1,53 @@
 """
 Asset manager for portfolio analysis and composition.
 """
+import logging
+from collections import defaultdict
 from datetime import date
 
-from typing import Callable, Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Tuple
 from decimal import Decimal
+
+import numpy as np
 from django.contrib.auth.models import User
+from base.infrastructure.db import PriceRepository
 from base.models import Asset
 from portfolio.models import UserAsset, Transactions
-from .calculators import AssetCalculator, StockCalculator, BondCalculator, CryptoCalculator
+from .calculators import AssetCalculator, BondCalculator, default_calculators
 from base.services import get_default_stock_fetcher, get_default_crypto_fetcher
 from .currency_converter import CurrencyConverter
 
+if TYPE_CHECKING:
+    from .container import ServiceContainer
+
+logger = logging.getLogger(__name__)
+
 
 class AssetManager:
     """
     Manager for analyzing and computing portfolio composition.
     """
 
-    def __init__(self, default_currency: str = 'USD'):
+    def __init__(self, default_currency: str = 'USD', services: Optional['ServiceContainer'] = None):
         """
         Initialize the asset manager with default calculators.
 
         Args:
             default_currency: Default currency for portfolio calculations (e.g., 'USD', 'PLN')
+            services: Process-wide container to take fetchers, converter and
+                calculators from instead of building new ones (see
+                portfolio.services.container.get_service_container).
         """
         self.default_currency = default_currency
-        
+
+        if services is not None:
+            self.stock_data_fetcher = services.stock_data_fetcher
+            self.crypto_data_fetcher = services.crypto_data_fetcher
+            self.currency_converter = services.currency_converter
+            # Own copy of the map so add_calculator does not leak into other managers
+            self.calculators: Dict[str, AssetCalculator] = dict(services.calculators)
+            return
+
         # Initialize data fetchers
         self.stock_data_fetcher = get_default_stock_fetcher()
         self.crypto_data_fetcher = get_default_crypto_fetcher()
@@ -35,11 +56,9 @@ class AssetManager:
         self.currency_converter = CurrencyConverter()
 
         # Initialize calculators
-        self.calculators: Dict[str, AssetCalculator] = {
-            'stocks': StockCalculator(self.stock_data_fetcher, self.currency_converter),
-            'bonds': BondCalculator(),
-            'cryptocurrencies': CryptoCalculator(self.crypto_data_fetcher, self.currency_converter),
-        }
+        self.calculators = default_calculators(
+            self.stock_data_fetcher, self.crypto_data_fetcher, self.currency_converter,
+        )
 
     def _get_cost_basis(
         self,
@@ -48,6 +67,7 @@ class AssetManager:
         current_quantity: float,
         *,
         as_of_date: Optional[date] = None,
+        transactions: Optional[List[Transactions]] = None,
     ) -> Optional[Decimal]:
         """
         Compute cost basis (total cost of current position) from transactions.
@@ -56,15 +76,23 @@ class AssetManager:
 
         Args:
             as_of_date: When set, only transactions on or before this date are included.
+            transactions: Already loaded transactions of this user and asset,
+                ordered by (date, id). Skips the query when given.
 
         Returns:
             Total cost in asset's native currency, or None if no transactions.
         """
         native_currency = self._get_native_currency(asset)
-        q = Transactions.objects.filter(owner=user, product=asset)
-        if as_of_date is not None:
-            q = q.filter(date__lte=as_of_date)
-        txs = q.order_by('date', 'id')
+        if transactions is None:
+            q = Transactions.objects.filter(owner=user, product=asset)
+            if as_of_date is not None:
+                q = q.filter(date__lte=as_of_date)
+            txs = q.order_by('date', 'id')
+        else:
+            txs = [
+                tx for tx in transactions
+                if as_of_date is None or tx.date <= as_of_date
+            ]
         qty = Decimal('0')
         cost = Decimal('0')
         for tx in txs:
@@ -98,6 +126,41 @@ class AssetManager:
             cost = cost * (current_q / qty) if qty > 0 else Decimal('0')
         return cost
 
+    def _prefetch_current_quotes(self, assets: List[Asset]) -> Dict[int, Tuple[Decimal, str]]:
+        """
+        Fetch current prices for all priced *assets* with one batched call per
+        asset type. Returns ``asset id -> (price, currency)``; assets that could
+        not be priced are left out so their calculator can try on its own.
+        """
+        fetchers = {
+            'stocks': self.stock_data_fetcher,
+            'cryptocurrencies': self.crypto_data_fetcher,
+        }
+        repo = PriceRepository()
+        quotes: Dict[int, Tuple[Decimal, str]] = {}
+        for asset_type, fetcher in fetchers.items():
+            by_symbol = {
+                a.symbol: a for a in assets if a.asset_type == asset_type and a.symbol
+            }
+            if not by_symbol:
+                continue
+            try:
+                fetched = repo.get_current_quotes(list(by_symbol), fetcher, assets=by_symbol)
+            except Exception as e:
+                logger.warning("Failed to prefetch %s prices: %s", asset_type, e)
+                continue
+            for symbol, quote in fetched.items():
+                quotes[by_symbol[symbol].id] = quote
+        return quotes
+
+    @staticmethod
+    def _transactions_by_asset(user: User) -> Dict[int, List[Transactions]]:
+        """All of *user*'s transactions in one query, grouped by asset id in (date, id) order."""
+        grouped: Dict[int, List[Transactions]] = defaultdict(list)
+        for tx in Transactions.objects.filter(owner=user).order_by('date', 'id'):
+            grouped[tx.product_id].append(tx)
+        return grouped
+
     def get_portfolio_composition(
         self,
         user: User,
@@ -122,7 +185,10 @@ class AssetManager:
         # Use target currency or fall back to default
         currency = target_currency or self.default_currency
         # Get all user assets
-        user_assets = UserAsset.objects.filter(owner=user).select_related('ownedAsset')
+        # Everything below works from these three loads; no per-holding queries
+        user_assets = list(UserAsset.objects.filter(owner=user).select_related('ownedAsset'))
+        transactions_by_asset = self._transactions_by_asset(user)
+        current_quotes = self._prefetch_current_quotes([ua.ownedAsset for ua in user_assets])
 
         assets_data = []
         total_value = Decimal('0')
@@ -140,16 +206,16 @@ class AssetManager:
                 'name': asset.name,
                 'asset_type': asset_type,
             }
-            
+            if asset.id in current_quotes:
+                asset_data['current_price'], asset_data['price_currency'] = current_quotes[asset.id]
+            else:
+                asset_data['price_currency'] = self._get_native_currency(asset)
+            asset_transactions = transactions_by_asset.get(asset.id, [])
+
             # Add bond-specific fields if asset is a bond
             if asset_type == 'bonds':
-                first_transaction = Transactions.objects.filter(
-                    owner=user,
-                    product=asset
-                ).order_by('date', 'id').first()
-                
-                purchase_date = first_transaction.date if first_transaction else None
-                
+                purchase_date = asset_transactions[0].date if asset_transactions else None
+
                 asset_data.update({
                     'bond_type': asset.bond_type,
                     'face_value': asset.face_value or Decimal('100'),
@@ -207,7 +273,9 @@ class AssetManager:
                     average_purchase_price = float(user_asset.average_purchase_price)
             if total_cost_dec is None:
                 # Fallback: compute from transactions
-                cost_basis = self._get_cost_basis(user, asset, user_asset.quantity)
+                cost_basis = self._get_cost_basis(
+                    user, asset, user_asset.quantity, transactions=asset_transactions,
+                )
                 if cost_basis is not None and cost_basis > 0:
                     native_currency = self._get_native_currency(asset)
                     if native_currency != currency:
@@ -346,6 +414,73 @@ class AssetManager:
 
         return total
 
+    def value_position_matrix(
+        self,
+        assets: List['Asset'],
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        dates: List[date],
+        purchase_dates: Optional[Dict[int, date]] = None,
+        target_currency: Optional[str] = None,
+    ) -> List[Decimal]:
+        """
+        Vectorized counterpart of ``value_positions`` for a range of days.
+
+        Values every (day, asset) cell in one pass instead of calling
+        ``value_positions`` once per day.
+
+        Args:
+            assets: Asset model instances; column *j* of the matrices belongs to ``assets[j]``.
+            quantities: ``days x assets`` array of quantities held at the end of each day.
+            prices: ``days x assets`` array of unit prices (already forward-filled);
+                ``NaN`` where no price is known. Ignored for bonds.
+            dates: Valuation date of each row (used for bond interest accrual).
+            purchase_dates: Optional ``asset.id -> earliest BUY date`` for bonds.
+            target_currency: Currency to express the totals in. Positions are
+                summed per native currency first, then each currency's daily
+                subtotals are converted at that day's FX rate in one call.
+
+        Returns:
+            One total per day, as Decimal.
+        """
+        purchase_dates = purchase_dates or {}
+        n_days = len(dates)
+        held = quantities > 0
+        values = np.zeros((n_days, len(assets)), dtype=float)
+
+        for j, asset in enumerate(assets):
+            asset_type = asset.asset_type
+            if asset_type in ('stocks', 'cryptocurrencies') and asset.symbol:
+                column = quantities[:, j] * prices[:, j]
+                values[:, j] = np.where(held[:, j] & ~np.isnan(column), column, 0.0)
+            elif asset_type == 'bonds':
+                held_days = np.flatnonzero(held[:, j])
+                if held_days.size:
+                    unit_values = self._value_bond_unit_for_dates(
+                        asset, purchase_dates.get(asset.id), [dates[i] for i in held_days],
+                    )
+                    values[held_days, j] = quantities[held_days, j] * unit_values
+
+        # Sum columns per native currency, then convert each daily subtotal once
+        columns_by_currency: Dict[str, List[int]] = {}
+        for j, asset in enumerate(assets):
+            columns_by_currency.setdefault(self._get_native_currency(asset), []).append(j)
+
+        totals = np.zeros(n_days, dtype=float)
+        for native_currency, columns in columns_by_currency.items():
+            subtotals = values[:, columns].sum(axis=1)
+            if target_currency and native_currency != target_currency:
+                held_days = np.flatnonzero(subtotals > 0)
+                if held_days.size:
+                    subtotals[held_days] = self.currency_converter.convert_many(
+                        subtotals[held_days],
+                        [native_currency] * held_days.size,
+                        [dates[i] for i in held_days],
+                        target_currency,
+                    )
+            totals += subtotals
+        return [Decimal(str(total)) for total in totals]
+
     def _value_bond_position(
         self,
         asset: 'Asset',
@@ -368,7 +503,49 @@ class AssetManager:
         if calculator is None:
             return fallback
 
-        asset_data = {
+        asset_data = self._bond_asset_data(asset, quantity, purchase_date)
+        value = calculator.get_current_value(
+            asset_data, valuation_date=valuation_date,
+        )
+        return value if value is not None else fallback
+
+    def _value_bond_unit_for_dates(
+        self,
+        asset: 'Asset',
+        purchase_date: Optional[date],
+        valuation_dates: List[date],
+    ) -> np.ndarray:
+        """
+        Value one unit of a bond on each of *valuation_dates* in a single
+        ``BondCalculator.get_values_for_dates`` pass, with the same
+        face-value fallback as ``_value_bond_position``.
+        """
+        face_value = float(asset.face_value or Decimal('100'))
+        calculator = self._get_calculator_for_asset_type('bonds')
+        if calculator is None:
+            return np.full(len(valuation_dates), face_value)
+        if not isinstance(calculator, BondCalculator):
+            # Custom bond calculators may not offer the batched API
+            return np.array([
+                float(self._value_bond_position(asset, Decimal('1'), purchase_date, day))
+                for day in valuation_dates
+            ])
+
+        asset_data = self._bond_asset_data(asset, Decimal('1'), purchase_date)
+        unit_values = calculator.get_values_for_dates(asset_data, valuation_dates)
+        return np.where(np.isnan(unit_values), face_value, unit_values)
+
+    @staticmethod
+    def _bond_asset_data(
+        asset: 'Asset',
+        quantity: Decimal,
+        purchase_date: Optional[date],
+    ) -> Dict[str, Any]:
+        """Calculator input for a bond position."""
+        face_value = asset.face_value or Decimal('100')
+        if not isinstance(face_value, Decimal):
+            face_value = Decimal(str(face_value))
+        return {
             'face_value': face_value,
             'quantity': quantity,
             'maturity_date': asset.maturity_date,
@@ -382,11 +559,6 @@ class AssetManager:
             'purchase_date': purchase_date,
         }
 
-        value = calculator.get_current_value(
-            asset_data, valuation_date=valuation_date,
-        )
-        return value if value is not None else fallback
-
     # ---- Native currency inference ----
 
     def _get_native_currency(self, asset: 'Asset') -> str:
@@ -394,12 +566,16 @@ class AssetManager:
         Determine the native (trading) currency of an asset.
 
         - Bonds: always PLN (Polish Treasury Bonds).
-        - Crypto: always USD (prices fetched as ``<SYM>-USD``).
+        - Otherwise the currency persisted on the asset from the price
+          provider, when known.
+        - Crypto: USD (prices fetched as ``<SYM>-USD``).
         - Stocks: inferred from the exchange suffix of the symbol.
         """
         asset_type = asset.asset_type
         if asset_type == 'bonds':
             return 'PLN'
+        if asset.currency:
+            return asset.currency
         if asset_type == 'cryptocurrencies':
             return 'USD'
         if asset_type == 'stocks' and asset.symbol:
@@ -473,6 +649,7 @@ class AssetManager:
             'quantity': user_asset.quantity,
             'name': asset.name,
             'asset_type': asset_type,
+            'price_currency': self._get_native_currency(asset),
         }
 
         if asset_type == 'bonds':
@@ -2,9 +2,12 @@
 Asset calculators for computing portfolio values and metrics.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence
 from decimal import Decimal
 from datetime import date, datetime, timedelta
+
+import numpy as np
+
 from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher, CryptoDataFetcher
 from base.infrastructure.db import PriceRepository
 from .currency_converter import CurrencyConverter
@@ -31,7 +34,8 @@ class AssetCalculator(ABC):
 
         Args:
             asset_data: Dictionary containing asset information
-                       (e.g., symbol, quantity, etc.)
+                       (e.g., symbol, quantity, etc.). May carry a prefetched
+                       'current_price' and the 'price_currency' it is quoted in.
             target_currency: Target currency for the value (e.g., 'USD', 'PLN').
                            If None, returns value in asset's native currency.
 
@@ -80,9 +84,11 @@ class StockCalculator(AssetCalculator):
             if not isinstance(quantity, Decimal):
                 quantity = Decimal(str(quantity))
 
-            # Get current price from repository (DB or fetcher)
-            repo = PriceRepository()
-            current_price = repo.get_current_price(symbol, self.data_fetcher)
+            # Use the price prefetched for the whole portfolio, else ask the repository (DB or fetcher)
+            current_price = asset_data.get('current_price')
+            if current_price is None:
+                repo = PriceRepository()
+                current_price = repo.get_current_price(symbol, self.data_fetcher)
 
             if current_price is None:
                 return None
@@ -92,8 +98,8 @@ class StockCalculator(AssetCalculator):
 
             # Convert to target currency if specified
             if target_currency:
-                asset_currency = self.data_fetcher.get_currency(symbol)
-                
+                asset_currency = asset_data.get('price_currency') or self.data_fetcher.get_currency(symbol)
+
                 if asset_currency and asset_currency != target_currency:
                     converted_value = self.currency_converter.convert(
                         total_value,
@@ -149,9 +155,10 @@ class CryptoCalculator(AssetCalculator):
         total_value: Decimal,
         symbol: str,
         target_currency: str,
+        asset_currency: Optional[str] = None,
     ) -> Optional[Decimal]:
         """Convert total_value from asset currency to target_currency. Returns None if conversion fails."""
-        asset_currency = self.data_fetcher.get_currency(symbol)
+        asset_currency = asset_currency or self.data_fetcher.get_currency(symbol)
         if not asset_currency or asset_currency == target_currency:
             return total_value
         return self.currency_converter.convert(
@@ -175,8 +182,10 @@ class CryptoCalculator(AssetCalculator):
             if not isinstance(quantity, Decimal):
                 quantity = Decimal(str(quantity))
 
-            repo = PriceRepository()
-            current_price = repo.get_current_price(symbol, self.data_fetcher)
+            current_price = asset_data.get('current_price')
+            if current_price is None:
+                repo = PriceRepository()
+                current_price = repo.get_current_price(symbol, self.data_fetcher)
 
             if current_price is None:
                 return None
@@ -185,7 +194,7 @@ class CryptoCalculator(AssetCalculator):
 
             if target_currency:
                 total_value = self._convert_to_target_currency(
-                    total_value, symbol, target_currency
+                    total_value, symbol, target_currency, asset_data.get('price_currency'),
                 )
                 if total_value is None:
                     return None
@@ -462,6 +471,124 @@ class BondCalculator(AssetCalculator):
             print(f"Error calculating bond value: {str(e)}")
             return None
 
+    def get_values_for_dates(
+        self,
+        asset_data: Dict[str, Any],
+        valuation_dates: Sequence[date],
+    ) -> np.ndarray:
+        """
+        Batched counterpart of ``get_current_value`` for one bond over many dates.
+
+        The capital path (capital after each anniversary and the rate of every
+        year) is computed once; each date then only needs the number of
+        anniversaries passed, found with one ``searchsorted``, and its
+        days-since-last-anniversary accrual.
+
+        Args:
+            asset_data: Bond information dict, as for ``get_current_value``.
+            valuation_dates: Dates at which the bond is valued (any order).
+
+        Returns:
+            float array aligned with *valuation_dates*; NaN wherever
+            ``get_current_value`` would return None.
+        """
+        n = len(valuation_dates)
+        try:
+            face_value = Decimal(str(asset_data.get('face_value', 100)))
+            quantity = asset_data.get('quantity', 0)
+            maturity_date = asset_data.get('maturity_date')
+            purchase_date = asset_data.get('purchase_date')
+            bond_type = (asset_data.get('bond_type') or '').upper()
+
+            if not maturity_date or quantity is None or quantity <= 0:
+                return np.full(n, np.nan)
+            quantity = Decimal(str(quantity))
+            if isinstance(maturity_date, str):
+                maturity_date = datetime.strptime(maturity_date, '%Y-%m-%d').date()
+            if purchase_date and isinstance(purchase_date, str):
+                purchase_date = datetime.strptime(purchase_date, '%Y-%m-%d').date()
+
+            days = np.asarray(list(valuation_dates), dtype='datetime64[D]')
+            total_face_value = float(face_value * quantity)
+            values = np.full(n, total_face_value)
+            if not purchase_date or n == 0:
+                return values
+
+            purchase = np.datetime64(purchase_date, 'D')
+            accruing = (days < np.datetime64(maturity_date, 'D')) & (days > purchase)
+            if not accruing.any():
+                return values
+            active = days[accruing]
+
+            if bond_type in ('TOS', 'COI', 'EDO', 'ROS', 'DOS'):
+                values[accruing] = self._capitalization_values_for_dates(
+                    face_value, quantity, purchase_date, active, total_face_value, asset_data,
+                )
+            else:
+                rate = self.get_current_interest_rate(asset_data, purchase_date)
+                if rate is not None:
+                    days_since_purchase = (active - purchase).astype(float)
+                    values[accruing] = total_face_value * (
+                        1.0 + float(rate) * days_since_purchase / 365.0 / 100.0
+                    )
+            return values
+
+        except Exception as e:
+            print(f"Error calculating bond values: {str(e)}")
+            return np.full(n, np.nan)
+
+    def _capitalization_values_for_dates(
+        self,
+        face_value: Decimal,
+        quantity: Decimal,
+        purchase_date: date,
+        days: np.ndarray,
+        total_face_value: float,
+        asset_data: Dict[str, Any],
+    ) -> np.ndarray:
+        """Vectorized ``_get_value_annual_capitalization`` for dates after purchase."""
+        last_day = days.max().item()
+        anniversaries: List[date] = [purchase_date]
+        while anniversaries[-1] <= last_day:
+            anniversaries.append(date(
+                purchase_date.year + len(anniversaries),
+                purchase_date.month,
+                purchase_date.day,
+            ))
+        # full_years per date = anniversaries after purchase that are <= the date
+        full_years = np.searchsorted(
+            np.array(anniversaries[1:], dtype='datetime64[D]'), days, side='right',
+        )
+        max_years = int(full_years.max())
+
+        capital_path: List[Decimal] = [face_value]
+        rates: List[Optional[Decimal]] = []
+        for year_index in range(max_years + 1):
+            rate = self._get_rate_for_year(year_index, anniversaries[year_index], asset_data)
+            rates.append(rate)
+            if year_index < max_years:
+                if rate is None:
+                    break
+                capital_path.append(capital_path[-1] + capital_path[-1] * rate / Decimal('100'))
+
+        qty = float(quantity)
+        values = np.full(len(days), total_face_value)
+        for year_index in range(min(len(capital_path), max_years + 1)):
+            in_year = full_years == year_index
+            if not in_year.any():
+                continue
+            capital = float(capital_path[year_index])
+            rate = rates[year_index] if year_index < len(rates) else None
+            if rate is None:
+                values[in_year] = capital * qty
+                continue
+            period_start = np.datetime64(anniversaries[year_index], 'D')
+            days_ytd = (days[in_year] - period_start).astype(float)
+            values[in_year] = (
+                capital + capital * float(rate) * days_ytd / 365.0 / 100.0
+            ) * qty
+        return values
+
     def calculate_yield_to_maturity(
         self,
         asset_data: Dict[str, Any],
@@ -527,3 +654,16 @@ class BondCalculator(AssetCalculator):
 
     def get_asset_type(self) -> str:
         return 'bonds'
+
+
+def default_calculators(
+    stock_data_fetcher: StockDataFetcher,
+    crypto_data_fetcher: CryptoDataFetcher,
+    currency_converter: CurrencyConverter,
+) -> Dict[str, AssetCalculator]:
+    """The standard asset type -> calculator map used by AssetManager."""
+    return {
+        'stocks': StockCalculator(stock_data_fetcher, currency_converter),
+        'bonds': BondCalculator(),
+        'cryptocurrencies': CryptoCalculator(crypto_data_fetcher, currency_converter),
+    }
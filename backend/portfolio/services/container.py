@@ -0,0 +1,93 @@
+"""
+Process-wide service container.
+
+Market data fetchers, the CurrencyConverter and the asset calculators are
+stateless apart from their (thread-safe, process-wide) caches, so one set is
+built lazily per process and shared by every request and thread. Per-request
+state lives in the lightweight objects handed out on top: each
+``asset_manager()`` call returns a new AssetManager with its own default
+currency and calculator map, wired to the shared, already-warm collaborators.
+"""
+import threading
+from typing import Dict, Optional
+
+from base.infrastructure.interfaces.market_data_fetcher import CryptoDataFetcher, StockDataFetcher
+from base.services import get_default_crypto_fetcher, get_default_stock_fetcher
+from .asset_manager import AssetManager
+from .calculators import AssetCalculator, default_calculators
+from .currency_converter import CurrencyConverter
+
+
+class ServiceContainer:
+    """Lazily built, shared fetchers, converter and calculators."""
+
+    def __init__(
+        self,
+        stock_data_fetcher: Optional[StockDataFetcher] = None,
+        crypto_data_fetcher: Optional[CryptoDataFetcher] = None,
+        currency_converter: Optional[CurrencyConverter] = None,
+    ):
+        self._stock_data_fetcher = stock_data_fetcher
+        self._crypto_data_fetcher = crypto_data_fetcher
+        self._currency_converter = currency_converter
+        self._calculators: Optional[Dict[str, AssetCalculator]] = None
+        self._lock = threading.RLock()
+
+    @property
+    def stock_data_fetcher(self) -> StockDataFetcher:
+        if self._stock_data_fetcher is None:
+            with self._lock:
+                if self._stock_data_fetcher is None:
+                    self._stock_data_fetcher = get_default_stock_fetcher()
+        return self._stock_data_fetcher
+
+    @property
+    def crypto_data_fetcher(self) -> CryptoDataFetcher:
+        if self._crypto_data_fetcher is None:
+            with self._lock:
+                if self._crypto_data_fetcher is None:
+                    self._crypto_data_fetcher = get_default_crypto_fetcher()
+        return self._crypto_data_fetcher
+
+    @property
+    def currency_converter(self) -> CurrencyConverter:
+        if self._currency_converter is None:
+            with self._lock:
+                if self._currency_converter is None:
+                    self._currency_converter = CurrencyConverter()
+        return self._currency_converter
+
+    @property
+    def calculators(self) -> Dict[str, AssetCalculator]:
+        """Shared calculators; treat as read-only (AssetManager copies the map)."""
+        if self._calculators is None:
+            with self._lock:
+                if self._calculators is None:
+                    self._calculators = default_calculators(
+                        self.stock_data_fetcher, self.crypto_data_fetcher, self.currency_converter,
+                    )
+        return self._calculators
+
+    def asset_manager(self, default_currency: str = 'USD') -> AssetManager:
+        """A new AssetManager for one request or job, backed by the shared services."""
+        return AssetManager(default_currency=default_currency, services=self)
+
+
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+
+
+def get_service_container() -> ServiceContainer:
+    """The process-wide ServiceContainer."""
+    global _container
+    with _container_lock:
+        if _container is None:
+            _container = ServiceContainer()
+        return _container
+
+
+def reset_service_container() -> None:
+    """Drop the process-wide container (e.g. after changing fetcher settings)."""
+    global _container
+    with _container_lock:
+        _container = None
@@ -3,20 +3,47 @@ Currency converter for converting asset values between currencies.
 
 Uses an FXDataFetcher (default from base.services) for rates; falls back to
 yfinance when no fetcher is provided (backward compatibility).
+
+Rates are cached process-wide (shared by every CurrencyConverter in the
+worker) with a TTL; historical daily rates are additionally stored in the
+FXRate table, so each pair/day is fetched from the network once.
 """
+import asyncio
 import logging
-from datetime import date
-from typing import Optional, TYPE_CHECKING
+from datetime import date, timedelta
+from typing import Optional, Sequence, TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from decimal import Decimal
 
+from base.infrastructure.concurrency import get_provider_limiter, run_sync
+from base.infrastructure.db import FXRateRepository
+from base.infrastructure.providers.async_adapters import ThreadedAsyncFXDataFetcher
+from base.services.cache import TTLCache
+from base.services.price_series import PriceSeries
+
 if TYPE_CHECKING:
     from base.infrastructure.interfaces.market_data_fetcher import FXDataFetcher
 
 logger = logging.getLogger(__name__)
 
+# Current (spot) rates are refetched at most once per TTL per pair per worker.
+FX_RATE_CACHE_TTL = timedelta(minutes=15)
+FX_RATE_CACHE_MAX_ENTRIES = 1024
+
+# How long the FX fetcher may take before the yfinance ticker fallback is started too.
+FX_FALLBACK_HEDGE_DELAY = timedelta(seconds=1)
+
+# Days fetched before a requested date so weekends/holidays resolve to the last close.
+FX_HISTORY_LOOKBACK_DAYS = 7
+
+_shared_rate_cache = TTLCache(
+    maxsize=FX_RATE_CACHE_MAX_ENTRIES,
+    ttl=FX_RATE_CACHE_TTL.total_seconds(),
+)
+
 
 def _get_default_fx_fetcher():
     """Lazy import to avoid circular imports."""
@@ -39,8 +66,9 @@ class CurrencyConverter:
                 get_historical_fx_series/convert_series, and yfinance for
                 _fetch_rate (current rate).
         """
-        self._cache: dict[str, Decimal] = {}
+        self._cache = _shared_rate_cache
         self._fx_fetcher = fx_fetcher
+        self._rate_repository = FXRateRepository()
 
     def _get_fx_fetcher(self) -> Optional['FXDataFetcher']:
         if self._fx_fetcher is not None:
@@ -89,32 +117,196 @@ class CurrencyConverter:
 
         return self._get_cached_rate(from_currency, to_currency)
 
+    def get_rate_for_date(
+        self,
+        from_currency: str,
+        to_currency: str,
+        day: date,
+    ) -> Optional[Decimal]:
+        """
+        Return the daily closing rate on *day* (or the last close before it).
+
+        Lookup order: shared in-process cache, FXRate table, then the FX
+        fetcher (whose result is stored in the table). Falls back to the
+        current rate when no historical rate is available.
+        """
+        if from_currency == to_currency:
+            return Decimal('1.0')
+        if day >= date.today():
+            return self._get_cached_rate(from_currency, to_currency)
+
+        rate = self._cache.get_or_set(
+            ("daily", from_currency, to_currency, day),
+            lambda: self._load_daily_rate(from_currency, to_currency, day),
+            ttl=None,
+        )
+        if rate is None:
+            return self._get_cached_rate(from_currency, to_currency)
+        return rate
+
     def clear_cache(self):
-        """Clear the exchange rate cache."""
+        """Clear the exchange rate cache (shared by all converters in this process)."""
         self._cache.clear()
 
     def _get_cached_rate(
         self, from_currency: str, to_currency: str,
     ) -> Optional[Decimal]:
         """Return cached rate or fetch and cache it."""
-        cache_key = f"{from_currency}_{to_currency}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        return self._cache.get_or_set(
+            ("spot", from_currency, to_currency),
+            lambda: self._fetch_rate(from_currency, to_currency),
+        )
 
-        rate = self._fetch_rate(from_currency, to_currency)
-        if rate is not None:
-            self._cache[cache_key] = rate
-        return rate
+    def _load_daily_rate(
+        self, from_currency: str, to_currency: str, day: date,
+    ) -> Optional[Decimal]:
+        """
+        Read the daily rate from the DB, fetching and storing it when missing.
+
+        An earlier stored rate stands in only for days the coverage index
+        knows (weekends, holidays); any other day is fetched first, so a
+        rate stored a few days before never hides the day's own close.
+        """
+        if self._rate_repository.is_covered(from_currency, to_currency, day):
+            rate = self._rate_repository.get_rate(
+                from_currency, to_currency, day, max_lookback_days=FX_HISTORY_LOOKBACK_DAYS,
+            )
+            if rate is not None:
+                return rate
+        series = self._load_rate_series(from_currency, to_currency, day, day)
+        value = series.asof(day)
+        return Decimal(str(value)) if value is not None else None
+
+    def get_rate_series(
+        self,
+        from_currency: str,
+        to_currency: str,
+        start_date: date,
+        end_date: date,
+    ) -> PriceSeries:
+        """
+        Daily closing rates for [start_date, end_date] (plus a short lookback
+        so the first days resolve to the previous close), read from the FXRate
+        table with gaps filled from the FX fetcher. Cached process-wide.
+        """
+        return self._cache.get_or_set(
+            ("series", from_currency, to_currency, start_date, end_date),
+            lambda: self._load_rate_series(from_currency, to_currency, start_date, end_date),
+        )
+
+    def _load_rate_series(
+        self, from_currency: str, to_currency: str, start_date: date, end_date: date,
+    ) -> PriceSeries:
+        lookback_start = start_date - timedelta(days=FX_HISTORY_LOOKBACK_DAYS)
+        fetcher = self._get_fx_fetcher()
+        if fetcher is None:
+            rates = self._rate_repository.get_rates(from_currency, to_currency, lookback_start, end_date)
+        else:
+            rates = self._rate_repository.get_rate_history(
+                from_currency, to_currency, lookback_start, end_date, fetcher,
+            )
+        return PriceSeries.from_dict(rates)
+
+    def _daily_rates(
+        self,
+        from_currency: str,
+        to_currency: str,
+        days: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Rate for each ``datetime64[D]`` in *days*: last close on or before the
+        day, the first later close before history starts, and the current rate
+        for today/future days or when no history is available. NaN if unknown.
+        """
+        series = self.get_rate_series(
+            from_currency, to_currency, days.min().astype(object), days.max().astype(object),
+        )
+        rates = series.asof_many(days)
+        if not series.empty:
+            rates[np.isnan(rates)] = series.values[0]
+        live = (days >= np.datetime64(date.today(), 'D')) | np.isnan(rates)
+        if live.any():
+            spot = self._get_cached_rate(from_currency, to_currency)
+            if spot is not None:
+                rates[live] = float(spot)
+        return rates
+
+    def convert_many(
+        self,
+        amounts: Sequence[float],
+        from_currencies: Sequence[str],
+        dates: Sequence[date],
+        to_currency: str,
+    ) -> np.ndarray:
+        """
+        Convert ``amounts[i]`` from ``from_currencies[i]`` to *to_currency* at
+        the daily rate of ``dates[i]``, in one pass.
+
+        Rates are loaded once per currency pair for the whole date span, so
+        the cost does not grow with the number of rows. Amounts whose rate is
+        unknown are returned unchanged (same fallback as ``convert``).
+
+        Returns:
+            float array aligned with *amounts*.
+        """
+        values = np.asarray(amounts, dtype=float)
+        result = values.copy()
+        if values.size == 0:
+            return result
+        currencies = np.asarray(from_currencies, dtype=object)
+        days = np.asarray(dates, dtype='datetime64[D]')
+        for currency in set(currencies):
+            if not currency or currency == to_currency:
+                continue
+            mask = currencies == currency
+            rates = self._daily_rates(currency, to_currency, days[mask])
+            known = ~np.isnan(rates)
+            converted = result[mask]
+            converted[known] = values[mask][known] * rates[known]
+            result[mask] = converted
+        return result
 
     def _fetch_rate(
         self, from_currency: str, to_currency: str,
     ) -> Optional[Decimal]:
         """Fetch the current exchange rate (via fetcher when set, else yfinance)."""
+        return run_sync(self._fetch_rate_async(from_currency, to_currency))
+
+    async def _fetch_rate_async(
+        self, from_currency: str, to_currency: str,
+    ) -> Optional[Decimal]:
+        """
+        Hedged lookup: the yfinance ticker fallback starts as soon as the
+        fetcher fails or has not answered within FX_FALLBACK_HEDGE_DELAY,
+        and the first rate returned wins.
+        """
+        limiter = get_provider_limiter("yfinance")
         fetcher = self._get_fx_fetcher()
-        if fetcher is not None:
-            rate = fetcher.get_current_rate(from_currency, to_currency)
-            if rate is not None:
-                return rate
+        if fetcher is None:
+            return await limiter.run(self._fetch_ticker_rate, from_currency, to_currency)
+
+        primary = asyncio.ensure_future(
+            ThreadedAsyncFXDataFetcher(fetcher).get_current_rate(from_currency, to_currency)
+        )
+        done, _ = await asyncio.wait({primary}, timeout=FX_FALLBACK_HEDGE_DELAY.total_seconds())
+        if done and primary.result() is not None:
+            return primary.result()
+
+        fallback = asyncio.ensure_future(
+            limiter.run(self._fetch_ticker_rate, from_currency, to_currency)
+        )
+        pending = {primary, fallback} - done
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                if task.result() is not None:
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+        return None
+
+    @staticmethod
+    def _fetch_ticker_rate(from_currency: str, to_currency: str) -> Optional[Decimal]:
         ticker_symbol = f"{from_currency}{to_currency}=X"
         try:
             ticker = yf.Ticker(ticker_symbol)
@@ -161,14 +353,18 @@ class CurrencyConverter:
         Convert a time series of amounts from one currency to another using
         historical FX rates (one rate per date). amount_from * rate = amount_to.
 
-        If conversion fails or same currency, returns the original series unchanged.
+        Rates come from the FXRate table (gap-filled from the fetcher), so
+        repeated calls do not hit the network. If no rate is available or the
+        currencies match, returns the original series unchanged.
         """
-        if from_currency == to_currency:
+        if from_currency == to_currency or series.empty:
             return series
-        fx_series = self.get_historical_fx_series(from_currency, to_currency, start_date, end_date)
-        if fx_series is None or fx_series.empty:
+        days = np.array(
+            [i.date() if hasattr(i, 'date') else i for i in series.index],
+            dtype='datetime64[D]',
+        )
+        rates = self._daily_rates(from_currency, to_currency, days)
+        if np.isnan(rates).all():
             return series
-        fx_aligned = fx_series.reindex(series.index).ffill().bfill()
-        fx_aligned = fx_aligned.replace(0, float('nan')).fillna(1.0)
-        converted = series * fx_aligned
+        converted = series * np.where(np.isnan(rates), 1.0, rates)
         return converted.fillna(series)
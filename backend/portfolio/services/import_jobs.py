@@ -0,0 +1,270 @@
+"""
+Background transaction imports.
+
+Upload views store the file in a ``TransactionImportJob`` and return at once;
+the import itself (parse, persist, snapshot rebuild) runs in a worker:
+``manage.py run_import_jobs``, or, with IMPORT_JOBS_IN_PROCESS, a small
+thread pool in the web process. Jobs are claimed with a conditional UPDATE,
+so any number of workers can poll the same table without running a job twice.
+Running jobs record a heartbeat after every chunk; jobs silent for longer than
+IMPORT_JOBS_TIMEOUT (their worker died) go back to pending. Each claim is
+identified by its ``started_at``, and a worker only writes progress and
+results while its claim is still current, so a requeued job's first worker
+cannot overwrite the rerun. Re-running is safe because rows are deduplicated
+by external id.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import timedelta
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from portfolio.infrastructure.xtb import iter_xtb_cash_operations_xlsx
+from portfolio.models import TransactionImportJob
+from portfolio.services.transaction_import_service import (
+    NormalizedTransactionImportRow,
+    TransactionImportResult,
+    import_normalized_transaction_chunks,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_JOB_WORKERS = 2
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_JOB_TIMEOUT = 1800.0
+
+# Source -> parser yielding chunks of normalized rows from the uploaded file
+_PARSERS: Dict[str, Callable[[BytesIO], Iterator[List[NormalizedTransactionImportRow]]]] = {
+    TransactionImportJob.Source.XTB_CASH_OPERATIONS: iter_xtb_cash_operations_xlsx,
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_sweep_queued = False
+_sweep_lock = threading.Lock()
+
+
+def enqueue_import_job(user: User, source: str, file_name: str, payload: bytes) -> TransactionImportJob:
+    """
+    Store an uploaded file as a pending job. With IMPORT_JOBS_IN_PROCESS the job
+    is also handed to the in-process pool once the surrounding transaction commits.
+    """
+    if source not in _PARSERS:
+        raise ValueError(f"Unsupported import source: {source!r}")
+    job = TransactionImportJob.objects.create(
+        owner=user, source=source, file_name=file_name or "", payload=payload,
+    )
+    if getattr(settings, "IMPORT_JOBS_IN_PROCESS", True):
+        transaction.on_commit(lambda: _submit(job.id))
+    return job
+
+
+def claim_job(job_id: Optional[int] = None) -> Optional[TransactionImportJob]:
+    """
+    Mark a pending job as running and return it: *job_id* if given, else the
+    oldest pending one. Returns None when there is nothing to claim or another
+    worker got there first.
+    """
+    pending = TransactionImportJob.objects.filter(status=TransactionImportJob.Status.PENDING)
+    if job_id is None:
+        job_id = pending.order_by("created_at", "id").values_list("id", flat=True).first()
+        if job_id is None:
+            return None
+    now = timezone.now()
+    claimed = pending.filter(id=job_id).update(
+        status=TransactionImportJob.Status.RUNNING, started_at=now, heartbeat_at=now,
+    )
+    if not claimed:
+        return None
+    return TransactionImportJob.objects.get(id=job_id)
+
+
+def requeue_stale_jobs(timeout: Optional[float] = None) -> int:
+    """
+    Put running jobs without a heartbeat for more than *timeout* seconds
+    (default IMPORT_JOBS_TIMEOUT) back to pending, so a job whose worker died
+    is picked up again. Returns how many were requeued.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "IMPORT_JOBS_TIMEOUT", DEFAULT_JOB_TIMEOUT)
+    requeued = TransactionImportJob.objects.filter(
+        status=TransactionImportJob.Status.RUNNING,
+        heartbeat_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(status=TransactionImportJob.Status.PENDING, started_at=None, heartbeat_at=None)
+    if requeued:
+        logger.warning("Requeued %d import job(s) without progress for %ss", requeued, timeout)
+    return requeued
+
+
+def _current_claim(job: TransactionImportJob):
+    """Queryset matching *job* only while this worker's claim on it is current."""
+    return TransactionImportJob.objects.filter(
+        id=job.id, status=TransactionImportJob.Status.RUNNING, started_at=job.started_at,
+    )
+
+
+def outcomes_to_dicts(result: TransactionImportResult) -> List[dict]:
+    return [asdict(o) for o in result.outcomes]
+
+
+def run_import_job(job: TransactionImportJob, *, stock_fetcher=None, crypto_fetcher=None) -> TransactionImportJob:
+    """
+    Import a claimed job's file chunk by chunk, recording progress after each
+    chunk, then store the outcomes and drop the payload. Failures mark the job
+    as failed; rows from chunks already imported stay saved. If the job was
+    requeued meanwhile, the results are left to the run that owns it now.
+    """
+    result = TransactionImportResult()
+
+    def record_progress(progress: TransactionImportResult) -> None:
+        nonlocal result
+        result = progress
+        _current_claim(job).update(
+            rows_processed=len(progress.outcomes), created_count=progress.created_count,
+            heartbeat_at=timezone.now(),
+        )
+
+    parse = _PARSERS[job.source]
+    try:
+        import_normalized_transaction_chunks(
+            job.owner,
+            parse(BytesIO(bytes(job.payload or b""))),
+            stock_fetcher=stock_fetcher,
+            crypto_fetcher=crypto_fetcher,
+            on_chunk=record_progress,
+        )
+        job.status = TransactionImportJob.Status.SUCCEEDED
+    except ValueError as e:
+        job.status = TransactionImportJob.Status.FAILED
+        job.error = str(e)
+    except Exception:
+        logger.exception("Import job %s failed", job.id)
+        job.status = TransactionImportJob.Status.FAILED
+        job.error = (
+            "Could not read the whole file; rows read before the error were imported."
+            if result.outcomes
+            else "Could not read the file. Check that it is a valid broker export."
+        )
+
+    job.rows_processed = len(result.outcomes)
+    job.created_count = result.created_count
+    job.outcomes = outcomes_to_dicts(result)
+    job.payload = None
+    job.finished_at = timezone.now()
+    saved = _current_claim(job).update(
+        status=job.status,
+        error=job.error,
+        rows_processed=job.rows_processed,
+        created_count=job.created_count,
+        outcomes=job.outcomes,
+        payload=None,
+        finished_at=job.finished_at,
+    )
+    if not saved:
+        logger.warning("Import job %s was requeued while running; discarding this run's results", job.id)
+    return job
+
+
+def run_pending_jobs(limit: Optional[int] = None) -> int:
+    """Requeue stale jobs, then claim and run pending jobs one after another; return how many ran."""
+    requeue_stale_jobs()
+    ran = 0
+    while limit is None or ran < limit:
+        job = claim_job()
+        if job is None:
+            break
+        run_import_job(job)
+        ran += 1
+    return ran
+
+
+def run_worker(poll_interval: Optional[float] = None, iterations: Optional[int] = None) -> None:
+    """Poll for pending jobs forever (or for *iterations* polls), sleeping when idle."""
+    if poll_interval is None:
+        poll_interval = getattr(settings, "IMPORT_JOBS_POLL_INTERVAL", DEFAULT_POLL_INTERVAL)
+    n = 0
+    while iterations is None or n < iterations:
+        if not run_pending_jobs():
+            time.sleep(poll_interval)
+        n += 1
+
+
+def resume_import_jobs() -> None:
+    """
+    With IMPORT_JOBS_IN_PROCESS, requeue stale jobs and sweep pending ones on
+    the in-process pool (jobs left over from a restart, or whose hand-off
+    failed). Called when a client polls an unfinished job.
+    """
+    if getattr(settings, "IMPORT_JOBS_IN_PROCESS", True):
+        requeue_stale_jobs()
+        _schedule_sweep()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        created = _executor is None
+        if created:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "IMPORT_JOBS_WORKERS", DEFAULT_IMPORT_JOB_WORKERS),
+                thread_name_prefix="import-jobs",
+            )
+        executor = _executor
+    if created:
+        # Jobs may have been queued before this process started
+        _schedule_sweep()
+    return executor
+
+
+def _schedule_sweep() -> None:
+    """Queue one run_pending_jobs pass on the pool unless one is already queued."""
+    global _sweep_queued
+    with _sweep_lock:
+        if _sweep_queued:
+            return
+        _sweep_queued = True
+    try:
+        _get_executor().submit(_sweep_in_thread)
+    except RuntimeError as e:
+        with _sweep_lock:
+            _sweep_queued = False
+        logger.warning("Could not schedule import job sweep: %s", e)
+
+
+def _sweep_in_thread() -> None:
+    global _sweep_queued
+    with _sweep_lock:
+        _sweep_queued = False
+    try:
+        run_pending_jobs()
+    except Exception:
+        logger.exception("Import job sweep failed")
+    finally:
+        connection.close()
+
+
+def _run_in_thread(job_id: int) -> None:
+    try:
+        job = claim_job(job_id)
+        if job is not None:
+            run_import_job(job)
+    except Exception:
+        logger.exception("Import job %s could not be run", job_id)
+    finally:
+        connection.close()
+
+
+def _submit(job_id: int) -> None:
+    try:
+        _get_executor().submit(_run_in_thread, job_id)
+    except RuntimeError as e:
+        # Left pending for run_import_jobs to pick up
+        logger.warning("Could not schedule import job %s: %s", job_id, e)
@@ -43,24 +43,21 @@ def get_benchmark_series(
     """
     Fetch benchmark (e.g. S&P 500) price series for the given date range.
 
-    Uses PriceRepository (DB + fetcher fallback). Returns a pandas Series with
-    DatetimeIndex and close prices, or None if fetch fails or returns empty.
+    Uses PriceRepository (DB + fetcher fallback, shared series cache). Returns a
+    pandas Series with DatetimeIndex and close prices, or None if fetch fails or
+    returns empty.
     """
     fetcher = stock_data_fetcher or get_default_stock_fetcher()
     start = _to_date(start_date)
     end = _to_date(end_date)
     try:
         repo = PriceRepository()
-        prices = repo.get_price_history(ticker, start, end, fetcher)
+        prices = repo.get_price_series(ticker, start, end, fetcher)
     except Exception:
         return None
-    if not prices:
+    if prices.empty:
         return None
-    series = pd.Series({d: float(v) for d, v in prices.items()})
-    if series.empty:
-        return None
-    series.index = pd.DatetimeIndex(series.index)
-    return series.sort_index()
+    return prices.to_pandas()
 
 
 def calculateProfit(portfolio, userID, passwd):
@@ -1,35 +1,47 @@
 """
 Service for building and managing daily portfolio value snapshots.
 
-Snapshots are calculated by reconstructing positions from transactions,
-fetching historical prices via ``PriceRepository`` (which uses data fetchers
-internally and persists to DB), and valuing the positions via ``AssetManager.value_positions``.
+Snapshots are calculated in one vectorized pass: a days x assets quantity
+matrix built from cumulative transaction deltas, a forward-filled days x assets
+price matrix built from historical prices fetched via ``PriceRepository``
+(which uses data fetchers internally and persists to DB), valued via
+``AssetManager.value_position_matrix``.
 """
 import logging
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from django.contrib.auth.models import User
+from django.db import transaction
 
-from portfolio.models import PortfolioSnapshot
+from base.models import Asset
+from portfolio.models import PortfolioSnapshot, PortfolioSnapshotState
 from portfolio.models import Transactions
 from .asset_manager import AssetManager
 from base.infrastructure.interfaces.market_data_fetcher import CryptoDataFetcher, StockDataFetcher
 from base.infrastructure.db import PriceRepository
-from base.services import get_default_stock_fetcher, get_default_crypto_fetcher
+from .container import get_service_container
+from base.services.price_series import PriceSeries
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement when persisting snapshots.
+SNAPSHOT_BULK_BATCH_SIZE = 1000
 
-def _price_dict_to_series(prices: Dict[date, Decimal]) -> pd.Series:
-    """Convert Dict[date, Decimal] from PriceRepository to pd.Series for _get_price_at_date."""
-    if not prices:
-        return pd.Series(dtype=float)
-    s = pd.Series({d: float(v) for d, v in prices.items()})
-    s.index = pd.DatetimeIndex(s.index)
-    return s.sort_index()
+# Days of prices loaded before a build's start date, so a range starting on a
+# weekend or holiday carries the last close forward instead of valuing at 0.
+PRICE_LOOKBACK_DAYS = 10
+
+_CENTS = Decimal("0.01")
+
+
+def _to_cents(value: Decimal) -> Decimal:
+    """Quantize to the 2 decimal places stored by ``PortfolioSnapshot`` (so change detection compares like with like)."""
+    return Decimal(value).quantize(_CENTS)
 
 
 class PortfolioSnapshotService:
@@ -43,10 +55,11 @@ class PortfolioSnapshotService:
         asset_manager: Optional[AssetManager] = None,
         price_repository: Optional[PriceRepository] = None,
     ):
+        services = get_service_container()
         self.currency = currency
-        self.stock_data_fetcher = stock_data_fetcher or get_default_stock_fetcher()
-        self.crypto_data_fetcher = crypto_data_fetcher or get_default_crypto_fetcher()
-        self.asset_manager = asset_manager or AssetManager(default_currency=currency)
+        self.stock_data_fetcher = stock_data_fetcher or services.stock_data_fetcher
+        self.crypto_data_fetcher = crypto_data_fetcher or services.crypto_data_fetcher
+        self.asset_manager = asset_manager or services.asset_manager(currency)
         self.price_repository = price_repository if price_repository is not None else PriceRepository()
 
     # ------------------------------------------------------------------
@@ -59,12 +72,15 @@ class PortfolioSnapshotService:
         start_date: date,
         end_date: date,
         currency: Optional[str] = None,
+        only_changed: bool = False,
     ) -> List[PortfolioSnapshot]:
         """
         Build daily snapshots for *user* from *start_date* to *end_date*.
 
-        Existing snapshots in the range are overwritten (update_or_create).
-        Returns the list of created/updated ``PortfolioSnapshot`` instances.
+        Existing snapshots in the range are overwritten with a single bulk
+        upsert on (user, date, currency). With *only_changed*, rows whose
+        stored values already match are not written at all.
+        Returns the list of built ``PortfolioSnapshot`` instances (one per day).
         """
         currency = currency or self.currency
         end_date = min(end_date, date.today())
@@ -75,7 +91,8 @@ class PortfolioSnapshotService:
             .order_by("date", "id")
         )
 
-        if not transactions:
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        if not transactions or not days:
             return []
 
         # Collect tradable symbols split by asset type
@@ -96,59 +113,309 @@ class PortfolioSnapshotService:
             stock_symbols, crypto_symbols, start_date, end_date,
         )
 
-        # Running total of net cash invested (BUY adds, SELL subtracts)
-        total_invested_runner = Decimal("0")
-        tx_index = 0
-
-        # Build snapshots day by day
-        snapshots: List[PortfolioSnapshot] = []
-        current = start_date
-        while current <= end_date:
-            # Include any transactions on or before this day in total_invested
-            while tx_index < len(transactions) and transactions[tx_index].date <= current:
-                tx = transactions[tx_index]
-                amount = Decimal(str(tx.price * tx.quantity))
-                from_currency = tx.currency or self.asset_manager._get_native_currency(tx.product)
-                if from_currency != currency:
-                    converted = self.asset_manager.currency_converter.convert(
-                        amount, from_currency, currency
-                    )
-                    if converted is not None:
-                        amount = converted
-                if tx.transactionType == Transactions.transaction_type.BUY:
-                    total_invested_runner += amount
-                else:
-                    total_invested_runner -= amount
-                tx_index += 1
-
-            positions = self._reconstruct_positions(transactions, current)
-
-            # Build a price-getter closure for this specific date
-            prices_for_date = historical_prices  # captured by ref
-            snap_date = current  # captured by value
-
-            def get_price(symbol, _d=snap_date, _p=prices_for_date):
-                return self._get_price_at_date(_p.get(symbol), _d)
-
-            total = self.asset_manager.value_positions(
-                positions, get_price, valuation_date=current,
-                target_currency=currency,
-            )
+        assets, quantities = self._build_quantity_matrix(transactions, start_date, len(days))
+        prices = self._build_price_matrix(assets, historical_prices, days)
+        purchase_dates = self._first_buy_dates(transactions)
+        totals = self.asset_manager.value_position_matrix(
+            assets, quantities, prices, days,
+            purchase_dates=purchase_dates,
+            target_currency=currency,
+        )
+        invested = self._build_invested_series(transactions, start_date, len(days), currency)
 
-            snap, _ = PortfolioSnapshot.objects.update_or_create(
+        snapshots = [
+            PortfolioSnapshot(
                 user=user,
-                date=current,
+                date=day,
                 currency=currency,
-                defaults={
-                    "total_value": total,
-                    "total_invested": total_invested_runner,
-                },
+                total_value=_to_cents(total),
+                total_invested=_to_cents(total_invested),
             )
-            snapshots.append(snap)
-            current += timedelta(days=1)
-
+            for day, total, total_invested in zip(days, totals, invested)
+        ]
+        self._save_snapshots(user, currency, snapshots, only_changed=only_changed)
+        self._save_state(
+            user, currency, days[-1],
+            {
+                asset.id: (float(qty), purchase_dates.get(asset.id))
+                for asset, qty in zip(assets, quantities[-1])
+            },
+            invested[-1],
+        )
         return snapshots
 
+    def apply_transaction_change(
+        self,
+        user: User,
+        changed_date: date,
+    ) -> None:
+        """
+        Bring snapshots up to date after a transaction dated *changed_date*
+        was created, imported or deleted.
+
+        Only days from *changed_date* onward are priced and valued, and only
+        rows whose values changed are written. Every currency the user keeps
+        snapshot state for is refreshed (plus this service's currency).
+
+        This is not seeded from ``PortfolioSnapshotState``: the stored state
+        describes positions as of its ``last_date``, after the change, so the
+        user's transactions are still loaded and replayed (in memory, one
+        query) to get quantities and invested totals on *changed_date*. Price
+        loading and valuation - the expensive part - cover only
+        [*changed_date*, today].
+        """
+        today = date.today()
+        if changed_date > today:
+            return
+        currencies = set(
+            PortfolioSnapshotState.objects.filter(user=user).values_list("currency", flat=True)
+        )
+        currencies.add(self.currency)
+
+        if not Transactions.objects.filter(owner=user).exists():
+            # Last transaction removed: nothing left to value from changed_date on
+            PortfolioSnapshot.objects.filter(user=user, date__gte=changed_date).delete()
+            PortfolioSnapshotState.objects.filter(user=user).delete()
+            return
+
+        for currency in sorted(currencies):
+            self.build_snapshots_for_user(
+                user, changed_date, today, currency=currency, only_changed=True,
+            )
+
+    def append_today(
+        self,
+        user: User,
+        currency: Optional[str] = None,
+    ) -> Optional[PortfolioSnapshot]:
+        """
+        Write (or refresh) today's snapshot from the stored running state.
+
+        When the state is current (last snapshot yesterday or today), today is
+        valued from the stored positions and current prices - O(positions), no
+        transaction replay. Without state, or when days are missing in
+        between, falls back to ``build_snapshots_for_user`` for the gap.
+        """
+        currency = currency or self.currency
+        today = date.today()
+        state = PortfolioSnapshotState.objects.filter(user=user, currency=currency).first()
+        if state is None or state.last_date < today - timedelta(days=1):
+            start = state.last_date + timedelta(days=1) if state is not None else today
+            snapshots = self.build_snapshots_for_user(
+                user, min(start, today), today, currency=currency,
+            )
+            return snapshots[-1] if snapshots else None
+
+        assets = Asset.objects.in_bulk([int(pid) for pid in state.positions])
+        positions = []
+        fetchers = {}
+        for pid, entry in state.positions.items():
+            asset = assets.get(int(pid))
+            if asset is None:
+                continue
+            purchase_date = entry.get("purchase_date")
+            positions.append({
+                "asset": asset,
+                "quantity": entry.get("quantity", 0),
+                "purchase_date": date.fromisoformat(purchase_date) if purchase_date else None,
+            })
+            if asset.symbol and asset.asset_type == "cryptocurrencies":
+                fetchers[asset.symbol] = self.crypto_data_fetcher
+            elif asset.symbol:
+                fetchers[asset.symbol] = self.stock_data_fetcher
+
+        def get_price(symbol):
+            return self.price_repository.get_current_price(symbol, fetchers[symbol])
+
+        total = self.asset_manager.value_positions(
+            positions, get_price, valuation_date=today, target_currency=currency,
+        )
+        snapshot = PortfolioSnapshot(
+            user=user,
+            date=today,
+            currency=currency,
+            total_value=_to_cents(total),
+            total_invested=state.total_invested,
+        )
+        self._save_snapshots(user, currency, [snapshot])
+        if state.last_date != today:
+            state.last_date = today
+            state.save(update_fields=["last_date", "updated_at"])
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _save_snapshots(
+        user: User,
+        currency: str,
+        snapshots: List[PortfolioSnapshot],
+        only_changed: bool = False,
+    ) -> int:
+        """
+        Upsert *snapshots* in one transaction using ``bulk_create`` with
+        ``update_conflicts`` on the (user, date, currency) unique key.
+
+        When *only_changed* is set, existing rows in the range are loaded with
+        one query and snapshots whose values are unchanged are skipped.
+        Returns the number of rows written.
+        """
+        if not snapshots:
+            return 0
+        to_write = snapshots
+        if only_changed:
+            existing = {
+                day: (total_value, total_invested)
+                for day, total_value, total_invested in PortfolioSnapshot.objects.filter(
+                    user=user,
+                    currency=currency,
+                    date__gte=snapshots[0].date,
+                    date__lte=snapshots[-1].date,
+                ).values_list("date", "total_value", "total_invested")
+            }
+            to_write = [
+                snap for snap in snapshots
+                if existing.get(snap.date) != (snap.total_value, snap.total_invested)
+            ]
+            if not to_write:
+                return 0
+        with transaction.atomic():
+            PortfolioSnapshot.objects.bulk_create(
+                to_write,
+                batch_size=SNAPSHOT_BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["user", "date", "currency"],
+                update_fields=["total_value", "total_invested"],
+            )
+        return len(to_write)
+
+    @staticmethod
+    def _save_state(
+        user: User,
+        currency: str,
+        last_date: date,
+        positions: Dict[int, Tuple[float, Optional[date]]],
+        total_invested: Decimal,
+    ) -> None:
+        """
+        Persist the running state at *last_date*. A build that ends before the
+        stored state (e.g. a historical range) leaves the state untouched.
+        """
+        state = PortfolioSnapshotState.objects.filter(user=user, currency=currency).first()
+        if state is not None and state.last_date > last_date:
+            return
+        if state is None:
+            state = PortfolioSnapshotState(user=user, currency=currency)
+        state.last_date = last_date
+        state.total_invested = _to_cents(total_invested)
+        state.positions = {
+            str(pid): {
+                "quantity": qty,
+                "purchase_date": pdate.isoformat() if pdate else None,
+            }
+            for pid, (qty, pdate) in positions.items()
+            if qty > 0
+        }
+        state.save()
+
+    # ------------------------------------------------------------------
+    # Vectorized engine: days x assets matrices
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _day_index(tx_date: date, start_date: date) -> int:
+        """Row of *tx_date* in a matrix starting at *start_date*; earlier dates fold into row 0."""
+        return max((tx_date - start_date).days, 0)
+
+    def _build_quantity_matrix(
+        self,
+        transactions: list,
+        start_date: date,
+        n_days: int,
+    ) -> Tuple[list, np.ndarray]:
+        """
+        Build a ``days x assets`` matrix of quantities held at the end of each day.
+
+        Each transaction contributes a signed delta on its day (transactions
+        before *start_date* contribute to the first row); a cumulative sum
+        along the day axis turns deltas into positions.
+
+        Returns ``(assets, quantities)`` where column *j* belongs to ``assets[j]``.
+        """
+        columns: Dict[int, int] = {}
+        assets: list = []
+        for tx in transactions:
+            if tx.product_id not in columns:
+                columns[tx.product_id] = len(assets)
+                assets.append(tx.product)
+
+        deltas = np.zeros((n_days, len(assets)), dtype=float)
+        for tx in transactions:
+            sign = 1.0 if tx.transactionType == Transactions.transaction_type.BUY else -1.0
+            deltas[self._day_index(tx.date, start_date), columns[tx.product_id]] += sign * tx.quantity
+        return assets, np.cumsum(deltas, axis=0)
+
+    @staticmethod
+    def _build_price_matrix(
+        assets: list,
+        historical_prices: Dict[str, PriceSeries],
+        days: List[date],
+    ) -> np.ndarray:
+        """
+        Build a forward-filled ``days x assets`` price matrix.
+
+        Each cell holds the close on that day or the most recent earlier close;
+        ``NaN`` when no earlier price exists or the asset is not priced by
+        symbol (bonds).
+        """
+        prices = np.full((len(days), len(assets)), np.nan)
+        for j, asset in enumerate(assets):
+            series = historical_prices.get(asset.symbol) if asset.symbol else None
+            if series is None or series.empty:
+                continue
+            prices[:, j] = series.asof_many(days)
+        return prices
+
+    @staticmethod
+    def _first_buy_dates(transactions: list) -> Dict[int, date]:
+        """Return ``asset.id -> date of first BUY`` (needed for bond interest accrual)."""
+        first: Dict[int, date] = {}
+        for tx in transactions:
+            if tx.transactionType == Transactions.transaction_type.BUY:
+                first.setdefault(tx.product_id, tx.date)
+        return first
+
+    def _build_invested_series(
+        self,
+        transactions: list,
+        start_date: date,
+        n_days: int,
+        currency: str,
+    ) -> List[Decimal]:
+        """
+        Running net cash invested per day (BUY adds, SELL subtracts), in *currency*.
+
+        Each transaction amount is converted at the FX rate of its own date
+        (all amounts in one vectorized call), not at today's spot rate.
+        """
+        if not transactions:
+            return [Decimal("0")] * n_days
+        amounts = self.asset_manager.currency_converter.convert_many(
+            [tx.price * tx.quantity for tx in transactions],
+            [tx.currency or self.asset_manager._get_native_currency(tx.product) for tx in transactions],
+            [tx.date for tx in transactions],
+            currency,
+        )
+        flows = [Decimal("0")] * n_days
+        for tx, amount in zip(transactions, amounts):
+            amount = Decimal(str(amount))
+            if tx.transactionType != Transactions.transaction_type.BUY:
+                amount = -amount
+            flows[self._day_index(tx.date, start_date)] += amount
+        return list(accumulate(flows))
+
     # ------------------------------------------------------------------
     # Historical price fetching (delegates to dedicated fetchers)
     # ------------------------------------------------------------------
@@ -159,25 +426,24 @@ class PortfolioSnapshotService:
         crypto_symbols: List[str],
         start_date: date,
         end_date: date,
-    ) -> Dict[str, pd.Series]:
+    ) -> Dict[str, PriceSeries]:
         """
-        Fetch historical prices via PriceRepository (DB + fetcher fallback).
-        Returns a dict symbol -> pd.Series (date index, close prices) for use with _get_price_at_date.
+        Fetch historical prices via PriceRepository (DB + fetcher fallback,
+        shared across users through the repository's series cache), starting
+        PRICE_LOOKBACK_DAYS before *start_date*.
+        Returns a dict symbol -> PriceSeries (sorted closes with as-of lookups).
         """
-        result: Dict[str, pd.Series] = {}
+        result: Dict[str, PriceSeries] = {}
         repo = self.price_repository
+        start_date = start_date - timedelta(days=PRICE_LOOKBACK_DAYS)
 
-        for symbol in stock_symbols:
-            prices = repo.get_price_history(
-                symbol, start_date, end_date, self.stock_data_fetcher,
-            )
-            result[symbol] = _price_dict_to_series(prices)
-
-        for symbol in crypto_symbols:
-            prices = repo.get_price_history(
-                symbol, start_date, end_date, self.crypto_data_fetcher,
-            )
-            result[symbol] = _price_dict_to_series(prices)
+        for symbols, fetcher in (
+            (stock_symbols, self.stock_data_fetcher),
+            (crypto_symbols, self.crypto_data_fetcher),
+        ):
+            if not symbols:
+                continue
+            result.update(repo.get_price_series_batch(symbols, start_date, end_date, fetcher))
 
         return result
 
@@ -231,27 +497,12 @@ class PortfolioSnapshotService:
 
     @staticmethod
     def _get_price_at_date(
-        price_series: Optional[pd.Series],
+        price_series: Optional[Union[PriceSeries, pd.Series]],
         target_date: date,
     ) -> Optional[float]:
         """Return the Close price on *target_date* or the most recent earlier price."""
         if price_series is None or price_series.empty:
             return None
-
-        # Use date-only comparison to avoid "Invalid comparison between dtype=datetime64 and date"
-        def index_as_date(i):
-            return i.date() if hasattr(i, "date") else i
-
-        index_dates = [index_as_date(i) for i in price_series.index]
-        if target_date in index_dates:
-            pos = index_dates.index(target_date)
-            val = price_series.iloc[pos]
-            if pd.notna(val):
-                return float(val)
-
-        earlier_mask = [d <= target_date for d in index_dates]
-        if not any(earlier_mask):
-            return None
-        earlier = price_series.loc[earlier_mask]
-        val = earlier.iloc[-1]
-        return float(val) if pd.notna(val) else None
+        if not isinstance(price_series, PriceSeries):
+            price_series = PriceSeries.from_series(price_series)
+        return price_series.asof(target_date)
@@ -0,0 +1,163 @@
+"""
+Background refresh of prices for symbols held in any portfolio.
+
+``PriceRefreshScheduler`` keeps CurrentPrice and recent PriceHistory warm for
+every stock and crypto asset with an open ``UserAsset`` position, so request
+paths rarely reach the provider. Each pass batch-refreshes current prices
+(one provider call per asset type) and appends missing daily closes via the
+PriceRepository coverage index. Passes repeat every ``interval`` seconds
+plus random jitter; after a failed pass (provider errors, or a pass that
+raised, e.g. on a lost DB connection) the delay doubles up to ``max_backoff``.
+"""
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from base.infrastructure.db import PriceRepository
+from base.infrastructure.interfaces.market_data_fetcher import CryptoDataFetcher, StockDataFetcher
+from base.models import Asset
+from base.services import get_default_crypto_fetcher, get_default_stock_fetcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 300.0
+DEFAULT_REFRESH_JITTER = 30.0
+DEFAULT_REFRESH_MAX_BACKOFF = 3600.0
+DEFAULT_HISTORY_DAYS = 7
+
+
+@dataclass
+class RefreshResult:
+    """Outcome of one refresh pass."""
+
+    symbols: int = 0
+    prices: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class PriceRefreshScheduler:
+    """Periodically refresh current prices and daily closes of held symbols."""
+
+    def __init__(
+        self,
+        price_repository: Optional[PriceRepository] = None,
+        stock_data_fetcher: Optional[StockDataFetcher] = None,
+        crypto_data_fetcher: Optional[CryptoDataFetcher] = None,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+        history_days: Optional[int] = None,
+        extra_symbols: Optional[List[str]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.price_repository = price_repository if price_repository is not None else PriceRepository()
+        self.fetchers = {
+            Asset.AssetType.STOCKS: stock_data_fetcher or get_default_stock_fetcher(),
+            Asset.AssetType.CRYPTOCURRENCIES: crypto_data_fetcher or get_default_crypto_fetcher(),
+        }
+        self.interval = _setting(interval, "PRICE_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL)
+        self.jitter = _setting(jitter, "PRICE_REFRESH_JITTER", DEFAULT_REFRESH_JITTER)
+        self.max_backoff = _setting(max_backoff, "PRICE_REFRESH_MAX_BACKOFF", DEFAULT_REFRESH_MAX_BACKOFF)
+        self.history_days = int(_setting(history_days, "PRICE_REFRESH_HISTORY_DAYS", DEFAULT_HISTORY_DAYS))
+        self.extra_symbols = list(extra_symbols or [])
+        self.sleep = sleep
+        self.failures = 0
+        self._unknown_symbols: set = set()
+
+    def held_assets(self) -> Dict[str, Dict[str, Asset]]:
+        """``asset_type -> {symbol: Asset}`` for refreshable assets with an open position."""
+        assets = Asset.objects.filter(
+            userasset__quantity__gt=0,
+            asset_type__in=list(self.fetchers),
+            symbol__isnull=False,
+        ).exclude(symbol="").distinct()
+        by_type: Dict[str, Dict[str, Asset]] = {t: {} for t in self.fetchers}
+        for asset in assets:
+            by_type[asset.asset_type][asset.symbol] = asset
+        if self.extra_symbols:
+            found = set()
+            for asset in Asset.objects.filter(symbol__in=self.extra_symbols, asset_type__in=list(self.fetchers)):
+                by_type[asset.asset_type].setdefault(asset.symbol, asset)
+                found.add(asset.symbol)
+            unknown = set(self.extra_symbols) - found
+            if unknown and unknown != self._unknown_symbols:
+                logger.warning(
+                    "Skipping extra symbol(s) without a stock or crypto Asset row: %s",
+                    ", ".join(sorted(unknown)),
+                )
+            self._unknown_symbols = unknown
+        return by_type
+
+    def refresh_once(self, today: Optional[date] = None) -> RefreshResult:
+        """Run one pass over all held symbols; provider errors are collected, not raised."""
+        today = today or date.today()
+        history_start = today - timedelta(days=self.history_days)
+        result = RefreshResult()
+        for asset_type, assets in self.held_assets().items():
+            if not assets:
+                continue
+            symbols = sorted(assets)
+            fetcher = self.fetchers[asset_type]
+            result.symbols += len(symbols)
+            try:
+                quotes = self.price_repository.refresh_current_quotes(symbols, fetcher, assets)
+            except Exception as e:
+                logger.warning("Refreshing %s current prices failed: %s", asset_type, e)
+                result.errors.append(f"{asset_type} current prices: {e}")
+                continue
+            if not quotes:
+                result.errors.append(f"{asset_type} current prices: no data")
+            result.prices += len(quotes)
+            try:
+                self.price_repository.get_price_history_batch(
+                    symbols, history_start, today, fetcher, assets, raise_errors=True,
+                )
+            except Exception as e:
+                logger.warning("Refreshing %s daily closes failed: %s", asset_type, e)
+                result.errors.append(f"{asset_type} daily closes: {e}")
+        return result
+
+    def next_delay(self, result: RefreshResult) -> float:
+        """Seconds to wait before the next pass: backoff after failures, plus jitter."""
+        self.failures = 0 if result.ok else self.failures + 1
+        delay = min(self.interval * (2 ** self.failures), max(self.max_backoff, self.interval))
+        return delay + random.uniform(0, self.jitter)
+
+    def run(self, iterations: Optional[int] = None) -> None:
+        """
+        Refresh forever (or *iterations* times), sleeping between passes. A pass
+        that raises is logged and backed off like any other failed pass.
+        """
+        done = 0
+        while iterations is None or done < iterations:
+            # Drop connections the database closed while we slept
+            close_old_connections()
+            try:
+                result = self.refresh_once()
+            except Exception as e:
+                logger.exception("Price refresh pass failed")
+                result = RefreshResult(errors=[f"pass: {e}"])
+            done += 1
+            logger.info(
+                "Price refresh: %d symbol(s), %d price(s), %d error(s)",
+                result.symbols, result.prices, len(result.errors),
+            )
+            if iterations is not None and done >= iterations:
+                break
+            self.sleep(self.next_delay(result))
+
+
+def _setting(value, name: str, default):
+    if value is not None:
+        return value
+    return getattr(settings, name, default)
@@ -0,0 +1,225 @@
+"""
+Batch snapshot generation for many users (nightly ``generate_snapshots``).
+
+``plan_snapshot_jobs`` resolves each user's date range with one query,
+``prewarm_snapshot_caches`` fills PriceHistory/FXRate once for the union of
+all users' symbols and currencies, and ``build_snapshot_shard`` builds a shard
+of users in date chunks. Shards are independent, so they can run in worker
+processes with their own DB connections (see ``run_snapshot_shards``).
+"""
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import Min
+
+from base.models import Asset
+from portfolio.models import Transactions
+from .portfolio_snapshots import PRICE_LOOKBACK_DAYS, PortfolioSnapshotService
+
+logger = logging.getLogger(__name__)
+
+# (user_id, start_date, end_date)
+SnapshotJob = Tuple[int, date, date]
+
+
+@dataclass
+class ShardResult:
+    """Totals of one shard (or of a whole run, via ``merge``)."""
+
+    users: int = 0
+    rows: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def merge(self, other: "ShardResult") -> None:
+        self.users += other.users
+        self.rows += other.rows
+        self.errors.extend(other.errors)
+
+
+def plan_snapshot_jobs(
+    target_date: Optional[date] = None,
+    backfill: bool = False,
+) -> List[SnapshotJob]:
+    """
+    One ``(user_id, start, end)`` per user with transactions: the user's first
+    transaction date to today when *backfill*, else *target_date* only.
+    """
+    today = date.today()
+    first_dates = (
+        User.objects.filter(transactions__isnull=False)
+        .annotate(first_tx=Min("transactions__date"))
+        .order_by("id")
+        .values_list("id", "first_tx")
+    )
+    if backfill:
+        return [(user_id, first_tx, today) for user_id, first_tx in first_dates]
+    return [(user_id, target_date, target_date) for user_id, _ in first_dates]
+
+
+def chunk_date_range(start: date, end: date, chunk_days: Optional[int]) -> List[Tuple[date, date]]:
+    """Split [start, end] into consecutive ranges of at most *chunk_days* days."""
+    if not chunk_days or chunk_days <= 0:
+        return [(start, end)]
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=chunk_days - 1), end)
+        chunks.append((start, chunk_end))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def prewarm_snapshot_caches(
+    jobs: List[SnapshotJob],
+    service: PortfolioSnapshotService,
+) -> Tuple[int, int]:
+    """
+    Fill PriceHistory and FXRate once for every symbol and currency any job
+    needs, over the union of the jobs' date ranges, so per-user builds only
+    read the DB. The loaded price series stay in the shared series cache,
+    which covers every job's range and its price lookback (forked workers
+    inherit it).
+    Returns ``(symbols, currency pairs)`` warmed.
+    """
+    if not jobs:
+        return 0, 0
+    start = min(job[1] for job in jobs)
+    end = min(max(job[2] for job in jobs), date.today())
+    user_ids = [job[0] for job in jobs]
+
+    assets = list(Asset.objects.filter(transactions__owner_id__in=user_ids).distinct())
+    symbols = {Asset.AssetType.STOCKS: [], Asset.AssetType.CRYPTOCURRENCIES: []}
+    for asset in assets:
+        if asset.symbol and asset.asset_type in symbols:
+            symbols[asset.asset_type].append(asset.symbol)
+    fetchers = {
+        Asset.AssetType.STOCKS: service.stock_data_fetcher,
+        Asset.AssetType.CRYPTOCURRENCIES: service.crypto_data_fetcher,
+    }
+    for asset_type, type_symbols in symbols.items():
+        if type_symbols:
+            service.price_repository.get_price_series_batch(
+                type_symbols, start - timedelta(days=PRICE_LOOKBACK_DAYS), end, fetchers[asset_type],
+            )
+
+    asset_manager = service.asset_manager
+    currencies = {asset_manager._get_native_currency(asset) for asset in assets}
+    currencies.update(
+        Transactions.objects.filter(owner_id__in=user_ids)
+        .exclude(currency__isnull=True).exclude(currency="")
+        .values_list("currency", flat=True).distinct()
+    )
+    currencies.discard(service.currency)
+    for currency in sorted(currencies):
+        asset_manager.currency_converter.get_rate_series(currency, service.currency, start, end)
+    return sum(len(s) for s in symbols.values()), len(currencies)
+
+
+def build_snapshot_shard(
+    jobs: List[SnapshotJob],
+    currency: str = "PLN",
+    only_changed: bool = False,
+    chunk_days: Optional[int] = None,
+    service: Optional[PortfolioSnapshotService] = None,
+) -> ShardResult:
+    """Build snapshots for every job in *jobs*, each range in chunks of *chunk_days*."""
+    service = service or PortfolioSnapshotService(currency=currency)
+    users = User.objects.in_bulk([job[0] for job in jobs])
+    result = ShardResult()
+    for user_id, start, end in jobs:
+        user = users.get(user_id)
+        if user is None:
+            continue
+        try:
+            for chunk_start, chunk_end in chunk_date_range(start, end, chunk_days):
+                result.rows += len(service.build_snapshots_for_user(
+                    user, chunk_start, chunk_end, currency=currency, only_changed=only_changed,
+                ))
+            result.users += 1
+        except Exception as exc:
+            logger.exception("Snapshot build failed for user %s", user_id)
+            result.errors.append(f"{user.username}: {exc}")
+    return result
+
+
+def _init_worker() -> None:
+    """Process-pool initializer: set Django up (spawn) and drop inherited connections (fork)."""
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def _build_shard_in_worker(jobs, currency, only_changed, chunk_days) -> ShardResult:
+    try:
+        return build_snapshot_shard(jobs, currency, only_changed, chunk_days)
+    finally:
+        connections.close_all()
+
+
+def shard_jobs(jobs: List[SnapshotJob], shard_size: int) -> List[List[SnapshotJob]]:
+    """Split *jobs* into shards of at most *shard_size* users."""
+    shard_size = max(shard_size, 1)
+    return [jobs[i:i + shard_size] for i in range(0, len(jobs), shard_size)]
+
+
+def run_snapshot_shards(
+    shards: Iterable[List[SnapshotJob]],
+    workers: int,
+    currency: str = "PLN",
+    only_changed: bool = False,
+    chunk_days: Optional[int] = None,
+    on_shard_done: Optional[Callable[[ShardResult], None]] = None,
+) -> ShardResult:
+    """
+    Build all *shards*, in-process when *workers* <= 1, else on a pool of
+    *workers* processes, each with its own DB connection.
+    """
+    total = ShardResult()
+    shards = list(shards)
+    if workers <= 1:
+        service = PortfolioSnapshotService(currency=currency)
+        for shard in shards:
+            result = build_snapshot_shard(shard, currency, only_changed, chunk_days, service=service)
+            total.merge(result)
+            if on_shard_done:
+                on_shard_done(result)
+        return total
+
+    # Children must not share the parent's open DB connections
+    connections.close_all()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_build_shard_in_worker, shard, currency, only_changed, chunk_days)
+            for shard in shards
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            total.merge(result)
+            if on_shard_done:
+                on_shard_done(result)
+    return total
+
+
+class Throughput:
+    """Wall-clock rates for progress reports."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.monotonic() - self.started, 1e-9)
+
+    def format(self, result: ShardResult) -> str:
+        return (
+            f"{result.users} user(s), {result.rows} snapshot row(s) in {self.elapsed:.1f}s "
+            f"({result.users / self.elapsed:.1f} users/s, {result.rows / self.elapsed:.1f} rows/s)"
+        )
@@ -3,6 +3,12 @@ Import transactions from normalized rows produced by infrastructure parsers.
 
 Parsers (per broker / file format) map source data into ``NormalizedTransactionImportRow``;
 this module validates, resolves assets and prices, persists ``Transactions``, and updates positions.
+
+Imports are set-based: each step runs once for all rows (one external_id
+query, one asset query plus a bulk create, one batched price-history load,
+one bulk insert, one position update per touched asset), so the number of
+queries does not grow with the number of rows. Streaming parsers feed
+``import_normalized_transaction_chunks`` one chunk at a time instead.
 """
 from __future__ import annotations
 
@@ -10,21 +16,26 @@ import logging
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
-from typing import List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from django.contrib.auth.models import User
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import serializers
 
+from base.models import Asset
+from base.serializers import AssetSerializer
 from portfolio.models import Transactions
-from portfolio.services.asset_manager import AssetManager
-from portfolio.services.currency_converter import CurrencyConverter
+from portfolio.services.container import get_service_container
 from portfolio.services.portfolio_snapshots import PortfolioSnapshotService
 from portfolio.services.transaction_service import (
     get_or_create_asset,
     get_target_currency_for_user,
+    new_asset_data,
     resolve_price_for_date,
+    resolve_prices_for_dates,
     update_user_asset,
+    update_user_assets_bulk,
 )
 
 logger = logging.getLogger(__name__)
@@ -134,10 +145,10 @@ def _finalize_price_and_currency(
     tx_currency: Optional[str] = None
     if resolved_from_api and resolved is not None and resolved > 0:
         target_currency = get_target_currency_for_user(user)
-        asset_manager = AssetManager(default_currency=target_currency)
-        native_currency = asset_manager._get_native_currency(asset)
+        services = get_service_container()
+        native_currency = services.asset_manager(target_currency)._get_native_currency(asset)
         if native_currency != target_currency:
-            converter = CurrencyConverter()
+            converter = services.currency_converter
             converted = converter.convert(
                 Decimal(str(resolved)), native_currency, target_currency
             )
@@ -250,34 +261,279 @@ def _process_single_import_row(
     )
 
 
-def _rebuild_snapshots_after_import(
-    user: User,
+def _min_created_trade_date(
     result: TransactionImportResult,
     rows: Sequence[NormalizedTransactionImportRow],
-    *,
-    rebuild_snapshots: bool,
-) -> None:
-    if not rebuild_snapshots or result.created_count == 0:
-        return
+) -> Optional[date]:
     min_trade_date: Optional[date] = None
     for row, outcome in zip(rows, result.outcomes):
         if outcome.status != "created":
             continue
         if min_trade_date is None or row.trade_date < min_trade_date:
             min_trade_date = row.trade_date
+    return min_trade_date
+
+
+def _rebuild_snapshots_from(user: User, min_trade_date: Optional[date]) -> None:
     if min_trade_date is None:
         return
     try:
         service = PortfolioSnapshotService()
-        service.build_snapshots_for_user(
-            user=user,
-            start_date=min_trade_date,
-            end_date=date.today(),
-        )
+        service.apply_transaction_change(user, min_trade_date)
     except Exception:
         logger.exception("Snapshot rebuild failed after transaction import")
 
 
+# (symbol or name lookup, value, asset_type) identifying an asset to find or create
+_AssetKey = Tuple[str, str, str]
+
+
+def _asset_key(row: NormalizedTransactionImportRow) -> _AssetKey:
+    asset_type = row.asset_type or Asset.AssetType.STOCKS
+    if row.symbol:
+        return ("symbol", row.symbol, asset_type)
+    return ("name", row.name, asset_type)
+
+
+def _create_assets(
+    keys: Dict[_AssetKey, NormalizedTransactionImportRow],
+) -> Dict[_AssetKey, Union[Asset, str]]:
+    """
+    Validate and create one asset per key (AssetSerializer rules) with a bulk
+    insert. Keys whose symbol another key in the batch also creates are left
+    to get_or_create_asset afterwards, so the unique symbol rule reports them.
+    Returns ``key -> Asset`` or ``key -> error message``.
+    """
+    resolved: Dict[_AssetKey, Union[Asset, str]] = {}
+    to_create: Dict[_AssetKey, Asset] = {}
+    deferred: List[_AssetKey] = []
+    claimed_symbols = set()
+    for key, row in keys.items():
+        if row.symbol and row.symbol in claimed_symbols:
+            deferred.append(key)
+            continue
+        serializer = AssetSerializer(data=new_asset_data(
+            symbol=row.symbol,
+            name=row.name,
+            asset_type=row.asset_type,
+            bond_type=row.bond_type,
+            bond_series=row.bond_series,
+            maturity_date=row.maturity_date,
+            interest_rate_type=row.interest_rate_type,
+            interest_rate=row.interest_rate,
+            wibor_margin=row.wibor_margin,
+            inflation_margin=row.inflation_margin,
+            base_interest_rate=row.base_interest_rate,
+            face_value=row.face_value,
+        ))
+        if not serializer.is_valid():
+            resolved[key] = str(serializers.ValidationError({"asset": serializer.errors}).detail)
+            continue
+        if row.symbol:
+            claimed_symbols.add(row.symbol)
+        to_create[key] = Asset(**serializer.validated_data)
+
+    if to_create:
+        created = Asset.objects.bulk_create(list(to_create.values()))
+        resolved.update(zip(to_create, created))
+    for key in deferred:
+        row = keys[key]
+        try:
+            resolved[key] = get_or_create_asset(symbol=row.symbol, name=row.name, asset_type=row.asset_type)
+        except serializers.ValidationError as e:
+            resolved[key] = str(e.detail) if hasattr(e, "detail") else str(e)
+    return resolved
+
+
+def _resolve_assets(
+    rows: List[NormalizedTransactionImportRow],
+) -> List[Union[Asset, str]]:
+    """
+    Asset (or error message) for each row, like get_or_create_asset: by
+    product_id when it exists, else by symbol (or name) and asset_type,
+    creating missing assets. One lookup query plus one bulk insert.
+    """
+    by_id = Asset.objects.in_bulk({row.product_id for row in rows if row.product_id})
+    lookup_rows = [row for row in rows if by_id.get(row.product_id) is None]
+    symbols = {row.symbol for row in lookup_rows if row.symbol}
+    names = {row.name for row in lookup_rows if not row.symbol and row.name}
+
+    found: Dict[_AssetKey, Asset] = {}
+    if symbols or names:
+        for asset in Asset.objects.filter(Q(symbol__in=symbols) | Q(name__in=names)).order_by("id"):
+            if asset.symbol in symbols:
+                found.setdefault(("symbol", asset.symbol, asset.asset_type), asset)
+            if asset.name in names:
+                found.setdefault(("name", asset.name, asset.asset_type), asset)
+
+    missing: Dict[_AssetKey, NormalizedTransactionImportRow] = {}
+    for row in lookup_rows:
+        key = _asset_key(row)
+        if key not in found:
+            missing.setdefault(key, row)
+    resolved: Dict[_AssetKey, Union[Asset, str]] = {**found, **_create_assets(missing)}
+
+    return [
+        by_id[row.product_id] if by_id.get(row.product_id) is not None else resolved[_asset_key(row)]
+        for row in rows
+    ]
+
+
+def _resolve_prices(
+    user: User,
+    rows: List[NormalizedTransactionImportRow],
+    assets: List[Asset],
+    *,
+    stock_fetcher=None,
+    crypto_fetcher=None,
+) -> List[Tuple[Optional[float], Optional[str]]]:
+    """
+    Batched _finalize_price_and_currency: ``(price, currency from resolution)``
+    per row. Missing stock/crypto prices come from one resolve_prices_for_dates
+    call; market prices are converted to the user's snapshot currency.
+    """
+    given: List[Optional[float]] = []
+    requests = {}
+    for i, (row, asset) in enumerate(zip(rows, assets)):
+        price: Optional[float] = None
+        if row.price is not None:
+            try:
+                price = float(row.price)
+            except (TypeError, ValueError):
+                price = None
+        given.append(price)
+        symbol = row.symbol or asset.symbol
+        asset_type = row.asset_type or asset.asset_type
+        if (price is None or price <= 0) and symbol and asset_type in ("stocks", "cryptocurrencies"):
+            requests[i] = (symbol, asset_type, row.trade_date)
+
+    market = resolve_prices_for_dates(
+        requests.values(), stock_fetcher=stock_fetcher, crypto_fetcher=crypto_fetcher,
+    ) if requests else {}
+
+    results: List[Tuple[Optional[float], Optional[str]]] = [(price, None) for price in given]
+    priced = {i: market.get(request) for i, request in requests.items()}
+    priced = {i: price for i, price in priced.items() if price is not None and price > 0}
+    if not priced:
+        return results
+
+    target_currency = get_target_currency_for_user(user)
+    services = get_service_container()
+    asset_manager = services.asset_manager(target_currency)
+    converter = services.currency_converter
+    rates: Dict[str, Optional[Decimal]] = {}
+    for i, price in priced.items():
+        native_currency = asset_manager._get_native_currency(assets[i])
+        if native_currency != target_currency:
+            if native_currency not in rates:
+                rates[native_currency] = converter.get_exchange_rate(native_currency, target_currency)
+            rate = rates[native_currency]
+            if rate is not None:
+                price = float(Decimal(str(price)) * rate)
+        results[i] = (price, target_currency)
+    return results
+
+
+def _import_rows(
+    user: User,
+    rows: Sequence[NormalizedTransactionImportRow],
+    *,
+    stock_fetcher=None,
+    crypto_fetcher=None,
+) -> TransactionImportResult:
+    """Validate, dedupe, resolve and bulk-insert *rows*; same outcomes as importing row by row."""
+    outcomes: List[Optional[TransactionImportRowOutcome]] = [None] * len(rows)
+    external_ids = [_normalize_external_id(row.external_id) for row in rows]
+    imported = set(
+        Transactions.objects.filter(
+            owner=user, external_id__in={e for e in external_ids if e},
+        ).values_list("external_id", flat=True)
+    )
+
+    accepted: List[Tuple[int, str]] = []
+    for i, row in enumerate(rows):
+        idx = row.source_row_index
+        try:
+            tx_type = _coerce_transaction_type(row.transaction_type)
+        except ValueError as e:
+            outcomes[i] = TransactionImportRowOutcome(source_row_index=idx, status="error", message=str(e))
+            continue
+        if row.quantity is None or row.quantity <= 0:
+            outcomes[i] = TransactionImportRowOutcome(
+                source_row_index=idx, status="error", message="quantity must be positive",
+            )
+            continue
+        if external_ids[i] and external_ids[i] in imported:
+            outcomes[i] = TransactionImportRowOutcome(
+                source_row_index=idx, status="skipped_duplicate", message="external_id already imported",
+            )
+            continue
+        if not (row.product_id or row.symbol or row.name):
+            outcomes[i] = TransactionImportRowOutcome(
+                source_row_index=idx, status="error", message="product_id, symbol, or name is required",
+            )
+            continue
+        accepted.append((i, tx_type))
+
+    accepted_rows = [rows[i] for i, _ in accepted]
+    assets = _resolve_assets(accepted_rows)
+    valid = []
+    for (i, tx_type), row, asset in zip(accepted, accepted_rows, assets):
+        if isinstance(asset, str):
+            outcomes[i] = TransactionImportRowOutcome(
+                source_row_index=row.source_row_index, status="error", message=asset,
+            )
+        elif external_ids[i] and external_ids[i] in imported:
+            # Repeats an id of an earlier valid row in the same file
+            outcomes[i] = TransactionImportRowOutcome(
+                source_row_index=row.source_row_index, status="skipped_duplicate",
+                message="external_id already imported",
+            )
+        else:
+            if external_ids[i]:
+                imported.add(external_ids[i])
+            valid.append((i, tx_type, row, asset))
+
+    prices = _resolve_prices(
+        user, [v[2] for v in valid], [v[3] for v in valid],
+        stock_fetcher=stock_fetcher, crypto_fetcher=crypto_fetcher,
+    )
+    pending = [
+        (i, Transactions(
+            owner=user,
+            product=asset,
+            transactionType=tx_type,
+            quantity=float(row.quantity),
+            price=price if price is not None else 0.0,
+            date=row.trade_date,
+            currency=row.currency or resolved_currency,
+            external_id=external_ids[i],
+        ))
+        for (i, tx_type, row, asset), (price, resolved_currency) in zip(valid, prices)
+    ]
+
+    if pending:
+        try:
+            with transaction.atomic():
+                created = Transactions.objects.bulk_create([tx for _, tx in pending])
+        except IntegrityError:
+            # An external_id was imported concurrently: fall back to row-by-row inserts
+            created = None
+        if created is not None:
+            update_user_assets_bulk(user, created)
+            for (i, _), tx in zip(pending, created):
+                outcomes[i] = TransactionImportRowOutcome(
+                    source_row_index=rows[i].source_row_index, status="created", transaction_id=tx.id,
+                )
+        else:
+            for i, _ in pending:
+                outcomes[i] = _process_single_import_row(
+                    user, rows[i], stock_fetcher=stock_fetcher, crypto_fetcher=crypto_fetcher,
+                )
+
+    return TransactionImportResult(outcomes=outcomes)
+
+
 def import_normalized_transactions(
     user: User,
     rows: Sequence[NormalizedTransactionImportRow],
@@ -290,18 +546,48 @@ def import_normalized_transactions(
     Persist normalized import rows for ``user`` in order.
 
     Rows with ``external_id`` already present for this user are skipped (idempotent re-import).
+    All rows are processed in set-based passes (see module docstring).
+    """
+    result = _import_rows(
+        user, rows, stock_fetcher=stock_fetcher, crypto_fetcher=crypto_fetcher,
+    )
+    if rebuild_snapshots:
+        _rebuild_snapshots_from(user, _min_created_trade_date(result, rows))
+    return result
+
+
+def import_normalized_transaction_chunks(
+    user: User,
+    chunks: Iterable[Sequence[NormalizedTransactionImportRow]],
+    *,
+    rebuild_snapshots: bool = True,
+    stock_fetcher=None,
+    crypto_fetcher=None,
+    on_chunk: Optional[Callable[[TransactionImportResult], None]] = None,
+) -> TransactionImportResult:
+    """
+    Persist rows arriving in chunks (e.g. from a streaming parser) for ``user``.
+
+    Each chunk is imported and committed before the next one is pulled, so only
+    one chunk of rows is held at a time and rows are saved while the source is
+    still being read. Snapshots are rebuilt once, from the earliest created trade,
+    also when a later chunk fails (rows of earlier chunks stay saved).
+    ``on_chunk`` is called with the running result after each chunk (progress).
     """
     result = TransactionImportResult()
-    for row in rows:
-        result.outcomes.append(
-            _process_single_import_row(
-                user,
-                row,
-                stock_fetcher=stock_fetcher,
-                crypto_fetcher=crypto_fetcher,
+    min_trade_date: Optional[date] = None
+    try:
+        for rows in chunks:
+            chunk_result = _import_rows(
+                user, rows, stock_fetcher=stock_fetcher, crypto_fetcher=crypto_fetcher,
             )
-        )
-    _rebuild_snapshots_after_import(
-        user, result, rows, rebuild_snapshots=rebuild_snapshots
-    )
+            result.outcomes.extend(chunk_result.outcomes)
+            chunk_min = _min_created_trade_date(chunk_result, rows)
+            if chunk_min is not None and (min_trade_date is None or chunk_min < min_trade_date):
+                min_trade_date = chunk_min
+            if on_chunk is not None:
+                on_chunk(result)
+    finally:
+        if rebuild_snapshots:
+            _rebuild_snapshots_from(user, min_trade_date)
     return result
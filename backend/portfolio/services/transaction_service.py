@@ -1,6 +1,7 @@
+from collections import defaultdict
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 from rest_framework import serializers
@@ -9,8 +10,9 @@ from base.infrastructure.db import PriceRepository
 from base.models import Asset
 from base.serializers import AssetSerializer
 from base.services import get_default_stock_fetcher, get_default_crypto_fetcher
+from base.services.price_series import PriceSeries
 from portfolio.models import UserAsset, PortfolioSnapshot, Transactions
-from portfolio.services.asset_manager import AssetManager
+from portfolio.services.container import get_service_container
 
 
 def get_or_create_asset(
@@ -51,32 +53,20 @@ def get_or_create_asset(
             ).first()
 
         if not asset:
-            asset_data = {
-                'name': name,
-                'asset_type': asset_type or Asset.AssetType.STOCKS
-            }
-            if symbol:
-                asset_data['symbol'] = symbol
-            if asset_type == 'bonds':
-                if bond_type:
-                    asset_data['bond_type'] = bond_type
-                if bond_series:
-                    asset_data['bond_series'] = bond_series
-                if maturity_date:
-                    asset_data['maturity_date'] = maturity_date
-                if interest_rate_type:
-                    asset_data['interest_rate_type'] = interest_rate_type
-                if interest_rate is not None:
-                    asset_data['interest_rate'] = interest_rate
-                if wibor_margin is not None:
-                    asset_data['wibor_margin'] = wibor_margin
-                if inflation_margin is not None:
-                    asset_data['inflation_margin'] = inflation_margin
-                if base_interest_rate is not None:
-                    asset_data['base_interest_rate'] = base_interest_rate
-                if face_value is not None:
-                    asset_data['face_value'] = face_value
-
+            asset_data = new_asset_data(
+                symbol=symbol,
+                name=name,
+                asset_type=asset_type,
+                bond_type=bond_type,
+                bond_series=bond_series,
+                maturity_date=maturity_date,
+                interest_rate_type=interest_rate_type,
+                interest_rate=interest_rate,
+                wibor_margin=wibor_margin,
+                inflation_margin=inflation_margin,
+                base_interest_rate=base_interest_rate,
+                face_value=face_value,
+            )
             asset_serializer = AssetSerializer(data=asset_data)
             if asset_serializer.is_valid():
                 asset = asset_serializer.save()
@@ -91,6 +81,49 @@ def get_or_create_asset(
     return asset
 
 
+def new_asset_data(
+    symbol=None,
+    name=None,
+    asset_type=None,
+    bond_type=None,
+    bond_series=None,
+    maturity_date=None,
+    interest_rate_type=None,
+    interest_rate=None,
+    wibor_margin=None,
+    inflation_margin=None,
+    base_interest_rate=None,
+    face_value=None
+) -> dict:
+    """AssetSerializer input for a new asset (bond fields only for bonds)."""
+    asset_data = {
+        'name': name,
+        'asset_type': asset_type or Asset.AssetType.STOCKS
+    }
+    if symbol:
+        asset_data['symbol'] = symbol
+    if asset_type == 'bonds':
+        if bond_type:
+            asset_data['bond_type'] = bond_type
+        if bond_series:
+            asset_data['bond_series'] = bond_series
+        if maturity_date:
+            asset_data['maturity_date'] = maturity_date
+        if interest_rate_type:
+            asset_data['interest_rate_type'] = interest_rate_type
+        if interest_rate is not None:
+            asset_data['interest_rate'] = interest_rate
+        if wibor_margin is not None:
+            asset_data['wibor_margin'] = wibor_margin
+        if inflation_margin is not None:
+            asset_data['inflation_margin'] = inflation_margin
+        if base_interest_rate is not None:
+            asset_data['base_interest_rate'] = base_interest_rate
+        if face_value is not None:
+            asset_data['face_value'] = face_value
+    return asset_data
+
+
 def get_target_currency_for_user(user) -> str:
     """
     Return the currency to use for this user: from the most recent snapshot,
@@ -106,7 +139,7 @@ def get_target_currency_for_user(user) -> str:
 
 
 def _get_price_at_date(
-    price_series: Optional[pd.Series],
+    price_series: Optional[Union[PriceSeries, pd.Series]],
     target_date: date,
 ) -> Optional[float]:
     """
@@ -115,31 +148,9 @@ def _get_price_at_date(
     """
     if price_series is None or price_series.empty:
         return None
-    # Use date-only comparison to avoid "Invalid comparison between dtype=datetime64 and date"
-    def index_as_date(i):
-        return i.date() if hasattr(i, "date") else i
-
-    index_dates = [index_as_date(i) for i in price_series.index]
-    if target_date in index_dates:
-        pos = index_dates.index(target_date)
-        val = price_series.iloc[pos]
-        if pd.notna(val):
-            return float(val)
-    # Prefer most recent earlier date
-    earlier_mask = [d <= target_date for d in index_dates]
-    if any(earlier_mask):
-        earlier = price_series.loc[earlier_mask]
-        val = earlier.iloc[-1]
-        if pd.notna(val):
-            return float(val)
-    # Fallback: nearest next trading day
-    later_mask = [d > target_date for d in index_dates]
-    if any(later_mask):
-        later = price_series.loc[later_mask]
-        val = later.iloc[0]
-        if pd.notna(val):
-            return float(val)
-    return None
+    if not isinstance(price_series, PriceSeries):
+        price_series = PriceSeries.from_series(price_series)
+    return price_series.asof_or_next(target_date)
 
 
 # Window (calendar days) for historical fetch: before and after target_date
@@ -173,9 +184,48 @@ def resolve_price_for_date(
         prices = repo.get_price_history(symbol, start_date, end_date, crypto_fetcher)
     if not prices:
         return None
-    series = pd.Series({d: float(v) for d, v in prices.items()})
-    series.index = pd.DatetimeIndex(series.index)
-    return _get_price_at_date(series, target_date)
+    return _get_price_at_date(PriceSeries.from_dict(prices), target_date)
+
+
+def resolve_prices_for_dates(
+    requests: Iterable[Tuple[str, str, date]],
+    stock_fetcher=None,
+    crypto_fetcher=None,
+) -> Dict[Tuple[str, str, date], Optional[float]]:
+    """
+    Batched resolve_price_for_date for ``(symbol, asset_type, date)`` requests.
+
+    Prices are loaded with one ``get_price_series_batch`` per asset type over
+    the union of the requests' windows; each request is then answered from its
+    own window exactly like resolve_price_for_date.
+    """
+    requests = list(dict.fromkeys(
+        r for r in requests if r[0] and r[1] in ("stocks", "cryptocurrencies")
+    ))
+    result: Dict[Tuple[str, str, date], Optional[float]] = {}
+    if not requests:
+        return result
+    fetchers = {
+        "stocks": stock_fetcher or get_default_stock_fetcher(),
+        "cryptocurrencies": crypto_fetcher or get_default_crypto_fetcher(),
+    }
+    repo = PriceRepository()
+    by_type: Dict[str, List[Tuple[str, str, date]]] = defaultdict(list)
+    for request in requests:
+        by_type[request[1]].append(request)
+    for asset_type, type_requests in by_type.items():
+        start_date = min(d for _, _, d in type_requests) - timedelta(days=_PRICE_RESOLVE_DAYS_BACK)
+        end_date = max(d for _, _, d in type_requests) + timedelta(days=_PRICE_RESOLVE_DAYS_FORWARD)
+        series = repo.get_price_series_batch(
+            [symbol for symbol, _, _ in type_requests], start_date, end_date, fetchers[asset_type],
+        )
+        for symbol, _, target_date in type_requests:
+            window = series[symbol].between(
+                target_date - timedelta(days=_PRICE_RESOLVE_DAYS_BACK),
+                target_date + timedelta(days=_PRICE_RESOLVE_DAYS_FORWARD),
+            )
+            result[(symbol, asset_type, target_date)] = _get_price_at_date(window, target_date)
+    return result
 
 
 def update_user_asset(transaction):
@@ -191,25 +241,13 @@ def update_user_asset(transaction):
         owner=transaction.owner,
         ownedAsset=transaction.product,
     )
-    am = AssetManager()
-    is_buy = transaction.transactionType == Transactions.transaction_type.BUY
-    delta = transaction.quantity if is_buy else -transaction.quantity
-    new_quantity = max(0.0, (0.0 if created else user_product.quantity) + delta)
-
+    am = get_service_container().asset_manager()
     tx_currency = (
         (transaction.currency or "").strip() or am._get_native_currency(transaction.product)
     )
-
-    if new_quantity <= 0:
-        user_product.quantity = 0.0
-        user_product.average_purchase_price = None
-        user_product.currency = None
-        user_product.save()
-        return user_product
-
-    # Different currency than existing position → full recalc from all transactions
-    existing_currency = (user_product.currency or "").strip()
-    if not created and existing_currency and tx_currency and existing_currency != tx_currency:
+    if not _apply_transaction_to_position(user_product, created, transaction, tx_currency):
+        # Different currency than existing position → full recalc from all transactions
+        new_quantity = _position_quantity_after(user_product, created, transaction)
         cost_basis = am._get_cost_basis(
             transaction.owner, transaction.product, new_quantity
         )
@@ -220,8 +258,35 @@ def update_user_asset(transaction):
             user_product.average_purchase_price = None
             user_product.currency = None
         user_product.quantity = new_quantity
-        user_product.save()
-        return user_product
+    user_product.save()
+    return user_product
+
+
+def _position_quantity_after(user_product, created: bool, transaction) -> float:
+    is_buy = transaction.transactionType == Transactions.transaction_type.BUY
+    delta = transaction.quantity if is_buy else -transaction.quantity
+    return max(0.0, (0.0 if created else user_product.quantity) + delta)
+
+
+def _apply_transaction_to_position(user_product, created: bool, transaction, tx_currency: str) -> bool:
+    """
+    Apply *transaction* to *user_product* in memory (not saved): BUY adds at a
+    weighted average price, SELL only reduces quantity. Returns False, leaving
+    the position untouched, when the transaction's currency differs from the
+    open position's - the caller must then recompute from all transactions.
+    """
+    is_buy = transaction.transactionType == Transactions.transaction_type.BUY
+    new_quantity = _position_quantity_after(user_product, created, transaction)
+
+    if new_quantity <= 0:
+        user_product.quantity = 0.0
+        user_product.average_purchase_price = None
+        user_product.currency = None
+        return True
+
+    existing_currency = (user_product.currency or "").strip()
+    if not created and existing_currency and tx_currency and existing_currency != tx_currency:
+        return False
 
     # Incremental update: BUY = weighted average, SELL = average unchanged
     if is_buy:
@@ -235,8 +300,87 @@ def update_user_asset(transaction):
             buy_cost = Decimal(str(transaction.price)) * buy_qty
             new_qty = prev_qty + buy_qty
             user_product.average_purchase_price = (prev_avg * prev_qty + buy_cost) / new_qty
-    # SELL: average and currency unchanged, only quantity already reduced to new_quantity
+    # SELL: average and currency unchanged, only quantity reduced to new_quantity
 
     user_product.quantity = new_quantity
+    return True
+
+
+def update_user_assets_bulk(owner, transactions: Sequence[Transactions]) -> None:
+    """
+    Apply many new *transactions* of *owner* (in order) to their UserAsset rows:
+    positions are loaded with one query, replayed in memory with the same rules
+    as update_user_asset and written with one bulk create and one bulk update.
+    Assets whose position currency changes are recomputed with
+    recalculate_user_asset.
+    """
+    by_asset: Dict[int, List[Transactions]] = defaultdict(list)
+    for tx in transactions:
+        by_asset[tx.product_id].append(tx)
+    if not by_asset:
+        return
+    existing = {
+        ua.ownedAsset_id: ua
+        for ua in UserAsset.objects.filter(owner=owner, ownedAsset_id__in=list(by_asset))
+    }
+    am = get_service_container().asset_manager()
+    to_create, to_update, to_recalculate = [], [], []
+    for asset_id, asset_transactions in by_asset.items():
+        created = asset_id not in existing
+        user_product = existing.get(asset_id) or UserAsset(
+            owner=owner, ownedAsset=asset_transactions[0].product,
+        )
+        for tx in asset_transactions:
+            tx_currency = (tx.currency or "").strip() or am._get_native_currency(tx.product)
+            if not _apply_transaction_to_position(user_product, created, tx, tx_currency):
+                to_recalculate.append(tx.product)
+                break
+            created = False
+        else:
+            (to_create if asset_id not in existing else to_update).append(user_product)
+
+    if to_create:
+        UserAsset.objects.bulk_create(to_create)
+    if to_update:
+        UserAsset.objects.bulk_update(to_update, ["quantity", "average_purchase_price", "currency"])
+    for asset in to_recalculate:
+        recalculate_user_asset(owner, asset)
+
+
+def recalculate_user_asset(owner, asset):
+    """
+    Recompute the UserAsset for (owner, asset) from all remaining transactions.
+    Used when a transaction is removed, where incremental updates do not apply.
+    """
+    user_product, _ = UserAsset.objects.get_or_create(owner=owner, ownedAsset=asset)
+    quantity = 0.0
+    currency = None
+    for tx_type, tx_quantity, tx_currency in (
+        Transactions.objects.filter(owner=owner, product=asset)
+        .order_by('date', 'id')
+        .values_list('transactionType', 'quantity', 'currency')
+    ):
+        if tx_type == Transactions.transaction_type.BUY:
+            quantity += tx_quantity
+            currency = (tx_currency or "").strip() or currency
+        else:
+            quantity = max(0.0, quantity - tx_quantity)
+
+    if quantity <= 0:
+        user_product.quantity = 0.0
+        user_product.average_purchase_price = None
+        user_product.currency = None
+        user_product.save()
+        return user_product
+
+    am = get_service_container().asset_manager()
+    cost_basis = am._get_cost_basis(owner, asset, quantity)
+    if cost_basis is not None and cost_basis > 0:
+        user_product.average_purchase_price = cost_basis / Decimal(str(quantity))
+        user_product.currency = currency or am._get_native_currency(asset)
+    else:
+        user_product.average_purchase_price = None
+        user_product.currency = None
+    user_product.quantity = quantity
     user_product.save()
     return user_product
@@ -2,11 +2,14 @@
 Unit tests for AssetManager.
 """
 from datetime import date
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from unittest.mock import Mock, patch
 from decimal import Decimal
-from base.models import Asset
+from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher
+from base.models import Asset, CurrentPrice
 from portfolio.models import UserAsset, Transactions
 from portfolio.services.asset_manager import AssetManager
 from portfolio.services.calculators import StockCalculator, BondCalculator
@@ -48,6 +51,17 @@ class TestAssetManager(TestCase):
             quantity=5
         )
 
+        # Quotes come from a mock fetcher so no test reaches Yahoo
+        self.stock_fetcher = Mock(spec=StockDataFetcher)
+        self.stock_fetcher.get_current_prices.return_value = {}
+        self.stock_fetcher.get_currency.return_value = 'USD'
+        patcher = patch(
+            'portfolio.services.asset_manager.get_default_stock_fetcher',
+            return_value=self.stock_fetcher,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         # Create asset manager with default currency
         self.manager = AssetManager(default_currency='USD')
 
@@ -59,19 +73,12 @@ class TestAssetManager(TestCase):
         self.assertIn('stocks', self.manager.calculators)
         self.assertIsInstance(self.manager.calculators['stocks'], StockCalculator)
 
-    @patch('base.infrastructure.providers.yfinance_fetchers.yf.Ticker')
-    def test_get_portfolio_composition_success(self, mock_ticker):
+    def test_get_portfolio_composition_success(self):
         """Test getting portfolio composition successfully."""
-        # Mock yfinance responses
-        def mock_ticker_side_effect(symbol):
-            mock_instance = Mock()
-            if symbol == 'AAPL':
-                mock_instance.info = {'currentPrice': 150.00}
-            elif symbol == 'GOOGL':
-                mock_instance.info = {'currentPrice': 100.00}
-            return mock_instance
-
-        mock_ticker.side_effect = mock_ticker_side_effect
+        self.stock_fetcher.get_current_prices.return_value = {
+            'AAPL': Decimal('150'),
+            'GOOGL': Decimal('100'),
+        }
 
         # Test
         composition = self.manager.get_portfolio_composition(self.user)
@@ -114,17 +121,12 @@ class TestAssetManager(TestCase):
         self.assertEqual(googl_asset['current_value'], 500.00)
         self.assertEqual(googl_asset['percentage'], 25.00)
 
-    @patch('base.infrastructure.providers.yfinance_fetchers.yf.Ticker')
-    def test_get_portfolio_composition_includes_cost_and_profit(self, mock_ticker):
+    def test_get_portfolio_composition_includes_cost_and_profit(self):
         """Composition includes average_purchase_price, total_cost, profit, profit_percentage when transactions exist."""
-        def mock_ticker_side_effect(symbol):
-            mock_instance = Mock()
-            if symbol == 'AAPL':
-                mock_instance.info = {'currentPrice': 150.00}
-            elif symbol == 'GOOGL':
-                mock_instance.info = {'currentPrice': 100.00}
-            return mock_instance
-        mock_ticker.side_effect = mock_ticker_side_effect
+        self.stock_fetcher.get_current_prices.return_value = {
+            'AAPL': Decimal('150'),
+            'GOOGL': Decimal('100'),
+        }
 
         # BUY 10 AAPL @ 100, BUY 5 GOOGL @ 80
         Transactions.objects.create(
@@ -154,14 +156,12 @@ class TestAssetManager(TestCase):
         self.assertEqual(googl['profit'], 100.0)
         self.assertEqual(googl['profit_percentage'], 25.0)
 
-    @patch('base.infrastructure.providers.yfinance_fetchers.yf.Ticker')
-    def test_get_portfolio_composition_cost_basis_after_sell(self, mock_ticker):
+    def test_get_portfolio_composition_cost_basis_after_sell(self):
         """After BUY 10 @ 100 and SELL 5, remaining 5 have cost basis 500 (avg 100)."""
-        def mock_ticker_side_effect(symbol):
-            mock_instance = Mock()
-            mock_instance.info = {'currentPrice': 120.00}
-            return mock_instance
-        mock_ticker.side_effect = mock_ticker_side_effect
+        self.stock_fetcher.get_current_prices.return_value = {
+            'AAPL': Decimal('120'),
+            'GOOGL': Decimal('120'),
+        }
 
         Transactions.objects.create(
             owner=self.user, product=self.stock1,
@@ -204,21 +204,11 @@ class TestAssetManager(TestCase):
         self.assertEqual(len(composition['composition_by_type']), 0)
         self.assertEqual(len(composition['composition_by_asset']), 0)
 
-    @patch('base.infrastructure.providers.yfinance_fetchers.yf.Ticker')
-    def test_get_portfolio_composition_skips_unavailable_prices(self, mock_ticker):
+    def test_get_portfolio_composition_skips_unavailable_prices(self):
         """Test that assets with unavailable prices are skipped."""
-        # Mock yfinance to return price for AAPL but not GOOGL
-        def mock_ticker_side_effect(symbol):
-            mock_instance = Mock()
-            if symbol == 'AAPL':
-                mock_instance.info = {'currentPrice': 150.00}
-            elif symbol == 'GOOGL':
-                mock_instance.info = {}
-                import pandas as pd
-                mock_instance.history.return_value = pd.DataFrame()
-            return mock_instance
-
-        mock_ticker.side_effect = mock_ticker_side_effect
+        # Price for AAPL but not GOOGL
+        self.stock_fetcher.get_current_prices.return_value = {'AAPL': Decimal('150')}
+        self.stock_fetcher.get_current_price.return_value = None
 
         # Test
         composition = self.manager.get_portfolio_composition(self.user)
@@ -274,9 +264,10 @@ class TestAssetManager(TestCase):
         import pandas as pd
         # Mock stock fetcher: AAPL=150 USD, GOOGL=100 USD
         mock_fetcher = Mock()
-        mock_fetcher.get_current_price.side_effect = (
-            lambda s: Decimal('150') if s == 'AAPL' else Decimal('100')
-        )
+        mock_fetcher.get_current_prices.return_value = {
+            'AAPL': Decimal('150'),
+            'GOOGL': Decimal('100'),
+        }
         mock_fetcher.get_currency.return_value = 'USD'
         mock_stock_fetcher.return_value = mock_fetcher
 
@@ -296,16 +287,38 @@ class TestAssetManager(TestCase):
         # 10*150*4 + 5*100*4 = 6000 + 2000 = 8000 PLN
         self.assertEqual(composition['total_value'], 8000.00)
 
-    @patch('base.infrastructure.providers.yfinance_fetchers.yf.Ticker')
-    def test_get_portfolio_composition_uses_default_currency(self, mock_ticker):
-        """Test that portfolio composition uses default currency when not specified."""
-        # Mock yfinance responses
-        def mock_ticker_side_effect(symbol):
-            mock_instance = Mock()
-            mock_instance.info = {'currentPrice': 100.00, 'currency': 'USD'}
-            return mock_instance
+    @patch('portfolio.services.asset_manager.get_default_stock_fetcher')
+    def test_get_portfolio_composition_prefetches_prices_in_one_call(self, mock_stock_fetcher):
+        """All stock prices come from one batched fetch, not one request per holding."""
+        mock_fetcher = Mock()
+        mock_fetcher.get_current_prices.return_value = {
+            'AAPL': Decimal('150'),
+            'GOOGL': Decimal('100'),
+        }
+        mock_fetcher.get_currency.return_value = 'USD'
+        mock_stock_fetcher.return_value = mock_fetcher
+
+        manager = AssetManager(default_currency='USD')
+        composition = manager.get_portfolio_composition(self.user)
+
+        mock_fetcher.get_current_prices.assert_called_once()
+        self.assertCountEqual(mock_fetcher.get_current_prices.call_args[0][0], ['AAPL', 'GOOGL'])
+        mock_fetcher.get_current_price.assert_not_called()
+        self.assertEqual(composition['total_value'], 2000.00)
 
-        mock_ticker.side_effect = mock_ticker_side_effect
+    @patch('portfolio.services.currency_converter.yf.Ticker')
+    def test_get_portfolio_composition_uses_default_currency(self, mock_fx_ticker_cls):
+        """Test that portfolio composition uses default currency when not specified."""
+        import pandas as pd
+        self.stock_fetcher.get_current_prices.return_value = {
+            'AAPL': Decimal('100'),
+            'GOOGL': Decimal('100'),
+        }
+        # Mock FX: 1 USD = 4 PLN
+        mock_fx_ticker_cls.return_value.history.return_value = pd.DataFrame(
+            {'Close': [4.0]},
+            index=pd.to_datetime(['2026-01-01']),
+        )
 
         # Create manager with PLN as default
         manager = AssetManager(default_currency='PLN')
@@ -315,6 +328,69 @@ class TestAssetManager(TestCase):
 
         # Assert - should use default currency
         self.assertEqual(composition['currency'], 'PLN')
+        self.assertEqual(composition['total_value'], 6000.00)  # (10*100 + 5*100) * 4
+
+
+class TestPortfolioCompositionQueries(TestCase):
+    """get_portfolio_composition runs a constant number of queries."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='queries', password='x')
+        self.fetcher = Mock()
+        self.fetcher.get_current_prices.return_value = {}
+        patcher = patch(
+            'portfolio.services.asset_manager.get_default_stock_fetcher',
+            return_value=self.fetcher,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # PLN bonds are valued in USD; keep FX lookups off the network
+        converter = Mock()
+        converter.convert.side_effect = lambda amount, *args, **kwargs: amount
+        patcher = patch('portfolio.services.asset_manager.CurrencyConverter', return_value=converter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = AssetManager(default_currency='USD')
+        self.n_holdings = 0
+
+    def _add_holdings(self, count):
+        for _ in range(count):
+            self.n_holdings += 1
+            symbol = f'S{self.n_holdings}'
+            stock = Asset.objects.create(symbol=symbol, name=symbol, asset_type='stocks')
+            CurrentPrice.objects.create(symbol=symbol, price=Decimal('10'), currency='USD')
+            # No stored average: cost basis comes from transactions
+            UserAsset.objects.create(owner=self.user, ownedAsset=stock, quantity=2)
+            Transactions.objects.create(
+                owner=self.user, product=stock, transactionType='B',
+                quantity=2, price=8, date=date(2024, 1, 2), currency='USD',
+            )
+            bond = Asset.objects.create(
+                name=f'EDO{self.n_holdings}', asset_type='bonds', bond_type='EDO',
+                maturity_date=date(2034, 1, 1), interest_rate_type='fixed',
+                interest_rate=Decimal('6'), face_value=Decimal('100'),
+            )
+            UserAsset.objects.create(owner=self.user, ownedAsset=bond, quantity=1)
+            Transactions.objects.create(
+                owner=self.user, product=bond, transactionType='B',
+                quantity=1, price=100, date=date(2024, 1, 2), currency='PLN',
+            )
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            composition = self.manager.get_portfolio_composition(self.user, target_currency='USD')
+        self.assertEqual(len(composition['assets']), 2 * self.n_holdings)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_holdings(self):
+        self._add_holdings(2)
+        small = self._count_queries()
+        self._add_holdings(8)
+        large = self._count_queries()
+
+        self.assertEqual(small, large)
+        self.fetcher.get_current_prices.assert_not_called()
+        self.fetcher.get_currency.assert_not_called()
 
 
 class TestValuePositions(TestCase):
@@ -463,6 +539,32 @@ class TestValuePositions(TestCase):
         self.assertAlmostEqual(float(total), 1505.0, places=2)
 
 
+    def test_value_position_matrix_matches_value_positions(self):
+        """Vectorized valuation gives the same daily totals as value_positions."""
+        import numpy as np
+
+        days = [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3)]
+        assets = [self.stock_aapl, self.stock_msft]
+        quantities = np.array([[10.0, 0.0], [10.0, 5.0], [0.0, 5.0]])
+        prices = np.array([[150.0, np.nan], [155.0, 300.0], [160.0, 310.0]])
+
+        totals = self.manager.value_position_matrix(assets, quantities, prices, days)
+
+        for i, day in enumerate(days):
+            row_prices = {
+                asset.symbol: prices[i, j]
+                for j, asset in enumerate(assets)
+                if not np.isnan(prices[i, j])
+            }
+            positions = [
+                {'asset': asset, 'quantity': quantities[i, j]}
+                for j, asset in enumerate(assets)
+            ]
+            expected = self.manager.value_positions(
+                positions, row_prices.get, valuation_date=day,
+            )
+            self.assertEqual(totals[i], expected)
+
 class TestValuePositionsCurrencyConversion(TestCase):
     """Tests for currency conversion in AssetManager.value_positions."""
 
@@ -671,3 +773,14 @@ class TestGetNativeCurrency(TestCase):
         )
         self.assertEqual(self.manager._get_native_currency(stock_us), 'USD')
         self.assertEqual(self.manager._get_native_currency(stock_wa), 'PLN')
+
+    def test_persisted_currency_overrides_inference(self):
+        stock = Asset.objects.create(
+            symbol='VOD.L', name='Vodafone', asset_type='stocks', currency='GBp',
+        )
+        bond = Asset.objects.create(
+            name='Bond EUR', asset_type='bonds', bond_type='EDO',
+            maturity_date=date(2030, 1, 1), currency='EUR',
+        )
+        self.assertEqual(self.manager._get_native_currency(stock), 'GBp')
+        self.assertEqual(self.manager._get_native_currency(bond), 'PLN')
@@ -4,7 +4,9 @@ Unit tests for asset calculators.
 from django.test import TestCase
 from unittest.mock import Mock, patch
 from decimal import Decimal
-from datetime import date
+from datetime import date, timedelta
+
+import numpy as np
 
 from portfolio.services.calculators import StockCalculator, BondCalculator, CryptoCalculator
 from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher, CryptoDataFetcher
@@ -130,6 +132,23 @@ class TestStockCalculator(TestCase):
         # Converter should NOT be called when currencies are the same
         self.mock_converter.convert.assert_not_called()
 
+    def test_get_current_value_uses_known_currency_without_fetcher(self):
+        """A prefetched price and currency need no fetcher calls."""
+        self.mock_converter.convert.return_value = Decimal('4000.00')
+        asset_data = {
+            'symbol': 'AAPL',
+            'quantity': 10,
+            'current_price': Decimal('100.00'),
+            'price_currency': 'USD',
+        }
+
+        value = self.calculator.get_current_value(asset_data, target_currency='PLN')
+
+        self.assertEqual(value, Decimal('4000.00'))
+        self.mock_converter.convert.assert_called_once_with(Decimal('1000.00'), 'USD', 'PLN')
+        self.mock_fetcher.get_current_price.assert_not_called()
+        self.mock_fetcher.get_currency.assert_not_called()
+
 
 class TestBondCalculator(TestCase):
     """
@@ -251,6 +270,66 @@ class TestBondCalculator(TestCase):
         mock_get_wibor.assert_called_once_with('3M')
 
 
+class TestBondCalculatorValuesForDates(TestCase):
+    """get_values_for_dates must match get_current_value date by date."""
+
+    def setUp(self):
+        self.calculator = BondCalculator(projected_inflation=Decimal('4.5'))
+        start = date(2021, 3, 1)
+        self.dates = [start + timedelta(days=i) for i in range(0, 5 * 365, 7)]
+
+    def _assert_matches_single_date(self, asset_data):
+        batched = self.calculator.get_values_for_dates(asset_data, self.dates)
+        for day, value in zip(self.dates, batched):
+            expected = self.calculator.get_current_value(asset_data, valuation_date=day)
+            self.assertAlmostEqual(value, float(expected), places=6, msg=str(day))
+
+    def test_capitalization_bond_edo(self):
+        self._assert_matches_single_date({
+            'face_value': 100,
+            'quantity': Decimal('3'),
+            'maturity_date': date(2031, 4, 1),
+            'purchase_date': date(2021, 4, 1),
+            'bond_type': 'EDO',
+            'interest_rate_type': 'indexed_inflation',
+            'inflation_margin': Decimal('1.25'),
+            'base_interest_rate': Decimal('1.70'),
+        })
+
+    def test_fixed_bond_tos_matures_inside_range(self):
+        self._assert_matches_single_date({
+            'face_value': 100,
+            'quantity': Decimal('2'),
+            'maturity_date': '2024-06-15',
+            'purchase_date': '2021-06-15',
+            'bond_type': 'TOS',
+            'interest_rate_type': 'fixed',
+            'interest_rate': Decimal('6.50'),
+        })
+
+    @patch('portfolio.services.calculators.get_latest_wibor')
+    def test_simple_interest_bond_dor(self, mock_get_wibor):
+        mock_get_wibor.return_value = Decimal('5.75')
+        asset_data = {
+            'face_value': 100,
+            'quantity': Decimal('1'),
+            'maturity_date': date(2023, 5, 1),
+            'purchase_date': date(2021, 5, 1),
+            'bond_type': 'DOR',
+            'interest_rate_type': 'variable_wibor',
+            'wibor_margin': Decimal('1.25'),
+        }
+        self._assert_matches_single_date(asset_data)
+
+        mock_get_wibor.reset_mock()
+        self.calculator.get_values_for_dates(asset_data, self.dates)
+        mock_get_wibor.assert_called_once_with('3M')
+
+    def test_invalid_bond_returns_nan(self):
+        values = self.calculator.get_values_for_dates({'quantity': Decimal('1')}, self.dates[:3])
+        self.assertTrue(np.isnan(values).all())
+
+
 class TestCryptoCalculator(TestCase):
     """Test the CryptoCalculator implementation."""
 
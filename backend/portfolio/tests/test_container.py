@@ -0,0 +1,59 @@
+"""Tests for the process-wide service container."""
+import threading
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from portfolio.services.calculators import StockCalculator
+from portfolio.services.container import (
+    ServiceContainer,
+    get_service_container,
+    reset_service_container,
+)
+
+
+class ServiceContainerTests(SimpleTestCase):
+    def test_asset_managers_share_collaborators(self):
+        services = ServiceContainer(stock_data_fetcher=Mock(), crypto_data_fetcher=Mock())
+
+        first = services.asset_manager('PLN')
+        second = services.asset_manager('USD')
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first.default_currency, 'PLN')
+        self.assertIs(first.stock_data_fetcher, second.stock_data_fetcher)
+        self.assertIs(first.currency_converter, second.currency_converter)
+        self.assertIs(first.calculators['stocks'], second.calculators['stocks'])
+        self.assertIsInstance(first.calculators['stocks'], StockCalculator)
+
+    def test_added_calculator_stays_in_its_manager(self):
+        services = ServiceContainer(stock_data_fetcher=Mock(), crypto_data_fetcher=Mock())
+
+        services.asset_manager().add_calculator('custom', Mock())
+
+        self.assertNotIn('custom', services.asset_manager().calculators)
+        self.assertNotIn('custom', services.calculators)
+
+    @patch('portfolio.services.container.get_default_stock_fetcher')
+    def test_fetcher_built_once_across_threads(self, mock_factory):
+        services = ServiceContainer()
+        seen = []
+        threads = [
+            threading.Thread(target=lambda: seen.append(services.stock_data_fetcher))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        mock_factory.assert_called_once()
+        self.assertEqual(len({id(f) for f in seen}), 1)
+
+    def test_process_container_is_reused_until_reset(self):
+        container = get_service_container()
+        self.assertIs(get_service_container(), container)
+
+        reset_service_container()
+
+        self.assertIsNot(get_service_container(), container)
@@ -1,12 +1,15 @@
 """
 Unit tests for CurrencyConverter.
 """
+from datetime import date
 from django.test import TestCase
 from unittest.mock import Mock, patch
 from decimal import Decimal
 
 import pandas as pd
 
+from base.infrastructure.db import FXRateRepository
+from base.models import FXRate
 from portfolio.services.currency_converter import CurrencyConverter
 
 
@@ -16,6 +19,8 @@ class TestCurrencyConverter(TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.converter = CurrencyConverter()
+        # Rates are cached process-wide; start each test from an empty cache
+        self.converter.clear_cache()
 
     def test_convert_same_currency(self):
         """Test converting between same currencies returns original amount."""
@@ -128,3 +133,114 @@ class TestCurrencyConverter(TestCase):
         result = converter.convert(Decimal('100.00'), 'USD', 'PLN')
 
         self.assertIsNone(result)
+
+    def test_rate_cache_is_shared_between_instances(self):
+        """A second converter reuses the rate fetched by the first one."""
+        fetcher = Mock()
+        fetcher.get_current_rate.return_value = Decimal('4.0')
+
+        CurrencyConverter(fx_fetcher=fetcher).convert(Decimal('1'), 'USD', 'PLN')
+        result = CurrencyConverter(fx_fetcher=fetcher).convert(Decimal('2'), 'USD', 'PLN')
+
+        self.assertEqual(result, Decimal('8.0'))
+        fetcher.get_current_rate.assert_called_once_with('USD', 'PLN')
+
+    def test_rate_is_refetched_after_ttl(self):
+        fetcher = Mock()
+        fetcher.get_current_rate.return_value = Decimal('4.0')
+        converter = CurrencyConverter(fx_fetcher=fetcher)
+
+        with patch('base.services.cache.time.monotonic', return_value=1000.0):
+            converter.get_exchange_rate('USD', 'PLN')
+        with patch('base.services.cache.time.monotonic', return_value=1000.0 + 16 * 60):
+            converter.get_exchange_rate('USD', 'PLN')
+
+        self.assertEqual(fetcher.get_current_rate.call_count, 2)
+
+    def test_get_rate_for_date_stores_history_in_db(self):
+        """Historical rates are fetched once, stored, then served from the FXRate table."""
+        fetcher = Mock()
+        fetcher.get_historical_fx_series.return_value = pd.Series(
+            [3.9, 4.1],
+            index=pd.to_datetime(['2025-01-09', '2025-01-10']),
+        )
+        converter = CurrencyConverter(fx_fetcher=fetcher)
+
+        # Sunday resolves to Friday's close
+        rate = converter.get_rate_for_date('USD', 'PLN', date(2025, 1, 12))
+        self.assertEqual(rate, Decimal('4.1'))
+        self.assertTrue(
+            FXRate.objects.filter(from_currency='USD', to_currency='PLN', date=date(2025, 1, 9)).exists()
+        )
+
+        converter.clear_cache()
+        self.assertEqual(converter.get_rate_for_date('USD', 'PLN', date(2025, 1, 9)), Decimal('3.9'))
+        fetcher.get_historical_fx_series.assert_called_once()
+
+    def test_get_rate_for_date_fetches_uncovered_day_despite_earlier_rate(self):
+        """A rate stored a few days before does not stand in for a day never fetched."""
+        FXRateRepository().save_rates('USD', 'PLN', {date(2025, 1, 6): Decimal('3.8')})
+        fetcher = Mock()
+        fetcher.get_historical_fx_series.return_value = pd.Series(
+            [4.2],
+            index=pd.to_datetime(['2025-01-09']),
+        )
+        converter = CurrencyConverter(fx_fetcher=fetcher)
+
+        self.assertEqual(converter.get_rate_for_date('USD', 'PLN', date(2025, 1, 9)), Decimal('4.2'))
+        fetcher.get_historical_fx_series.assert_any_call('USD', 'PLN', date(2025, 1, 7), date(2025, 1, 9))
+
+    def test_get_rate_for_date_uses_earlier_rate_for_covered_non_trading_day(self):
+        fetcher = Mock()
+        fetcher.get_historical_fx_series.return_value = pd.Series(
+            [4.1],
+            index=pd.to_datetime(['2025-01-10']),
+        )
+        converter = CurrencyConverter(fx_fetcher=fetcher)
+        converter.get_rate_series('USD', 'PLN', date(2025, 1, 10), date(2025, 1, 12))
+        converter.clear_cache()
+
+        self.assertEqual(converter.get_rate_for_date('USD', 'PLN', date(2025, 1, 12)), Decimal('4.1'))
+        fetcher.get_historical_fx_series.assert_called_once()
+
+    def test_convert_many_uses_rate_of_each_date(self):
+        fetcher = Mock()
+        fetcher.get_historical_fx_series.return_value = pd.Series(
+            [4.0, 5.0],
+            index=pd.to_datetime(['2025-01-09', '2025-01-10']),
+        )
+        converter = CurrencyConverter(fx_fetcher=fetcher)
+
+        result = converter.convert_many(
+            [100.0, 100.0, 100.0, 50.0],
+            ['USD', 'USD', 'USD', 'PLN'],
+            [date(2025, 1, 9), date(2025, 1, 10), date(2025, 1, 11), date(2025, 1, 10)],
+            'PLN',
+        )
+
+        self.assertEqual(list(result), [400.0, 500.0, 500.0, 50.0])
+        fetcher.get_historical_fx_series.assert_called_once()
+
+    def test_convert_series_reads_history_from_db(self):
+        """Rates fetched once are persisted; later calls (new cache) do not refetch."""
+        fetcher = Mock()
+        fetcher.get_historical_fx_series.return_value = pd.Series(
+            [4.0, 5.0],
+            index=pd.to_datetime(['2025-01-09', '2025-01-10']),
+        )
+        series = pd.Series(
+            [1.0, 2.0],
+            index=pd.DatetimeIndex(['2025-01-09', '2025-01-10']),
+        )
+
+        first = CurrencyConverter(fx_fetcher=fetcher).convert_series(
+            series, 'USD', 'PLN', date(2025, 1, 9), date(2025, 1, 10),
+        )
+        CurrencyConverter().clear_cache()
+        second = CurrencyConverter(fx_fetcher=fetcher).convert_series(
+            series, 'USD', 'PLN', date(2025, 1, 9), date(2025, 1, 10),
+        )
+
+        self.assertEqual(list(first), [4.0, 10.0])
+        self.assertEqual(list(second), [4.0, 10.0])
+        fetcher.get_historical_fx_series.assert_called_once()
@@ -0,0 +1,171 @@
+"""Tests for background transaction import jobs."""
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.models import Asset
+from portfolio.models import TransactionImportJob, Transactions
+from portfolio.services.import_jobs import (
+    claim_job,
+    enqueue_import_job,
+    requeue_stale_jobs,
+    run_import_job,
+    run_pending_jobs,
+)
+from portfolio.tests.test_xtb_cash_operations import _xtb_workbook
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@patch("portfolio.services.transaction_import_service.PortfolioSnapshotService", MagicMock())
+class TransactionImportJobTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="jobs", password="x")
+        Asset.objects.create(symbol="TST.PL", name="Test SA", asset_type=Asset.AssetType.STOCKS)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _upload(self, content: bytes):
+        return self.client.post(
+            "/api/portfolio/import/xtb/",
+            {"file": SimpleUploadedFile("export.xlsx", content, content_type=XLSX)},
+            format="multipart",
+        )
+
+    def test_upload_queues_job_and_status_reports_outcomes(self):
+        response = self._upload(_xtb_workbook(3).getvalue())
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], "pending")
+        self.assertEqual(Transactions.objects.count(), 0)
+
+        self.assertEqual(run_pending_jobs(), 1)
+        status = self.client.get(response.data["status_url"])
+
+        self.assertEqual(status.status_code, 200)
+        self.assertEqual(status.data["status"], "succeeded")
+        self.assertEqual(status.data["rows_processed"], 3)
+        self.assertEqual(status.data["created_count"], 3)
+        self.assertEqual([o["status"] for o in status.data["outcomes"]], ["created"] * 3)
+        self.assertIsNotNone(status.data["rows_per_second"])
+        self.assertIsNone(TransactionImportJob.objects.get().payload)
+
+    def test_unreadable_file_fails_job(self):
+        response = self._upload(b"not a workbook")
+        run_pending_jobs()
+
+        job = TransactionImportJob.objects.get(id=response.data["id"])
+        self.assertEqual(job.status, TransactionImportJob.Status.FAILED)
+        self.assertTrue(job.error)
+        self.assertEqual(job.rows_processed, 0)
+
+    def test_job_is_claimed_once(self):
+        job = enqueue_import_job(
+            self.user, TransactionImportJob.Source.XTB_CASH_OPERATIONS, "a.xlsx", b"",
+        )
+
+        self.assertEqual(claim_job(job.id).status, TransactionImportJob.Status.RUNNING)
+        self.assertIsNone(claim_job(job.id))
+        self.assertIsNone(claim_job())
+
+    def test_other_users_job_is_not_visible(self):
+        other = User.objects.create_user(username="other", password="x")
+        job = enqueue_import_job(
+            other, TransactionImportJob.Source.XTB_CASH_OPERATIONS, "a.xlsx", b"",
+        )
+
+        response = self.client.get(f"/api/portfolio/import/jobs/{job.id}/")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_stale_running_job_is_requeued_and_run(self):
+        job = enqueue_import_job(
+            self.user, TransactionImportJob.Source.XTB_CASH_OPERATIONS, "a.xlsx", _xtb_workbook(2).getvalue(),
+        )
+        claim_job(job.id)
+        self.assertEqual(requeue_stale_jobs(), 0)
+        TransactionImportJob.objects.filter(id=job.id).update(
+            started_at=timezone.now() - timedelta(hours=1),
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+
+        with override_settings(IMPORT_JOBS_TIMEOUT=60):
+            self.assertEqual(run_pending_jobs(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TransactionImportJob.Status.SUCCEEDED)
+        self.assertEqual(job.created_count, 2)
+
+    def test_long_running_job_with_recent_progress_is_not_requeued(self):
+        job = enqueue_import_job(
+            self.user, TransactionImportJob.Source.XTB_CASH_OPERATIONS, "a.xlsx", b"",
+        )
+        claim_job(job.id)
+        TransactionImportJob.objects.filter(id=job.id).update(
+            started_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(requeue_stale_jobs(timeout=60), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, TransactionImportJob.Status.RUNNING)
+
+    def test_progress_refreshes_heartbeat(self):
+        job = enqueue_import_job(
+            self.user, TransactionImportJob.Source.XTB_CASH_OPERATIONS, "a.xlsx", _xtb_workbook(2).getvalue(),
+        )
+        job = claim_job(job.id)
+        stale = timezone.now() - timedelta(hours=1)
+        TransactionImportJob.objects.filter(id=job.id).update(heartbeat_at=stale)
+
+        def import_one_chunk(*args, on_chunk, **kwargs):
+            on_chunk(MagicMock(outcomes=[], created_count=0))
+            self.assertEqual(requeue_stale_jobs(timeout=60), 0)
+
+        with patch(
+            "portfolio.services.import_jobs.import_normalized_transaction_chunks",
+            side_effect=import_one_chunk,
+        ):
+            run_import_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TransactionImportJob.Status.SUCCEEDED)
+        self.assertGreater(job.heartbeat_at, stale)
+
+    def test_requeued_run_does_not_overwrite_the_rerun(self):
+        job = enqueue_import_job(
+            self.user, TransactionImportJob.Source.XTB_CASH_OPERATIONS, "a.xlsx", _xtb_workbook(2).getvalue(),
+        )
+        first = claim_job(job.id)
+        TransactionImportJob.objects.filter(id=job.id).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(requeue_stale_jobs(timeout=60), 1)
+        second = claim_job(job.id)
+        run_import_job(second)
+
+        # The first worker was only slow, not dead; its late results are dropped
+        with self.assertLogs("portfolio.services.import_jobs", "WARNING"):
+            run_import_job(first)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, TransactionImportJob.Status.SUCCEEDED)
+        self.assertEqual(job.created_count, 2)
+        self.assertEqual(Transactions.objects.count(), 2)
+
+    @override_settings(IMPORT_JOBS_IN_PROCESS=True)
+    @patch("portfolio.services.import_jobs._schedule_sweep")
+    def test_polling_unfinished_job_sweeps_in_process(self, m_sweep):
+        with patch("portfolio.services.import_jobs._submit"):
+            response = self._upload(_xtb_workbook(1).getvalue())
+
+        self.client.get(response.data["status_url"])
+        m_sweep.assert_called_once()
+
+        run_pending_jobs()
+        self.client.get(response.data["status_url"])
+        m_sweep.assert_called_once()
@@ -1,17 +1,18 @@
 """
 Unit tests for PortfolioSnapshotService.
 """
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pandas as pd
 from django.test import TestCase
 from django.contrib.auth.models import User
 
 from base.models import Asset, PriceHistory
 from portfolio.models import Transactions
-from portfolio.models import PortfolioSnapshot
+from portfolio.models import PortfolioSnapshot, PortfolioSnapshotState
 from portfolio.services.asset_manager import AssetManager
 from base.infrastructure.interfaces.market_data_fetcher import StockDataFetcher, CryptoDataFetcher
 from portfolio.services.portfolio_snapshots import PortfolioSnapshotService
@@ -22,6 +23,25 @@ def _make_price_series(dates, prices):
     return pd.Series(prices, index=dates)
 
 
+def _dated_rate_converter(rates):
+    """
+    Mock CurrencyConverter whose ``convert_many`` applies ``rates[(from, to)]``:
+    a constant, or a ``{date: rate}`` dict for per-day rates.
+    """
+    def convert_many(amounts, currencies, dates, to_currency):
+        out = []
+        for amount, currency, day in zip(amounts, currencies, dates):
+            rate = rates.get((currency, to_currency), 1.0) if currency != to_currency else 1.0
+            if isinstance(rate, dict):
+                rate = rate[day]
+            out.append(float(amount) * rate)
+        return np.array(out)
+
+    converter = Mock()
+    converter.convert_many.side_effect = convert_many
+    return converter
+
+
 class PortfolioSnapshotServiceTests(TestCase):
     """Tests for building portfolio value snapshots."""
 
@@ -291,6 +311,43 @@ class PortfolioSnapshotServiceTests(TestCase):
         )
         self.assertAlmostEqual(float(snap.total_value), 2000.0, places=2)
 
+    def test_only_changed_writes_only_differing_rows(self):
+        """With only_changed=True, unchanged days are not rewritten."""
+        Transactions.objects.create(
+            owner=self.user,
+            product=self.stock,
+            transactionType="B",
+            quantity=10,
+            price=150.0,
+            date=date(2026, 1, 1),
+        )
+        self.mock_stock_fetcher.get_historical_prices.return_value = {
+            "AAPL": _make_price_series(
+                [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3)],
+                [150.0, 155.0, 152.0],
+            ),
+        }
+        self.service.build_snapshots_for_user(
+            self.user, date(2026, 1, 1), date(2026, 1, 3), currency="USD",
+        )
+        PortfolioSnapshot.objects.filter(
+            user=self.user, date=date(2026, 1, 2),
+        ).update(total_value=Decimal("1.00"))
+
+        with patch.object(
+            PortfolioSnapshot.objects, "bulk_create",
+            wraps=PortfolioSnapshot.objects.bulk_create,
+        ) as m_bulk:
+            self.service.build_snapshots_for_user(
+                self.user, date(2026, 1, 1), date(2026, 1, 3),
+                currency="USD", only_changed=True,
+            )
+
+        written = m_bulk.call_args[0][0]
+        self.assertEqual([s.date for s in written], [date(2026, 1, 2)])
+        snap = PortfolioSnapshot.objects.get(user=self.user, date=date(2026, 1, 2))
+        self.assertEqual(snap.total_value, Decimal("1550.00"))
+
     def test_weekend_forward_fill(self):
         """When no price on a date, the last known price is used."""
         Transactions.objects.create(
@@ -317,6 +374,161 @@ class PortfolioSnapshotServiceTests(TestCase):
         for snap in snapshots:
             self.assertAlmostEqual(float(snap.total_value), 1500.0, places=2)
 
+    def test_range_starting_on_weekend_uses_last_close(self):
+        """A chunk starting on a Saturday values the position at Friday's close."""
+        Transactions.objects.create(
+            owner=self.user,
+            product=self.stock,
+            transactionType="B",
+            quantity=10,
+            price=150.0,
+            date=date(2026, 1, 2),  # Friday
+        )
+
+        self.mock_stock_fetcher.get_historical_prices.return_value = {
+            "AAPL": _make_price_series([date(2026, 1, 2), date(2026, 1, 5)], [150.0, 160.0]),
+        }
+
+        snapshots = self.service.build_snapshots_for_user(
+            self.user, date(2026, 1, 3), date(2026, 1, 5), currency="USD",
+        )
+
+        self.assertEqual([float(s.total_value) for s in snapshots], [1500.0, 1500.0, 1600.0])
+
+    def test_transactions_before_start_date_are_carried_in(self):
+        """Positions and invested cash from before start_date seed the first day."""
+        Transactions.objects.create(
+            owner=self.user,
+            product=self.stock,
+            transactionType="B",
+            quantity=10,
+            price=100.0,
+            date=date(2025, 12, 1),
+        )
+        Transactions.objects.create(
+            owner=self.user,
+            product=self.stock,
+            transactionType="S",
+            quantity=4,
+            price=120.0,
+            date=date(2026, 1, 2),
+        )
+
+        self.mock_stock_fetcher.get_historical_prices.return_value = {
+            "AAPL": _make_price_series(
+                [date(2026, 1, 1), date(2026, 1, 2)],
+                [150.0, 160.0],
+            ),
+        }
+
+        snapshots = self.service.build_snapshots_for_user(
+            self.user, date(2026, 1, 1), date(2026, 1, 3), currency="USD",
+        )
+
+        self.assertEqual(len(snapshots), 3)
+        # Jan 1: 10 shares bought in December
+        self.assertAlmostEqual(float(snapshots[0].total_value), 1500.0, places=2)
+        self.assertAlmostEqual(float(snapshots[0].total_invested), 1000.0, places=2)
+        # Jan 2-3: 6 shares at 160 (Jan 3 forward-filled), invested 1000 - 4*120
+        self.assertAlmostEqual(float(snapshots[1].total_value), 960.0, places=2)
+        self.assertAlmostEqual(float(snapshots[2].total_value), 960.0, places=2)
+        self.assertAlmostEqual(float(snapshots[2].total_invested), 520.0, places=2)
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def test_build_saves_running_state(self):
+        """The last built day is stored as positions + invested for incremental updates."""
+        Transactions.objects.create(
+            owner=self.user, product=self.stock, transactionType="B",
+            quantity=10, price=100.0, date=date(2026, 1, 1),
+        )
+        Transactions.objects.create(
+            owner=self.user, product=self.stock, transactionType="S",
+            quantity=4, price=120.0, date=date(2026, 1, 2),
+        )
+
+        self.service.build_snapshots_for_user(
+            self.user, date(2026, 1, 1), date(2026, 1, 3), currency="USD",
+        )
+
+        state = PortfolioSnapshotState.objects.get(user=self.user, currency="USD")
+        self.assertEqual(state.last_date, date(2026, 1, 3))
+        self.assertEqual(state.total_invested, Decimal("520.00"))
+        self.assertEqual(
+            state.positions,
+            {str(self.stock.id): {"quantity": 6.0, "purchase_date": "2026-01-01"}},
+        )
+
+        # An older range must not move the state backwards
+        self.service.build_snapshots_for_user(
+            self.user, date(2026, 1, 1), date(2026, 1, 1), currency="USD",
+        )
+        state.refresh_from_db()
+        self.assertEqual(state.last_date, date(2026, 1, 3))
+
+    def test_append_today_values_state_without_transaction_replay(self):
+        """A current state is valued with current prices; transactions are not read."""
+        today = date.today()
+        PortfolioSnapshotState.objects.create(
+            user=self.user,
+            currency="USD",
+            last_date=today - timedelta(days=1),
+            total_invested=Decimal("500.00"),
+            positions={str(self.stock.id): {"quantity": 5.0, "purchase_date": "2026-01-01"}},
+        )
+        self.service.price_repository = Mock()
+        self.service.price_repository.get_current_price.return_value = Decimal("200")
+
+        with patch.object(Transactions.objects, "filter") as m_filter:
+            snapshot = self.service.append_today(self.user, currency="USD")
+
+        m_filter.assert_not_called()
+        self.assertAlmostEqual(float(snapshot.total_value), 1000.0, places=2)
+        stored = PortfolioSnapshot.objects.get(user=self.user, date=today, currency="USD")
+        self.assertEqual(stored.total_invested, Decimal("500.00"))
+        self.assertEqual(
+            PortfolioSnapshotState.objects.get(user=self.user, currency="USD").last_date,
+            today,
+        )
+
+    def test_apply_transaction_change_rebuilds_only_from_changed_date(self):
+        """Days before the changed transaction are left untouched."""
+        today = date.today()
+        changed = today - timedelta(days=2)
+        PortfolioSnapshot.objects.create(
+            user=self.user, date=changed - timedelta(days=1), currency="USD",
+            total_value=Decimal("1.00"), total_invested=Decimal("1.00"),
+        )
+        Transactions.objects.create(
+            owner=self.user, product=self.bond, transactionType="B",
+            quantity=1, price=100.0, date=changed,
+        )
+        # PLN bond valued in USD: keep FX off the network
+        asset_manager = AssetManager(default_currency="USD")
+        asset_manager.currency_converter = _dated_rate_converter({("PLN", "USD"): 0.25})
+        service = PortfolioSnapshotService(
+            currency="USD",
+            stock_data_fetcher=self.mock_stock_fetcher,
+            crypto_data_fetcher=self.mock_crypto_fetcher,
+            asset_manager=asset_manager,
+        )
+
+        service.apply_transaction_change(self.user, changed)
+
+        dates = list(
+            PortfolioSnapshot.objects.filter(user=self.user, currency="USD")
+            .order_by("date").values_list("date", flat=True)
+        )
+        self.assertEqual(dates, [changed - timedelta(days=1), changed, changed + timedelta(days=1), today])
+        untouched = PortfolioSnapshot.objects.get(user=self.user, date=changed - timedelta(days=1))
+        self.assertEqual(untouched.total_value, Decimal("1.00"))
+        self.assertEqual(
+            PortfolioSnapshotState.objects.get(user=self.user, currency="USD").last_date,
+            today,
+        )
+
 
 class PortfolioSnapshotCurrencyConversionTests(TestCase):
     """Tests for currency conversion within snapshot building."""
@@ -354,9 +566,8 @@ class PortfolioSnapshotCurrencyConversionTests(TestCase):
         )
 
     def test_us_stock_converted_to_pln(self):
-        """US stock snapshot in PLN converts from USD."""
-        mock_converter = Mock()
-        mock_converter.convert.return_value = Decimal('6000')  # 1500 USD → 6000 PLN
+        """US stock snapshot in PLN converts from USD at the day's rate."""
+        mock_converter = _dated_rate_converter({("USD", "PLN"): 4.0})
 
         service = self._make_service('PLN', mock_converter)
 
@@ -375,13 +586,16 @@ class PortfolioSnapshotCurrencyConversionTests(TestCase):
 
         self.assertEqual(len(snapshots), 1)
         self.assertAlmostEqual(float(snapshots[0].total_value), 6000.0, places=2)
-        mock_converter.convert.assert_called_with(
-            Decimal('1500'), 'USD', 'PLN',
-        )
+        self.assertAlmostEqual(float(snapshots[0].total_invested), 6000.0, places=2)
+        amounts, currencies, dates, target = mock_converter.convert_many.call_args_list[-1][0]
+        self.assertEqual(list(amounts), [1500.0])
+        self.assertEqual(list(currencies), ['USD'])
+        self.assertEqual(list(dates), [date(2026, 1, 1)])
+        self.assertEqual(target, 'PLN')
 
     def test_wa_stock_no_conversion_in_pln(self):
         """Warsaw stock snapshot in PLN — no conversion needed."""
-        mock_converter = Mock()
+        mock_converter = _dated_rate_converter({})
         service = self._make_service('PLN', mock_converter)
 
         Transactions.objects.create(
@@ -400,11 +614,12 @@ class PortfolioSnapshotCurrencyConversionTests(TestCase):
         self.assertEqual(len(snapshots), 1)
         self.assertAlmostEqual(float(snapshots[0].total_value), 1000.0, places=2)
         mock_converter.convert.assert_not_called()
+        # Only the (PLN) invested amounts are passed through; values need no conversion
+        self.assertEqual(mock_converter.convert_many.call_count, 1)
 
     def test_bond_converted_to_usd(self):
         """Bond snapshot in USD converts from PLN."""
-        mock_converter = Mock()
-        mock_converter.convert.return_value = Decimal('125')  # 500 PLN → 125 USD
+        mock_converter = _dated_rate_converter({("PLN", "USD"): 0.25})
 
         service = self._make_service('USD', mock_converter)
 
@@ -420,24 +635,35 @@ class PortfolioSnapshotCurrencyConversionTests(TestCase):
 
         self.assertEqual(len(snapshots), 1)
         self.assertAlmostEqual(float(snapshots[0].total_value), 125.0, places=2)
-        # convert may be called for total_invested and for position value (e.g. twice)
-        self.assertGreaterEqual(mock_converter.convert.call_count, 1)
-        calls = mock_converter.convert.call_args_list
-        pln_to_usd_500 = [
-            c for c in calls
-            if c[0][1] == 'PLN' and c[0][2] == 'USD' and float(c[0][0]) == 500.0
-        ]
-        self.assertTrue(pln_to_usd_500, f"Expected convert(500, 'PLN', 'USD') in {calls}")
+        self.assertAlmostEqual(float(snapshots[0].total_invested), 125.0, places=2)
+
+    def test_values_use_rate_of_each_day(self):
+        """Each day's value is converted at that day's rate, not today's spot rate."""
+        daily = {date(2026, 1, 1): 4.0, date(2026, 1, 2): 5.0}
+        mock_converter = _dated_rate_converter({("USD", "PLN"): daily})
+        service = self._make_service('PLN', mock_converter)
+
+        Transactions.objects.create(
+            owner=self.user, product=self.stock_us,
+            transactionType="B", quantity=10, price=100.0,
+            date=date(2026, 1, 1),
+        )
+        self.mock_stock_fetcher.get_historical_prices.return_value = {
+            "AAPL": _make_price_series([date(2026, 1, 1), date(2026, 1, 2)], [100.0, 100.0]),
+        }
+
+        snapshots = service.build_snapshots_for_user(
+            self.user, date(2026, 1, 1), date(2026, 1, 2), currency="PLN",
+        )
+
+        self.assertAlmostEqual(float(snapshots[0].total_value), 4000.0, places=2)
+        self.assertAlmostEqual(float(snapshots[1].total_value), 5000.0, places=2)
+        # Invested cash keeps the rate of the purchase day
+        self.assertAlmostEqual(float(snapshots[1].total_invested), 4000.0, places=2)
 
     def test_mixed_portfolio_conversion(self):
         """US stock + WA stock + bond with target PLN."""
-        def mock_convert(amount, from_cur, to_cur):
-            if from_cur == 'USD' and to_cur == 'PLN':
-                return amount * Decimal('4')
-            return amount
-
-        mock_converter = Mock()
-        mock_converter.convert.side_effect = mock_convert
+        mock_converter = _dated_rate_converter({("USD", "PLN"): 4.0})
 
         service = self._make_service('PLN', mock_converter)
 
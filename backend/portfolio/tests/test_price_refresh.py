@@ -0,0 +1,153 @@
+"""
+Unit tests for PriceRefreshScheduler.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pandas as pd
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from base.infrastructure.interfaces.market_data_fetcher import CryptoDataFetcher, StockDataFetcher
+from base.models import Asset, CurrentPrice
+from portfolio.models import UserAsset
+from portfolio.services.price_refresh import PriceRefreshScheduler, RefreshResult
+
+
+def _no_rows(symbols, start_date, end_date):
+    return {symbol: pd.Series(dtype=float) for symbol in symbols}
+
+
+class PriceRefreshSchedulerTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user("holder", "h@test.com", "pass")
+        other = User.objects.create_user("other", "o@test.com", "pass")
+        self.aapl = Asset.objects.create(symbol="AAPL", name="Apple", asset_type="stocks")
+        self.msft = Asset.objects.create(symbol="MSFT", name="Microsoft", asset_type="stocks")
+        self.btc = Asset.objects.create(symbol="BTC-USD", name="Bitcoin", asset_type="cryptocurrencies")
+        sold = Asset.objects.create(symbol="TSLA", name="Tesla", asset_type="stocks")
+        bond = Asset.objects.create(name="EDO0134", asset_type="bonds", bond_type="EDO")
+        UserAsset.objects.create(owner=user, ownedAsset=self.aapl, quantity=10)
+        UserAsset.objects.create(owner=other, ownedAsset=self.aapl, quantity=3)
+        UserAsset.objects.create(owner=user, ownedAsset=self.msft, quantity=1)
+        UserAsset.objects.create(owner=user, ownedAsset=self.btc, quantity=0.5)
+        UserAsset.objects.create(owner=user, ownedAsset=sold, quantity=0)
+        UserAsset.objects.create(owner=user, ownedAsset=bond, quantity=5)
+
+        self.stock_fetcher = Mock(spec=StockDataFetcher)
+        self.stock_fetcher.get_current_prices.side_effect = lambda symbols: {s: Decimal("100") for s in symbols}
+        self.stock_fetcher.get_currency.return_value = "USD"
+        self.stock_fetcher.get_historical_prices.side_effect = _no_rows
+        self.crypto_fetcher = Mock(spec=CryptoDataFetcher)
+        self.crypto_fetcher.get_current_prices.return_value = {"BTC-USD": Decimal("60000")}
+        self.crypto_fetcher.get_currency.return_value = "USD"
+        self.crypto_fetcher.get_historical_prices.side_effect = _no_rows
+        # Closing the connection would end the test transaction
+        patcher = patch("portfolio.services.price_refresh.close_old_connections")
+        self.close_old_connections = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _scheduler(self, **kwargs):
+        return PriceRefreshScheduler(
+            stock_data_fetcher=self.stock_fetcher,
+            crypto_data_fetcher=self.crypto_fetcher,
+            **kwargs,
+        )
+
+    def test_held_assets_groups_open_positions_by_type(self):
+        held = self._scheduler().held_assets()
+
+        self.assertEqual(sorted(held["stocks"]), ["AAPL", "MSFT"])
+        self.assertEqual(list(held["cryptocurrencies"]), ["BTC-USD"])
+
+    def test_refresh_once_batches_prices_per_asset_type(self):
+        result = self._scheduler(history_days=3).refresh_once(today=date(2024, 6, 10))
+
+        self.assertTrue(result.ok)
+        self.assertEqual((result.symbols, result.prices), (3, 3))
+        self.stock_fetcher.get_current_prices.assert_called_once_with(["AAPL", "MSFT"])
+        self.crypto_fetcher.get_current_prices.assert_called_once_with(["BTC-USD"])
+        self.assertEqual(CurrentPrice.objects.get(symbol="BTC-USD").price, Decimal("60000"))
+        args = self.stock_fetcher.get_historical_prices.call_args.args
+        self.assertEqual(sorted(args[0]), ["AAPL", "MSFT"])
+        self.assertEqual((args[1], args[2]), (date(2024, 6, 7), date(2024, 6, 10)))
+
+    def test_refresh_overwrites_fresh_prices(self):
+        CurrentPrice.objects.create(symbol="AAPL", price=Decimal("1"), currency="USD")
+
+        self._scheduler().refresh_once(today=date(2024, 6, 10))
+
+        self.assertEqual(CurrentPrice.objects.get(symbol="AAPL").price, Decimal("100"))
+
+    def test_provider_error_is_collected(self):
+        self.stock_fetcher.get_current_prices.side_effect = RuntimeError("rate limited")
+
+        result = self._scheduler().refresh_once(today=date(2024, 6, 10))
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.prices, 1)
+        self.assertIn("rate limited", result.errors[0])
+
+    def test_daily_closes_error_is_collected(self):
+        self.stock_fetcher.get_historical_prices.side_effect = RuntimeError("history down")
+
+        result = self._scheduler().refresh_once(today=date(2024, 6, 10))
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.errors, ["stocks daily closes: history down"])
+
+    def test_symbol_missing_from_daily_closes_is_an_error(self):
+        self.stock_fetcher.get_historical_prices.side_effect = lambda symbols, start, end: {
+            "AAPL": pd.Series(dtype=float),
+        }
+
+        result = self._scheduler().refresh_once(today=date(2024, 6, 10))
+
+        self.assertFalse(result.ok)
+        self.assertIn("MSFT", result.errors[0])
+
+    @patch("portfolio.services.price_refresh.random.uniform", return_value=0.0)
+    def test_backoff_doubles_until_cap_and_resets(self, _uniform):
+        scheduler = self._scheduler(interval=10, jitter=5, max_backoff=35)
+        failed, ok = RefreshResult(errors=["x"]), RefreshResult()
+
+        delays = [scheduler.next_delay(r) for r in (failed, failed, failed, ok)]
+
+        self.assertEqual(delays, [20, 35, 35, 10])
+
+    def test_run_sleeps_between_passes(self):
+        sleep = Mock()
+        scheduler = self._scheduler(interval=10, jitter=0, sleep=sleep)
+
+        scheduler.run(iterations=2)
+
+        self.assertEqual(self.stock_fetcher.get_current_prices.call_count, 2)
+        sleep.assert_called_once_with(10)
+
+    def test_run_survives_a_pass_that_raises(self):
+        sleep = Mock()
+        scheduler = self._scheduler(interval=10, jitter=0, sleep=sleep)
+
+        with patch.object(scheduler, "held_assets", side_effect=[RuntimeError("db gone"), {}]), \
+                self.assertLogs("portfolio.services.price_refresh", "ERROR"):
+            scheduler.run(iterations=2)
+
+        sleep.assert_called_once_with(20)
+        self.assertEqual(scheduler.failures, 1)
+
+    def test_run_closes_stale_connections_before_each_pass(self):
+        self._scheduler(jitter=0, sleep=Mock()).run(iterations=2)
+
+        self.assertEqual(self.close_old_connections.call_count, 2)
+
+    def test_unknown_extra_symbols_are_logged_once(self):
+        scheduler = self._scheduler(extra_symbols=["TSLA", "NOPE"])
+
+        with self.assertLogs("portfolio.services.price_refresh", "WARNING") as logs:
+            held = scheduler.held_assets()
+            scheduler.held_assets()
+
+        self.assertIn("TSLA", held["stocks"])
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("NOPE", logs.output[0])
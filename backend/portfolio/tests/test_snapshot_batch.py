@@ -0,0 +1,122 @@
+"""
+Unit tests for batch snapshot generation (generate_snapshots).
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from base.models import Asset
+from portfolio.models import Transactions
+from portfolio.services.snapshot_batch import (
+    ShardResult,
+    build_snapshot_shard,
+    chunk_date_range,
+    plan_snapshot_jobs,
+    prewarm_snapshot_caches,
+    run_snapshot_shards,
+    shard_jobs,
+)
+
+
+class ChunkingTests(SimpleTestCase):
+    def test_chunk_date_range(self):
+        chunks = chunk_date_range(date(2024, 1, 1), date(2024, 1, 10), 4)
+
+        self.assertEqual(chunks, [
+            (date(2024, 1, 1), date(2024, 1, 4)),
+            (date(2024, 1, 5), date(2024, 1, 8)),
+            (date(2024, 1, 9), date(2024, 1, 10)),
+        ])
+        self.assertEqual(chunk_date_range(date(2024, 1, 1), date(2024, 1, 10), 0),
+                         [(date(2024, 1, 1), date(2024, 1, 10))])
+
+    def test_shard_jobs(self):
+        jobs = [(i, date(2024, 1, 1), date(2024, 1, 1)) for i in range(5)]
+
+        self.assertEqual([len(s) for s in shard_jobs(jobs, 2)], [2, 2, 1])
+
+
+class SnapshotBatchTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user("alice", "a@test.com", "pass")
+        self.bob = User.objects.create_user("bob", "b@test.com", "pass")
+        User.objects.create_user("idle", "i@test.com", "pass")
+        self.aapl = Asset.objects.create(symbol="AAPL", name="Apple", asset_type="stocks")
+        self.btc = Asset.objects.create(symbol="BTC-USD", name="Bitcoin", asset_type="cryptocurrencies")
+        for owner, asset, day in (
+            (self.alice, self.aapl, date(2024, 1, 5)),
+            (self.alice, self.btc, date(2024, 3, 1)),
+            (self.bob, self.aapl, date(2024, 2, 1)),
+        ):
+            Transactions.objects.create(
+                owner=owner, product=asset, transactionType="B", quantity=1,
+                price=Decimal("100"), date=day, currency="USD",
+            )
+
+    def test_plan_backfill_starts_at_first_transaction(self):
+        jobs = plan_snapshot_jobs(backfill=True)
+
+        self.assertEqual(jobs, [
+            (self.alice.id, date(2024, 1, 5), date.today()),
+            (self.bob.id, date(2024, 2, 1), date.today()),
+        ])
+
+    def test_plan_single_day(self):
+        day = date(2024, 6, 1)
+
+        self.assertEqual(plan_snapshot_jobs(day), [(self.alice.id, day, day), (self.bob.id, day, day)])
+
+    def test_prewarm_fetches_union_once_per_asset_type(self):
+        service = Mock(currency="PLN")
+        service.asset_manager._get_native_currency.return_value = "USD"
+        jobs = [
+            (self.alice.id, date(2024, 1, 5), date(2024, 6, 1)),
+            (self.bob.id, date(2024, 2, 1), date(2024, 6, 1)),
+        ]
+
+        warmed = prewarm_snapshot_caches(jobs, service)
+
+        self.assertEqual(warmed, (2, 1))
+        calls = service.price_repository.get_price_series_batch.call_args_list
+        self.assertEqual(sorted(c.args[0][0] for c in calls), ["AAPL", "BTC-USD"])
+        self.assertTrue(all(c.args[1:3] == (date(2023, 12, 26), date(2024, 6, 1)) for c in calls))
+        service.asset_manager.currency_converter.get_rate_series.assert_called_once_with(
+            "USD", "PLN", date(2024, 1, 5), date(2024, 6, 1),
+        )
+
+    def test_build_shard_chunks_ranges_and_collects_errors(self):
+        service = Mock()
+
+        def build(user, start, end, currency, only_changed):
+            if user == self.bob:
+                raise RuntimeError("boom")
+            return [None] * ((end - start).days + 1)
+
+        service.build_snapshots_for_user.side_effect = build
+        start = date(2024, 1, 1)
+        jobs = [(self.alice.id, start, start + timedelta(days=9)), (self.bob.id, start, start)]
+
+        result = build_snapshot_shard(jobs, chunk_days=4, service=service)
+
+        self.assertEqual((result.users, result.rows), (1, 10))
+        self.assertEqual(service.build_snapshots_for_user.call_count, 4)
+        self.assertIn("bob: boom", result.errors[0])
+
+    def test_run_in_process_merges_shards(self):
+        day = date.today() - timedelta(days=1)
+        jobs = plan_snapshot_jobs(day)
+        done = []
+        service = Mock()
+        service.build_snapshots_for_user.return_value = [Mock()]
+
+        with patch("portfolio.services.snapshot_batch.PortfolioSnapshotService", return_value=service):
+            total = run_snapshot_shards(
+                shard_jobs(jobs, 1), workers=1, chunk_days=None, on_shard_done=done.append,
+            )
+
+        self.assertEqual(len(done), 2)
+        self.assertIsInstance(total, ShardResult)
+        self.assertEqual((total.users, total.rows, total.errors), (2, 2, []))
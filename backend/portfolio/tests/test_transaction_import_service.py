@@ -37,7 +37,7 @@ class ImportNormalizedTransactionsTests(TestCase):
         with patch(
             "portfolio.services.transaction_import_service.PortfolioSnapshotService"
         ) as m_svc:
-            m_svc.return_value.build_snapshots_for_user = MagicMock()
+            m_svc.return_value.apply_transaction_change = MagicMock()
             result = import_normalized_transactions(
                 self.user, rows, rebuild_snapshots=True
             )
@@ -56,7 +56,9 @@ class ImportNormalizedTransactionsTests(TestCase):
 
         ua = UserAsset.objects.get(owner=self.user, ownedAsset=self.asset)
         self.assertEqual(ua.quantity, 10.0)
-        m_svc.return_value.build_snapshots_for_user.assert_called_once()
+        m_svc.return_value.apply_transaction_change.assert_called_once_with(
+            self.user, date(2026, 1, 10)
+        )
 
     def test_skips_duplicate_external_id(self):
         Transactions.objects.create(
@@ -146,16 +148,16 @@ class ImportNormalizedTransactionsTests(TestCase):
         ]
         mock_fetcher = MagicMock()
         with patch(
-            "portfolio.services.transaction_import_service.resolve_price_for_date",
-            return_value=50.0,
+            "portfolio.services.transaction_import_service.resolve_prices_for_dates",
+            side_effect=lambda requests, **kwargs: {r: 50.0 for r in requests},
         ) as m_resolve:
             with patch(
                 "portfolio.services.transaction_import_service.PortfolioSnapshotService"
             ):
                 with patch(
-                    "portfolio.services.transaction_import_service.AssetManager"
-                ) as m_am:
-                    inst = m_am.return_value
+                    "portfolio.services.transaction_import_service.get_service_container"
+                ) as m_services:
+                    inst = m_services.return_value.asset_manager.return_value
                     inst._get_native_currency.return_value = "PLN"
                     result = import_normalized_transactions(
                         self.user,
@@ -164,7 +166,8 @@ class ImportNormalizedTransactionsTests(TestCase):
                     )
 
         self.assertEqual(result.created_count, 1)
-        m_resolve.assert_called()
+        m_resolve.assert_called_once()
+        self.assertEqual(list(m_resolve.call_args.args[0]), [("TEST.WA", "stocks", date(2026, 1, 15))])
         tx = Transactions.objects.get(id=result.outcomes[0].transaction_id)
         self.assertEqual(tx.price, 50.0)
 
@@ -193,3 +196,114 @@ class ImportNormalizedTransactionsTests(TestCase):
                 self.user, rows, rebuild_snapshots=False
             )
         m_svc.assert_not_called()
+
+
+class BulkImportTests(TestCase):
+    """The set-based import matches row-by-row results with a constant number of queries."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulk", password="x")
+        self.existing = Asset.objects.create(symbol="OLD.WA", name="Old SA", asset_type="stocks")
+
+    def _rows(self, n):
+        symbols = ["OLD.WA", "NEW1.WA", "NEW2.WA"]
+        return [
+            NormalizedTransactionImportRow(
+                transaction_type="B" if i % 4 else "S",
+                quantity=3.0 if i % 4 else 1.0,
+                price=100.0 + i,
+                trade_date=date(2025, 1, 1 + i % 28),
+                source_row_index=i,
+                symbol=symbols[i % 3],
+                name=symbols[i % 3],
+                asset_type="stocks",
+                currency="PLN",
+                external_id=f"x-{i}",
+            )
+            for i in range(n)
+        ]
+
+    def _count_queries(self, rows):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            result = import_normalized_transactions(self.user, rows, rebuild_snapshots=False)
+        return result, len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        small, small_queries = self._count_queries(self._rows(12))
+        Transactions.objects.all().delete()
+        UserAsset.objects.all().delete()
+        Asset.objects.filter(symbol__startswith="NEW").delete()
+        large, large_queries = self._count_queries(
+            [NormalizedTransactionImportRow(**{**r.__dict__, "external_id": f"y-{r.source_row_index}"})
+             for r in self._rows(300)]
+        )
+
+        self.assertEqual(small.created_count, 12)
+        self.assertEqual(large.created_count, 300)
+        # SQLite splits the 300-row bulk insert into a few batches; nothing is per row
+        self.assertLessEqual(large_queries, small_queries + 2)
+        self.assertEqual(Asset.objects.filter(symbol__startswith="NEW").count(), 2)
+
+    def test_positions_match_row_by_row_import(self):
+        from portfolio.services.transaction_import_service import _process_single_import_row
+
+        other = User.objects.create_user(username="serial", password="x")
+        rows = self._rows(20)
+        import_normalized_transactions(self.user, rows, rebuild_snapshots=False)
+        for row in rows:
+            _process_single_import_row(other, row)
+
+        bulk = {
+            ua.ownedAsset_id: (ua.quantity, ua.average_purchase_price, ua.currency)
+            for ua in UserAsset.objects.filter(owner=self.user)
+        }
+        serial = {
+            ua.ownedAsset_id: (ua.quantity, ua.average_purchase_price, ua.currency)
+            for ua in UserAsset.objects.filter(owner=other)
+        }
+        self.assertEqual(bulk, serial)
+
+    def test_repeated_external_id_in_file_is_skipped(self):
+        rows = self._rows(2)
+        rows[1].external_id = rows[0].external_id
+
+        result = import_normalized_transactions(self.user, rows, rebuild_snapshots=False)
+
+        self.assertEqual([o.status for o in result.outcomes], ["created", "skipped_duplicate"])
+
+    def test_repeated_external_id_after_invalid_row_is_created(self):
+        rows = self._rows(2)
+        rows[0].asset_type = "not-a-type"
+        rows[0].symbol = rows[0].name = "BAD.WA"
+        rows[1].external_id = rows[0].external_id
+
+        result = import_normalized_transactions(self.user, rows, rebuild_snapshots=False)
+
+        self.assertEqual([o.status for o in result.outcomes], ["error", "created"])
+
+    def test_missing_prices_resolved_with_one_fetch(self):
+        import pandas as pd
+
+        rows = self._rows(6)
+        for row in rows:
+            row.price = None
+        fetcher = MagicMock()
+        fetcher.get_historical_prices.side_effect = lambda symbols, start, end: {
+            s: pd.Series({pd.Timestamp(d): 10.0 for d in pd.date_range(start, end)}) for s in symbols
+        }
+
+        with patch(
+            "portfolio.services.transaction_import_service.get_target_currency_for_user",
+            return_value="PLN",
+        ):
+            result = import_normalized_transactions(
+                self.user, rows, rebuild_snapshots=False, stock_fetcher=fetcher,
+            )
+
+        self.assertEqual(result.created_count, 6)
+        fetcher.get_historical_prices.assert_called_once()
+        self.assertEqual(
+            set(Transactions.objects.filter(owner=self.user).values_list("price", flat=True)), {10.0},
+        )
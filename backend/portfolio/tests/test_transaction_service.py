@@ -2,14 +2,19 @@
 Unit tests for transaction_service (get_or_create_asset, resolve_price_for_date, update_user_asset).
 """
 from datetime import date, timedelta
+from decimal import Decimal
 from unittest.mock import Mock
 
 import pandas as pd
+from django.contrib.auth.models import User
 from django.test import TestCase
 
+from base.models import Asset
+from portfolio.models import Transactions
 from portfolio.services.transaction_service import (
     _PRICE_RESOLVE_DAYS_BACK,
     _PRICE_RESOLVE_DAYS_FORWARD,
+    recalculate_user_asset,
     resolve_price_for_date,
 )
 
@@ -126,3 +131,34 @@ class ResolvePriceForDateTests(TestCase):
         )
 
         self.assertEqual(result, 152.0)
+
+
+class RecalculateUserAssetTests(TestCase):
+    """Tests for rebuilding a UserAsset from remaining transactions."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("owner", "o@test.com", "pass")
+        self.asset = Asset.objects.create(symbol="CDR.WA", name="CD Projekt", asset_type="stocks")
+
+    def test_recomputes_quantity_and_average_after_delete(self):
+        Transactions.objects.create(
+            owner=self.user, product=self.asset, transactionType="B",
+            quantity=10, price=100.0, date=date(2026, 1, 1), currency="PLN",
+        )
+        removed = Transactions.objects.create(
+            owner=self.user, product=self.asset, transactionType="B",
+            quantity=10, price=200.0, date=date(2026, 1, 2), currency="PLN",
+        )
+        removed.delete()
+
+        user_asset = recalculate_user_asset(self.user, self.asset)
+
+        self.assertEqual(user_asset.quantity, 10.0)
+        self.assertEqual(user_asset.average_purchase_price, Decimal("100"))
+        self.assertEqual(user_asset.currency, "PLN")
+
+    def test_zeroes_position_when_no_transactions_left(self):
+        user_asset = recalculate_user_asset(self.user, self.asset)
+
+        self.assertEqual(user_asset.quantity, 0.0)
+        self.assertIsNone(user_asset.average_purchase_price)
@@ -0,0 +1,111 @@
+"""Tests for the streaming XTB Cash Operations parser and chunked import."""
+from datetime import date, datetime
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from openpyxl import Workbook
+
+from base.models import Asset
+from portfolio.infrastructure.xtb import (
+    iter_xtb_cash_operations_xlsx,
+    parse_xtb_cash_operations_xlsx,
+)
+from portfolio.models import Transactions
+from portfolio.services.transaction_import_service import (
+    import_normalized_transaction_chunks,
+)
+
+HEADER = ["ID", "Type", "Time", "Comment", "Symbol", "Amount", "Product", "Ticker", "Instrument"]
+
+
+def _xtb_workbook(trades: int) -> BytesIO:
+    wb = Workbook()
+    wb.active.title = "Closed Positions"
+    ws = wb.create_sheet("Cash Operations")
+    ws.append(["Account", "12345"])
+    ws.append([])
+    ws.append(HEADER)
+    for i in range(trades):
+        ws.append([
+            1000 + i, "Stock purchase", datetime(2025, 1, 1 + i % 28, 10, 0),
+            f"OPEN BUY {i + 1} @ 10.50", "TST.PL", -10.5, "Stocks", "TST.PL", "Test SA",
+        ])
+        ws.append([2000 + i, "Deposit", datetime(2025, 1, 1), "", "", 100, "", "", ""])
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+class IterXtbCashOperationsTests(SimpleTestCase):
+    def test_chunks_match_full_parse(self):
+        rows = parse_xtb_cash_operations_xlsx(_xtb_workbook(5))
+        chunks = list(iter_xtb_cash_operations_xlsx(_xtb_workbook(5), chunk_size=2))
+
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        self.assertEqual([r for c in chunks for r in c], rows)
+        first = rows[0]
+        self.assertEqual(first.transaction_type, "BUY")
+        self.assertEqual(first.quantity, 1.0)
+        self.assertEqual(first.price, 10.5)
+        self.assertEqual(first.trade_date, date(2025, 1, 1))
+        self.assertEqual(first.source_row_index, 4)
+        self.assertEqual(first.external_id, "xtb:1000")
+        self.assertEqual(rows[1].source_row_index, 6)
+
+    def test_missing_header_raises_on_first_chunk(self):
+        wb = Workbook()
+        wb.active.title = "Cash Operations"
+        wb.active.append(["not", "a", "header"])
+        buf = BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+
+        with self.assertRaises(ValueError):
+            next(iter_xtb_cash_operations_xlsx(buf))
+
+
+class ImportTransactionChunksTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="xtb", password="x")
+        Asset.objects.create(symbol="TST.PL", name="Test SA", asset_type=Asset.AssetType.STOCKS)
+
+    def test_each_chunk_is_saved_before_next_is_parsed(self):
+        saved_before_chunk = []
+
+        def chunks():
+            for chunk in iter_xtb_cash_operations_xlsx(_xtb_workbook(4), chunk_size=2):
+                saved_before_chunk.append(Transactions.objects.filter(owner=self.user).count())
+                yield chunk
+
+        with patch(
+            "portfolio.services.transaction_import_service.PortfolioSnapshotService"
+        ) as m_svc:
+            m_svc.return_value.apply_transaction_change = MagicMock()
+            result = import_normalized_transaction_chunks(self.user, chunks())
+
+        self.assertEqual(saved_before_chunk, [0, 2])
+        self.assertEqual(result.created_count, 4)
+        self.assertEqual(len(result.outcomes), 4)
+        m_svc.return_value.apply_transaction_change.assert_called_once_with(
+            self.user, date(2025, 1, 1)
+        )
+
+    def test_snapshots_rebuilt_when_a_later_chunk_fails(self):
+        def chunks():
+            yield next(iter_xtb_cash_operations_xlsx(_xtb_workbook(4), chunk_size=2))
+            raise ValueError("corrupt row")
+
+        with patch(
+            "portfolio.services.transaction_import_service.PortfolioSnapshotService"
+        ) as m_svc:
+            m_svc.return_value.apply_transaction_change = MagicMock()
+            with self.assertRaises(ValueError):
+                import_normalized_transaction_chunks(self.user, chunks())
+
+        self.assertEqual(Transactions.objects.filter(owner=self.user).count(), 2)
+        m_svc.return_value.apply_transaction_change.assert_called_once_with(
+            self.user, date(2025, 1, 1)
+        )
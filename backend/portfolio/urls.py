@@ -7,7 +7,13 @@ urlpatterns = [
         views.XtbCashOperationsImportView.as_view(),
         name='portfolio_import_xtb',
     ),
+    path(
+        'import/jobs/<int:pk>/',
+        views.TransactionImportJobDetail.as_view(),
+        name='portfolio_import_job',
+    ),
     path('transactions/', views.CreateTransaction.as_view(), name="transactions"),
+    path('transactions/<int:pk>/', views.TransactionDetail.as_view(), name="transaction_detail"),
     path('composition/', views.getUserAssetComposition, name='portfolio_composition'),
     path('indicators/', views.indicatorsView, name='portfolio_indicators'),
     path('value-history/', views.valueHistoryView, name='portfolio_value_history'),
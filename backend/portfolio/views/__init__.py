@@ -1,5 +1,5 @@
 from .overview import getUserAssetComposition, indicatorsView, valueHistoryView
-from .transactions import CreateTransaction
+from .transactions import CreateTransaction, TransactionDetail
 from .integration import updateTransactions, xtbLogin
 from .bonds import calculateBondValue
-from .transaction_import import XtbCashOperationsImportView
+from .transaction_import import TransactionImportJobDetail, XtbCashOperationsImportView
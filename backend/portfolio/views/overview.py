@@ -7,8 +7,7 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 
-from ..services.asset_manager import AssetManager
-from ..services.currency_converter import CurrencyConverter
+from ..services.container import get_service_container
 from ..services.portfolio_snapshots import PortfolioSnapshotService
 from ..selectors import get_portfolio_snapshots
 from ..services.portfolio_analysis import (
@@ -26,7 +25,7 @@ logger = logging.getLogger(__name__)
 def getUserAssetComposition(request):
     """Get user's portfolio composition with current values and percentages."""
     currency = request.query_params.get('currency', 'PLN')
-    asset_manager = AssetManager(default_currency=currency)
+    asset_manager = get_service_container().asset_manager(currency)
     composition = asset_manager.get_portfolio_composition(
         user=request.user, target_currency=currency
     )
@@ -70,7 +69,7 @@ def indicatorsView(request):
 
     # Convert to USD for benchmark comparison (benchmark is in USD); use historical FX per day
     if currency != 'USD':
-        converter = CurrencyConverter()
+        converter = get_service_container().currency_converter
         total_invested_series = converter.convert_series(
             total_invested_series, currency, 'USD', start_date, end_date
         )
@@ -99,7 +98,7 @@ def indicatorsView(request):
         if currency == 'USD':
             benchmark_profit_display = float(benchmark_profit_usd)
         else:
-            converter = CurrencyConverter()
+            converter = get_service_container().currency_converter
             converted = converter.convert(
                 Decimal(str(benchmark_profit_usd)), 'USD', currency
             )
@@ -141,9 +140,7 @@ def valueHistoryView(request):
     if refresh_today:
         try:
             service = PortfolioSnapshotService(currency=currency)
-            service.build_snapshots_for_user(
-                request.user, today, today, currency=currency
-            )
+            service.append_today(request.user, currency=currency)
         except Exception:
             logger.exception("Refresh today snapshot failed in valueHistoryView")
 
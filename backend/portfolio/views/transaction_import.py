@@ -1,20 +1,23 @@
 import logging
 
-from rest_framework import status
+from rest_framework import generics, status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
-from portfolio.infrastructure.xtb import parse_xtb_cash_operations_xlsx
-from portfolio.services.transaction_import_service import import_normalized_transactions
+from portfolio.models import TransactionImportJob
+from portfolio.serializers import TransactionImportJobSerializer
+from portfolio.services.import_jobs import enqueue_import_job, resume_import_jobs
 
 logger = logging.getLogger(__name__)
 
 
 class XtbCashOperationsImportView(APIView):
     """
-    Upload an XTB multi-sheet .xlsx export; import trade rows from the Cash Operations sheet.
+    Upload an XTB multi-sheet .xlsx export; trade rows from the Cash Operations sheet
+    are imported in the background. Responds 202 with the job to poll.
     """
 
     permission_classes = [IsAuthenticated]
@@ -40,33 +43,29 @@ class XtbCashOperationsImportView(APIView):
         except (AttributeError, OSError):
             pass
 
-        try:
-            rows = parse_xtb_cash_operations_xlsx(upload)
-        except ValueError as e:
-            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception:
-            logger.exception("XTB cash operations parse failed")
-            return Response(
-                {"detail": "Could not read the spreadsheet. Check that it is a valid XTB export."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        job = enqueue_import_job(
+            request.user,
+            TransactionImportJob.Source.XTB_CASH_OPERATIONS,
+            name,
+            upload.read(),
+        )
+        data = TransactionImportJobSerializer(job).data
+        data["status_url"] = reverse("portfolio_import_job", args=[job.id], request=request)
+        return Response(data, status=status.HTTP_202_ACCEPTED)
 
-        result = import_normalized_transactions(request.user, rows)
-        outcomes = [
-            {
-                "source_row_index": o.source_row_index,
-                "status": o.status,
-                "transaction_id": o.transaction_id,
-                "message": o.message,
-            }
-            for o in result.outcomes
-        ]
 
-        return Response(
-            {
-                "created_count": result.created_count,
-                "parsed_row_count": len(rows),
-                "outcomes": outcomes,
-            },
-            status=status.HTTP_200_OK,
-        )
+class TransactionImportJobDetail(generics.RetrieveAPIView):
+    """Poll an import job: status, progress (rows processed, rows/s) and per-row outcomes."""
+
+    serializer_class = TransactionImportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return TransactionImportJob.objects.filter(owner=self.request.user).defer("payload")
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if response.data["status"] in (TransactionImportJob.Status.PENDING, TransactionImportJob.Status.RUNNING):
+            # Pick up jobs stranded by a restart or a dead worker
+            resume_import_jobs()
+        return response
@@ -11,10 +11,10 @@ from ..services.transaction_service import (
     get_or_create_asset,
     get_target_currency_for_user,
     update_user_asset,
+    recalculate_user_asset,
     resolve_price_for_date,
 )
-from ..services.asset_manager import AssetManager
-from ..services.currency_converter import CurrencyConverter
+from ..services.container import get_service_container
 from ..services.portfolio_snapshots import PortfolioSnapshotService
 
 logger = logging.getLogger(__name__)
@@ -87,10 +87,10 @@ class CreateTransaction(generics.ListCreateAPIView):
         transaction_currency = None
         if resolved_from_api and price_value is not None and price_value > 0:
             target_currency = get_target_currency_for_user(self.request.user)
-            asset_manager = AssetManager(default_currency=target_currency)
-            native_currency = asset_manager._get_native_currency(asset)
+            services = get_service_container()
+            native_currency = services.asset_manager(target_currency)._get_native_currency(asset)
             if native_currency != target_currency:
-                converter = CurrencyConverter()
+                converter = services.currency_converter
                 converted = converter.convert(Decimal(str(price_value)), native_currency, target_currency)
                 if converted is not None:
                     price_value = float(converted)
@@ -108,10 +108,25 @@ class CreateTransaction(generics.ListCreateAPIView):
 
         try:
             service = PortfolioSnapshotService()
-            service.build_snapshots_for_user(
-                user=self.request.user,
-                start_date=transaction.date,
-                end_date=date.today(),
-            )
+            service.apply_transaction_change(self.request.user, transaction.date)
         except Exception:
             logger.exception("Snapshot rebuild failed after transaction creation")
+
+
+class TransactionDetail(generics.RetrieveDestroyAPIView):
+    serializer_class = TransactionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Transactions.objects.filter(owner=self.request.user)
+
+    def perform_destroy(self, instance):
+        owner, asset, transaction_date = instance.owner, instance.product, instance.date
+        instance.delete()
+        recalculate_user_asset(owner, asset)
+
+        try:
+            service = PortfolioSnapshotService()
+            service.apply_transaction_change(owner, transaction_date)
+        except Exception:
+            logger.exception("Snapshot rebuild failed after transaction deletion")
@@ -1,4 +1,4 @@
-import { Fragment, useState } from 'react';
+import { Fragment, useEffect, useRef, useState } from 'react';
 import { Link } from 'react-router-dom';
 import apiClient from '../api/client';
 import '../components/styles/ImportTransactions.css';
@@ -8,6 +8,13 @@ const STEPS = {
   UPLOAD: 'upload',
 };
 
+const JOB_POLL_MS = 1000;
+// Stop polling after this long; the job keeps running on the server.
+const JOB_MAX_WAIT_MS = 10 * 60 * 1000;
+const JOB_DONE = ['succeeded', 'failed'];
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 function ImportTransactionsPage() {
   const [step, setStep] = useState(STEPS.BROKER);
   const [selectedBroker, setSelectedBroker] = useState(null);
@@ -15,6 +22,15 @@ function ImportTransactionsPage() {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [result, setResult] = useState(null);
+  const [progress, setProgress] = useState(null);
+  const mounted = useRef(true);
+
+  useEffect(() => {
+    mounted.current = true;
+    return () => {
+      mounted.current = false;
+    };
+  }, []);
 
   const chooseXtb = () => {
     setSelectedBroker('xtb');
@@ -54,8 +70,28 @@ function ImportTransactionsPage() {
           return data;
         }],
       });
-      setResult(res.data);
+      let job = res.data;
+      const deadline = Date.now() + JOB_MAX_WAIT_MS;
+      while (!JOB_DONE.includes(job.status)) {
+        if (!mounted.current) return;
+        if (Date.now() > deadline) {
+          setError('The import is taking longer than expected. It continues in the background; check your portfolio later.');
+          return;
+        }
+        setProgress(job);
+        await sleep(JOB_POLL_MS);
+        if (!mounted.current) return;
+        job = (await apiClient.get(`/api/portfolio/import/jobs/${job.id}/`)).data;
+      }
+      if (!mounted.current) return;
+      if (job.status === 'failed') {
+        setError(job.error || 'Import failed.');
+      }
+      if (job.status === 'succeeded' || job.rows_processed > 0) {
+        setResult(job);
+      }
     } catch (err) {
+      if (!mounted.current) return;
       const msg =
         err.response?.data?.detail ??
         err.response?.data?.message ??
@@ -63,7 +99,10 @@ function ImportTransactionsPage() {
         'Upload failed.';
       setError(typeof msg === 'string' ? msg : JSON.stringify(msg));
     } finally {
-      setLoading(false);
+      if (mounted.current) {
+        setLoading(false);
+        setProgress(null);
+      }
     }
   };
 
@@ -140,6 +179,13 @@ function ImportTransactionsPage() {
             >
               {loading ? 'Importing…' : 'Upload and import'}
             </button>
+            {progress && (
+              <p className="importTxMuted">
+                {progress.status === 'pending'
+                  ? 'Waiting to start…'
+                  : `${progress.rows_processed} row(s) processed`}
+              </p>
+            )}
           </div>
         )}
 
@@ -153,7 +199,7 @@ function ImportTransactionsPage() {
           <div className="importTxResult">
             <p>
               <strong>{result.created_count}</strong> transaction(s) created from{' '}
-              <strong>{result.parsed_row_count}</strong> parsed row(s).
+              <strong>{result.rows_processed}</strong> parsed row(s).
             </p>
             {result.outcomes?.some((o) => o.status === 'error') && (
               <div className="importTxOutcomes">